@@ -0,0 +1 @@
+# benchmarks — local load tests and micro-benchmarks (not run by the agent)
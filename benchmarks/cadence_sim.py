@@ -0,0 +1,105 @@
+# benchmarks/cadence_sim.py
+"""
+Discovery-latency simulation for adaptive board polling.
+Boards get skewed posting rates (a few post daily, most rarely). A month of
+history is sampled to estimate rates the way modules/cadence.py does, then
+two weeks of Poisson postings are replayed against:
+
+  uniform   — every board every BASE minutes (the old schedule)
+  adaptive  — allocate_intervals() on the estimated rates, checked on
+              CADENCE_TICK_MINUTES ticks with the same half-tick slack
+
+and the mean time from posting to discovery and the number of polls are
+reported for each.
+
+    python benchmarks/cadence_sim.py --boards 100 --base 10
+"""
+
+import random
+import argparse
+import statistics
+
+import sys, os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import (
+    CADENCE_TICK_MINUTES,
+    CADENCE_MIN_MINUTES,
+    CADENCE_MAX_MINUTES,
+    CADENCE_WINDOW_DAYS,
+    CADENCE_PRIOR_JOBS,
+)
+from modules.cadence import allocate_intervals
+
+DAY = 86400
+
+
+def simulate(intervals: dict, rates: dict, days: float, tick: float, rnd) -> tuple[float, int]:
+    """(mean discovery latency in minutes, total polls) for a polling plan."""
+    horizon = days * DAY
+    slack = tick / 2
+    latencies, polls = [], 0
+
+    for board, interval in intervals.items():
+        # Poll times for this board: first tick, then each tick it comes due
+        times, last, t = [], None, rnd.uniform(0, tick)
+        while t < horizon:
+            if last is None or t - last + slack >= interval:
+                times.append(t)
+                last = t
+            t += tick
+        polls += len(times)
+
+        # Poisson postings; each is discovered at the next poll
+        t, i = rnd.expovariate(rates[board]), 0
+        while t < horizon:
+            while i < len(times) and times[i] < t:
+                i += 1
+            if i == len(times):
+                break
+            latencies.append(times[i] - t)
+            t += rnd.expovariate(rates[board])
+
+    return statistics.mean(latencies) / 60, polls
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Adaptive cadence simulation")
+    parser.add_argument("--boards", type=int, default=100)
+    parser.add_argument("--base", type=float, default=10, help="uniform interval, minutes")
+    parser.add_argument("--days", type=float, default=14)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args(argv)
+
+    rnd = random.Random(args.seed)
+    # Jobs/day per board: lognormal — median ~0.1/day, a handful above 5/day
+    true_rates = {f"board-{i}": rnd.lognormvariate(-2.3, 1.6) / DAY for i in range(args.boards)}
+
+    # Learn from a month of history, smoothed like BoardCadence.rates()
+    window = CADENCE_WINDOW_DAYS * DAY
+    estimated = {}
+    for board, rate in true_rates.items():
+        seen, t = 0, rnd.expovariate(rate)
+        while t < window:
+            seen += 1
+            t += rnd.expovariate(rate)
+        estimated[board] = (seen + CADENCE_PRIOR_JOBS) / window
+
+    tick = CADENCE_TICK_MINUTES * 60
+    uniform = {b: args.base * 60 for b in true_rates}
+    adaptive = allocate_intervals(estimated, args.boards / (args.base * 60),
+                                  CADENCE_MIN_MINUTES * 60, CADENCE_MAX_MINUTES * 60)
+
+    u_latency, u_polls = simulate(uniform, true_rates, args.days, tick, random.Random(args.seed))
+    a_latency, a_polls = simulate(adaptive, true_rates, args.days, tick, random.Random(args.seed))
+
+    spread = sorted(v / 60 for v in adaptive.values())
+    print(f"📋 {args.boards} boards, {args.days:g} days, uniform every {args.base:g} min")
+    print(f"   adaptive intervals: {spread[0]:.0f}–{spread[-1]:.0f} min "
+          f"(median {statistics.median(spread):.0f})")
+    print(f"📊 uniform   mean latency {u_latency:6.1f} min · {u_polls:,} polls")
+    print(f"📊 adaptive  mean latency {a_latency:6.1f} min · {a_polls:,} polls")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+# benchmarks/crawl_parse_overlap.py
+"""
+Crawl-then-parse vs. crawl and parse together.
+Serves N synthetic company sites (one local port each): a homepage linking
+to /careers, a careers page listing JOBS job links, and the job pages, every
+response delayed by LATENCY. The sites are crawled and their job pages
+parsed two ways:
+
+  two-phase  — collect every domain's job URLs from iter_career_pages, then
+               parse them one by one with the blocking parse_job_page
+               (the crawler's dict result followed by a requests phase)
+  overlap    — crawl_jobs: job pages are fetched with parse_job_page_async on
+               the crawl's own event loop and session as each domain's URLs
+               come out, while other domains are still being crawled
+
+Reports total time, time to the first parsed job, and jobs parsed (both
+modes must find the same jobs).
+
+    python benchmarks/crawl_parse_overlap.py --sites 30 --jobs 8
+"""
+
+import time
+import asyncio
+import argparse
+import threading
+
+import aiohttp
+from aiohttp import web
+
+import sys, os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.crawling.career_crawler import iter_career_pages, crawl_jobs, MAX_CONCURRENT
+from modules.parsing.generic_html import parse_job_page
+
+LATENCY = 0.05
+PARAGRAPH = "<p>Build reliable data pipelines and services with a small, senior team.</p>"
+
+
+# ── Synthetic sites ───────────────────────────────────────────────────────────
+
+def build_app(jobs: int) -> web.Application:
+    async def handle(request: web.Request) -> web.Response:
+        await asyncio.sleep(LATENCY)
+        path, site = request.path.rstrip("/"), request.url.port
+        if path == "":
+            return web.Response(text="<html><body><a href='/about'>About</a> "
+                                     "<a href='/careers'>Careers</a></body></html>",
+                                content_type="text/html")
+        if path == "/careers":
+            links = "".join(f"<li><a href='/careers/jobs/{i}'>Engineer {i}</a></li>"
+                            for i in range(jobs))
+            return web.Response(text=f"<html><body><ul>{links}</ul></body></html>",
+                                content_type="text/html")
+        if path.startswith("/careers/jobs/"):
+            n = path.rsplit("/", 1)[1]
+            return web.Response(text=(
+                f"<html><head><title>Engineer {n} | Site {site}</title></head><body>"
+                f"<h1 class='job-title'>Backend Engineer {n}</h1>"
+                f"<div class='job-description'>{PARAGRAPH * 6}</div>"
+                f"<a href='#apply'>Apply now</a></body></html>"), content_type="text/html")
+        return web.Response(status=404)
+
+    app = web.Application()
+    app.router.add_get("/{tail:.*}", handle)
+    return app
+
+
+def serve(sites: int, jobs: int) -> list[str]:
+    """Start the sites on a background loop; returns their base URLs."""
+    ready, bases = threading.Event(), []
+
+    async def main():
+        runner = web.AppRunner(build_app(jobs))
+        await runner.setup()
+        for _ in range(sites):
+            site = web.TCPSite(runner, "127.0.0.1", 0)
+            await site.start()
+            bases.append(f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}")
+        ready.set()
+        await asyncio.Event().wait()
+
+    threading.Thread(target=lambda: asyncio.run(main()), daemon=True).start()
+    ready.wait()
+    return bases
+
+
+# ── Modes ─────────────────────────────────────────────────────────────────────
+
+async def two_phase(domains: list[str]) -> tuple[float, float, set]:
+    started = time.perf_counter()
+    urls = []
+    connector = aiohttp.TCPConnector(limit=MAX_CONCURRENT, ssl=False)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        async for _, url in iter_career_pages(session, domains):
+            urls.append(url)
+    first, found = None, set()
+    for url in urls:
+        job = await asyncio.to_thread(parse_job_page, url)
+        if job:
+            first = first or time.perf_counter() - started
+            found.add(job["job_url"])
+    return time.perf_counter() - started, first or 0.0, found
+
+
+async def overlap(domains: list[str]) -> tuple[float, float, set]:
+    started = time.perf_counter()
+    first, found = None, set()
+    async for _, job in crawl_jobs(domains):
+        first = first or time.perf_counter() - started
+        found.add(job["job_url"])
+    return time.perf_counter() - started, first or 0.0, found
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Crawl/parse overlap benchmark")
+    parser.add_argument("--sites", type=int, default=30)
+    parser.add_argument("--jobs", type=int, default=8, help="job pages per site")
+    args = parser.parse_args(argv)
+
+    domains = serve(args.sites, args.jobs)
+    print(f"📋 {args.sites} sites × {args.jobs} jobs, {LATENCY * 1000:.0f} ms per response")
+    results = {}
+    for name, mode in (("two-phase", two_phase), ("overlap", overlap)):
+        seconds, first, found = asyncio.run(mode(domains))
+        results[name] = found
+        print(f"📊 {name:<10} {seconds:6.2f} s total · first job after {first:5.2f} s · "
+              f"{len(found)} jobs")
+    same = results["two-phase"] == results["overlap"]
+    print(f"🔎 same jobs in both modes: {'yes' if same else 'NO'}")
+
+
+if __name__ == "__main__":
+    main()
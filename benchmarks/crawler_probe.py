@@ -0,0 +1,170 @@
+# benchmarks/crawler_probe.py
+"""
+Requests-per-domain benchmark for career-page detection.
+Serves N synthetic company sites from a local aiohttp server, one per path
+prefix (http://127.0.0.1:<port>/s7, ...), with a mix of layouts:
+
+  homepage  — "Careers" link on the homepage
+  robots    — no link; robots.txt disallows /jobs/apply
+  sitemap   — no link; robots.txt points at a sitemap listing /openings
+  path      — only /jobs exists
+  head405   — only /vacancies exists, and HEAD is refused (405)
+  soft404   — unknown paths redirect to the homepage; no careers page
+  none      — nothing but 404s
+
+Both strategies then crawl every site through the same session and every
+request and response byte is counted with an aiohttp TraceConfig:
+
+  legacy  — the old detect_career_page (10 parallel GETs, homepage fallback)
+  probing — the current detect_career_page
+
+    python benchmarks/crawler_probe.py --sites 200
+"""
+
+import time
+import random
+import asyncio
+import argparse
+from collections import Counter
+
+import aiohttp
+from aiohttp import web
+
+import sys, os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.crawling.career_crawler import (
+    CAREER_PATHS, MAX_CONCURRENT, fetch_url, extract_anchors, career_links_from,
+    detect_career_page, extract_jobs_from_page,
+)
+
+LAYOUTS = ["homepage"] * 4 + ["robots", "sitemap", "path", "path", "head405", "soft404", "none"]
+CAREERS_AT = {"homepage": "careers", "robots": "jobs", "sitemap": "openings",
+              "path": "jobs", "head405": "vacancies"}
+LATENCY = 0.01
+PADDING = "<p>" + "lorem ipsum dolor sit amet " * 40 + "</p>"
+
+
+# ── Synthetic sites ───────────────────────────────────────────────────────────
+
+def _page(body: str, kb: int) -> str:
+    return f"<html><body>{body}{PADDING * (kb * 1024 // len(PADDING))}</body></html>"
+
+
+def build_app(layouts: dict) -> web.Application:
+    async def handle(request: web.Request) -> web.StreamResponse:
+        await asyncio.sleep(LATENCY)
+        site, _, rest = request.path.lstrip("/").partition("/")
+        layout = layouts.get(site)
+        if layout is None:
+            raise web.HTTPNotFound()
+        rest = rest.rstrip("/")
+        prefix = f"/{site}"
+        careers = CAREERS_AT.get(layout)
+
+        if rest == "":
+            link = f'<a href="{prefix}/careers">Careers</a>' if layout == "homepage" else ""
+            return web.Response(text=_page(f"<nav>{link}</nav>", 60), content_type="text/html")
+        if rest == "robots.txt" and layout in ("robots", "sitemap"):
+            rules = (f"Disallow: {prefix}/jobs/apply\n" if layout == "robots"
+                     else f"Sitemap: http://{request.host}{prefix}/sitemap-main.xml\n")
+            return web.Response(text=f"User-agent: *\n{rules}", content_type="text/plain")
+        if rest == "sitemap-main.xml" and layout == "sitemap":
+            locs = "".join(f"<url><loc>http://{request.host}{prefix}/{p}</loc></url>"
+                           for p in ("about", "blog", "openings", "openings/123"))
+            return web.Response(text=f"<urlset>{locs}</urlset>", content_type="application/xml")
+        if careers and rest == careers:
+            if layout == "head405" and request.method == "HEAD":
+                raise web.HTTPMethodNotAllowed("HEAD", ["GET"])
+            jobs = "".join(f'<a href="{prefix}/{careers}/{i}/apply/">Role {i}</a>' for i in range(10))
+            return web.Response(text=_page(jobs, 40), content_type="text/html")
+        if layout == "soft404":
+            raise web.HTTPFound(f"{prefix}/")
+        return web.Response(status=404, text=_page("Not found", 5), content_type="text/html")
+
+    app = web.Application()
+    app.router.add_route("*", "/{tail:.*}", handle)
+    return app
+
+
+# ── Strategies ────────────────────────────────────────────────────────────────
+
+async def legacy_detect(session, domain, stats=None):
+    """detect_career_page before probing: 10 parallel GETs, homepage fallback."""
+    base = domain.rstrip("/")
+    results = await asyncio.gather(*(fetch_url(session, f"{base}{p}") for p in CAREER_PATHS[:10]))
+    pages = [f"{base}{CAREER_PATHS[i]}" for i, html in enumerate(results) if html]
+    if not pages:
+        html = await fetch_url(session, base)
+        if html:
+            pages = career_links_from(extract_anchors(html), base)[:5]
+    return pages
+
+
+async def crawl(base_url: str, sites: list[str], detect) -> dict:
+    requests, received = Counter(), Counter()
+
+    async def on_start(session, ctx, params):
+        requests[params.url.path.split("/")[1]] += 1
+
+    async def on_chunk(session, ctx, params):
+        received["bytes"] += len(params.chunk)
+
+    trace = aiohttp.TraceConfig()
+    trace.on_request_start.append(on_start)
+    trace.on_response_chunk_received.append(on_chunk)
+
+    found, links = 0, 0
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT)
+    started = time.perf_counter()
+    async with aiohttp.ClientSession(trace_configs=[trace],
+                                     connector=aiohttp.TCPConnector(limit=MAX_CONCURRENT)) as session:
+        async def one(site):
+            nonlocal found, links
+            async with semaphore:
+                pages = await detect(session, f"{base_url}/{site}")
+                found += bool(pages)
+                for page in pages[:5]:
+                    links += len(await extract_jobs_from_page(session, page))
+
+        await asyncio.gather(*(one(site) for site in sites))
+
+    return {"seconds": time.perf_counter() - started, "requests": sum(requests.values()),
+            "per_domain": sum(requests.values()) / len(sites), "mb": received["bytes"] / 2 ** 20,
+            "found": found, "links": links}
+
+
+async def run(n_sites: int, seed: int):
+    rnd = random.Random(seed)
+    layouts = {f"s{i}": rnd.choice(LAYOUTS) for i in range(n_sites)}
+    runner = web.AppRunner(build_app(layouts))
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    base_url = f"http://127.0.0.1:{port}"
+
+    mix = Counter(layouts.values())
+    real = sum(mix[k] for k in CAREERS_AT)
+    print(f"📋 {n_sites} sites: " + ", ".join(f"{k} {v}" for k, v in mix.most_common()))
+    print(f"   {real} have a careers page")
+    try:
+        for name, detect in (("legacy", legacy_detect), ("probing", detect_career_page)):
+            r = await crawl(base_url, list(layouts), detect)
+            print(f"📊 {name:<8} {r['requests']:6,} requests ({r['per_domain']:.1f}/domain) · "
+                  f"{r['mb']:7.1f} MB · {r['seconds']:5.1f}s · "
+                  f"career pages on {r['found']} sites · {r['links']} job links")
+    finally:
+        await runner.cleanup()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Career-page probing benchmark")
+    parser.add_argument("--sites", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=3)
+    args = parser.parse_args(argv)
+    asyncio.run(run(args.sites, args.seed))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+# benchmarks/crawler_throughput.py
+"""
+Crawl throughput and event-loop lag benchmark for link extraction.
+Serves N synthetic company sites from a local aiohttp server: a heavy
+homepage (HOME_KB, with a "Careers" link buried in it) and a heavy careers
+page (CAREERS_KB, with JOBS job links). Every site is crawled homepage →
+careers page → job links, at each concurrency level, with the links pulled
+out by:
+
+  bs4      — BeautifulSoup on the event loop (the crawler before the change)
+  inline   — the regex anchor scanner on the event loop
+  thread   — the scanner in a thread pool for pages over OFFLOAD_BYTES
+  process  — the scanner in a process pool for pages over OFFLOAD_BYTES
+
+Pages per second and loop lag (how late a 50 ms sleep wakes up — the time
+every other in-flight fetch stalls) are reported for each. The scanner's
+links are first checked against BeautifulSoup's on the same pages.
+
+    python benchmarks/crawler_throughput.py --sites 60 --concurrency 10 50 100
+"""
+
+import time
+import asyncio
+import argparse
+
+import aiohttp
+from aiohttp import web
+from bs4 import BeautifulSoup
+
+import sys, os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.crawling import career_crawler
+from modules.crawling.career_crawler import (
+    LoopLag, fetch_url, parser_pool, extract_links, parse_links,
+    career_links_from, job_links_from,
+)
+
+HOME_KB = 150
+CAREERS_KB = 300
+JOBS = 50
+LATENCY = 0.02
+BLOCK = ('<div class="card"><h3>Platform</h3><p>Build &amp; ship <b>faster</b> with '
+         '<a href="/product">our product</a> and <a href="/blog/post">the blog</a>.</p>'
+         '<script>var x = "<a href=\'/nope\'>";</script></div>\n')
+
+
+# ── Synthetic sites ───────────────────────────────────────────────────────────
+
+def _filler(kb: int) -> str:
+    return BLOCK * (kb * 1024 // len(BLOCK))
+
+
+def build_pages() -> tuple[str, str]:
+    home = (f"<html><body><nav><a href='/'>Home</a> <a href=\"/about\">About</a> "
+            f"<a href=\"careers\">Careers</a></nav>{_filler(HOME_KB)}</body></html>")
+    jobs = "".join(f'<li><a href="/careers/jobs/{i}">Engineer {i}</a> '
+                   f'<a href="/careers/jobs/{i}#apply">Apply now</a></li>' for i in range(JOBS))
+    careers = f"<html><body>{_filler(CAREERS_KB // 2)}<ul>{jobs}</ul>{_filler(CAREERS_KB // 2)}</body></html>"
+    return home, careers
+
+
+def build_app(home: str, careers: str) -> web.Application:
+    async def handle(request: web.Request) -> web.Response:
+        await asyncio.sleep(LATENCY)
+        page = careers if request.path.rstrip("/").endswith("/careers") else home
+        return web.Response(text=page, content_type="text/html")
+
+    app = web.Application()
+    app.router.add_get("/{tail:.*}", handle)
+    return app
+
+
+# ── BeautifulSoup baseline ────────────────────────────────────────────────────
+# How the crawler found links before the regex scanner: a full soup per page,
+# its anchors fed to the same career/job link filters.
+
+def soup_anchors(soup: BeautifulSoup) -> list[tuple[str, str]]:
+    return [(a.get("href", ""), a.get_text(strip=True)) for a in soup.find_all("a", href=True)]
+
+
+def find_career_links(soup: BeautifulSoup, base_url: str) -> list[str]:
+    return career_links_from(soup_anchors(soup), base_url)
+
+
+def find_job_links(soup: BeautifulSoup, base_url: str) -> list[str]:
+    return job_links_from(soup_anchors(soup), base_url)
+
+
+# ── Strategies ────────────────────────────────────────────────────────────────
+
+async def bs4_links(html: str, base_url: str, kind: str) -> list[str]:
+    soup = BeautifulSoup(html, "html.parser")
+    return find_career_links(soup, base_url) if kind == "career" else find_job_links(soup, base_url)
+
+
+async def crawl(base_url: str, sites: int, concurrency: int, links) -> dict:
+    semaphore = asyncio.Semaphore(concurrency)
+    pages, failed, found = 0, 0, 0
+
+    async def one(site: int):
+        nonlocal pages, failed, found
+        async with semaphore:
+            url = f"{base_url}/s{site}/"
+            for kind in ("career", "job"):
+                html = await fetch_url(session, url)
+                if html is None:        # timed out while the loop was blocked
+                    failed += 1
+                    return
+                pages += 1
+                urls = await links(html, url, kind)
+                if kind == "career":
+                    url = next(u for u in urls if u.rstrip("/").endswith("/careers"))
+            found += len(urls)
+
+    lag = LoopLag().start()
+    started = time.perf_counter()
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        await asyncio.gather(*(one(i) for i in range(sites)))
+    seconds = time.perf_counter() - started
+    lag.stop()
+    return {"pages_s": pages / seconds, "seconds": seconds, "failed": failed, "links": found,
+            **lag.percentiles()}
+
+
+def check_agreement(home: str, careers: str):
+    base = "http://example.com/s0/"
+    for html, kind, soup_fn in ((home, "career", find_career_links), (careers, "job", find_job_links)):
+        ours = set(parse_links(html, base, kind))
+        theirs = set(soup_fn(BeautifulSoup(html, "html.parser"), base))
+        status = "match" if ours == theirs else f"DIFFER (+{len(ours - theirs)} −{len(theirs - ours)})"
+        print(f"🔎 {kind} links: scanner {len(ours)}, BeautifulSoup {len(theirs)} — {status}")
+
+
+async def run(n_sites: int, levels: list[int], modes: list[str]):
+    home, careers = build_pages()
+    check_agreement(home, careers)
+    for name, links in (("bs4", bs4_links), ("scanner", extract_links)):
+        started = time.perf_counter()
+        await links(careers, "http://example.com/", "job")
+        print(f"⏱️  {name:<8} one {len(careers) // 1024} KB careers page: "
+              f"{(time.perf_counter() - started) * 1000:.0f} ms")
+
+    runner = web.AppRunner(build_app(home, careers))
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    base_url = f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}"
+    print(f"📋 {n_sites} sites, {HOME_KB} KB homepages, {CAREERS_KB} KB careers pages "
+          f"({JOBS} jobs), {LATENCY * 1000:.0f} ms server latency, "
+          f"offload over {career_crawler.OFFLOAD_BYTES // 1024} KB, {os.cpu_count()} CPU(s)")
+    try:
+        for mode in modes:
+            with parser_pool("inline" if mode == "bs4" else mode):
+                links = bs4_links if mode == "bs4" else extract_links
+                if mode == "process":   # spawn the workers before timing
+                    await asyncio.gather(*(extract_links(careers, base_url, "job") for _ in range(8)))
+                for level in levels:
+                    r = await crawl(base_url, n_sites, level, links)
+                    print(f"📊 {mode:<8} c={level:<4} {r['pages_s']:7.1f} pages/s · {r['seconds']:5.1f}s · "
+                          f"loop lag p50 {r['p50_ms']:6.1f} ms, p99 {r['p99_ms']:6.1f} ms, "
+                          f"max {r['max_ms']:5.0f} ms · {r['failed']} timeouts · {r['links']} job links")
+    finally:
+        await runner.cleanup()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Crawler link-extraction throughput benchmark")
+    parser.add_argument("--sites", type=int, default=60)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[10, 50, 100])
+    parser.add_argument("--modes", nargs="+", default=["bs4", "inline", "thread", "process"],
+                        choices=["bs4", "inline", "thread", "process"])
+    args = parser.parse_args(argv)
+    asyncio.run(run(args.sites, args.concurrency, args.modes))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+# benchmarks/export_rss.py
+"""
+Peak-memory benchmark for the Excel exporter.
+Builds a throwaway jobs.db with N rows, then exports it in a fresh child
+process and reports wall time and peak RSS (ru_maxrss). `legacy` mode runs
+the old fetchall() + in-memory workbook + width walk for comparison.
+
+    python benchmarks/export_rss.py                   # 100k rows, both modes
+    python benchmarks/export_rss.py --rows 20000 --mode streaming
+"""
+
+import time
+import random
+import sqlite3
+import argparse
+import resource
+import tempfile
+import multiprocessing
+from datetime import datetime
+
+import sys, os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.migrations import migrate
+from modules.storage import STATEMENTS, job_row
+
+
+def build_db(path: str, rows: int, seed: int = 42):
+    """Fill a fresh database with `rows` synthetic jobs found over the last year."""
+    migrate(path)
+    rnd = random.Random(seed)
+    now = time.time()
+    conn = sqlite3.connect(path)
+    words = ["engineer", "backend", "python", "platform", "data", "junior",
+             "graduate", "software", "cloud", "developer", "ml", "api"]
+    with conn:
+        batch = []
+        for i in range(rows):
+            found = datetime.fromtimestamp(now - rnd.uniform(0, 365 * 86400))
+            job = {
+                "job_title": " ".join(rnd.choices(words, k=4)).title(),
+                "company": f"Company {rnd.randint(1, 2000)}",
+                "country": rnd.choice(["India", "Germany", "Netherlands", "Ireland"]),
+                "job_url": f"https://jobs.example.com/{i}",
+                "jd_content": " ".join(rnd.choices(words, k=200)),
+                "skills_emphasized": ", ".join(rnd.choices(words, k=5)),
+            }
+            batch.append(job_row(job, found))
+            if len(batch) == 5000:
+                conn.executemany(STATEMENTS["insert_job"], batch)
+                batch.clear()
+        conn.executemany(STATEMENTS["insert_job"], batch)
+    conn.close()
+
+
+def _legacy_export(db_path: str, filepath: str):
+    """The pre-streaming exporter: fetchall → normal workbook → width walk."""
+    from openpyxl import Workbook
+    from modules.exporter import EXPORT_COLUMNS
+
+    conn = sqlite3.connect(db_path)
+    rows = conn.execute(
+        f"SELECT {', '.join(c for _, c in EXPORT_COLUMNS)} FROM jobs "
+        "WHERE found_ts >= ? AND found_ts < ? ORDER BY found_ts DESC", (0, 2 ** 62)
+    ).fetchall()
+    conn.close()
+
+    wb = Workbook()
+    ws = wb.active
+    ws.append([h for h, _ in EXPORT_COLUMNS])
+    for row in rows:
+        ws.append(list(row))
+    for col in ws.columns:
+        longest = max((len(str(c.value)) for c in col if c.value), default=0)
+        ws.column_dimensions[col[0].column_letter].width = min(longest + 2, 50)
+    wb.save(filepath)
+
+
+def _child(mode: str, db_path: str, filepath: str, out):
+    start = time.perf_counter()
+    if mode == "legacy":
+        _legacy_export(db_path, filepath)
+    else:
+        from modules.exporter import export_jobs_to_excel
+        export_jobs_to_excel(filepath, since=0, until=2 ** 62, db_path=db_path)
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    out.put((time.perf_counter() - start, peak_kb))
+
+
+def measure(mode: str, db_path: str, filepath: str) -> tuple[float, float]:
+    """(seconds, peak RSS in MB) for one export in a fresh process."""
+    out = multiprocessing.Queue()
+    proc = multiprocessing.Process(target=_child, args=(mode, db_path, filepath, out))
+    proc.start()
+    seconds, peak_kb = out.get()
+    proc.join()
+    return seconds, peak_kb / 1024
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Exporter peak-RSS benchmark")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--mode", choices=["streaming", "legacy", "both"], default="both")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "jobs.db")
+        print(f"🏗  Building {args.rows:,}-row database...")
+        build_db(db_path, args.rows)
+
+        modes = ["streaming", "legacy"] if args.mode == "both" else [args.mode]
+        for mode in modes:
+            out = os.path.join(tmp, f"{mode}.xlsx")
+            seconds, peak_mb = measure(mode, db_path, out)
+            size_mb = os.path.getsize(out) / 1024 / 1024
+            print(f"📊 {mode:<9} {seconds:6.1f}s · peak RSS {peak_mb:7.1f} MB · "
+                  f"{size_mb:.1f} MB xlsx")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,255 @@
+# benchmarks/generic_html_extract.py
+"""
+Field-extraction benchmark for the generic HTML job parser.
+Runs the per-field extractors as they were before the single-pass scan
+(legacy: a select_one per selector, plus find_all sweeps for aria-labels,
+location strings and apply buttons) and PageScan over a corpus of saved
+pages. It checks that all five fields agree on every page and reports the
+time per page for each, with the cost of parsing the HTML for scale.
+
+The corpus is a directory of .html files (saved career / job pages). If no
+directory is given, a synthetic one is generated, covering every selector,
+fallback and edge case of the heuristics (short titles, nested
+.job-meta .location, location strings in comments, ...). --fetch saves the
+pages of a URL list into the corpus first.
+
+    python benchmarks/generic_html_extract.py --pages 300
+    python benchmarks/generic_html_extract.py --fetch urls.txt --corpus pages/
+"""
+
+import re
+import time
+import random
+import hashlib
+import argparse
+from pathlib import Path
+from urllib.parse import urlparse
+
+import requests
+from bs4 import BeautifulSoup
+
+import sys, os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.parsing.generic_html import (
+    HEADERS, JD_SELECTORS, TITLE_SELECTORS, LOCATION_SELECTORS, COMPANY_SELECTORS,
+    APPLY_PATTERNS, PageScan, make_soup,
+)
+
+FIELDS = ("title", "company", "location", "description", "has_apply")
+URL = "https://www.acme-robotics.com/careers/jobs/123"
+
+
+# ── Legacy extractors (one search per selector) ───────────────────────────────
+
+def legacy_title(soup):
+    for selector in TITLE_SELECTORS:
+        el = soup.select_one(selector)
+        if el:
+            text = el.get_text(strip=True)
+            if 5 < len(text) < 200:
+                return text
+    for el in soup.find_all(attrs={"aria-label": True}):
+        label = el.get("aria-label", "")
+        if any(k in label.lower() for k in ["job", "position", "role", "title"]):
+            return label[:200]
+    title_tag = soup.find("title")
+    if title_tag:
+        parts = re.split(r"\s*[|–—-]\s*", title_tag.get_text(strip=True))
+        if parts:
+            return parts[0].strip()[:200]
+    return ""
+
+
+def legacy_company(soup, url):
+    for tag in soup.find_all("meta", attrs={"property": "og:site_name"}):
+        return tag.get("content", "")[:100]
+    for selector in COMPANY_SELECTORS:
+        el = soup.select_one(selector)
+        if el:
+            return el.get_text(strip=True)[:100]
+    domain = urlparse(url).netloc.replace("www.", "").split(".")[0]
+    return domain.replace("-", " ").title()
+
+
+def legacy_location(soup):
+    for selector in LOCATION_SELECTORS:
+        el = soup.select_one(selector)
+        if el:
+            text = el.get_text(strip=True)
+            if 2 < len(text) < 150:
+                return text
+    for el in soup.find_all(string=re.compile(r"📍|location:", re.IGNORECASE)):
+        parent = el.parent
+        if parent:
+            loc = re.sub(r"^(📍|location:)\s*", "", parent.get_text(strip=True), flags=re.IGNORECASE)
+            if 2 < len(loc) < 150:
+                return loc
+    return "Unknown"
+
+
+def legacy_description(soup):
+    for selector in JD_SELECTORS:
+        el = soup.select_one(selector)
+        if el:
+            text = el.get_text(separator=" ", strip=True)
+            if len(text) > 200:
+                return text[:6000]
+    body = soup.find("body")
+    if body:
+        return body.get_text(separator=" ", strip=True)[:6000]
+    return ""
+
+
+def legacy_has_apply(soup):
+    for el in soup.find_all(["a", "button"]):
+        text = el.get_text(strip=True)
+        for pattern in APPLY_PATTERNS:
+            if pattern.search(text):
+                return True
+    return False
+
+
+def legacy_fields(soup, url) -> tuple:
+    return (legacy_title(soup), legacy_company(soup, url), legacy_location(soup),
+            legacy_description(soup), legacy_has_apply(soup))
+
+
+def scan_fields(soup, url) -> tuple:
+    page = PageScan(soup)
+    return page.title(), page.company(url), page.location(), page.description(), page.has_apply()
+
+
+# ── Synthetic corpus ──────────────────────────────────────────────────────────
+
+WORDS = ("platform engineering team build scalable services python data pipelines "
+         "customers product design review mentor ship reliable systems cloud").split()
+
+
+def _text(rnd, n):
+    return " ".join(rnd.choice(WORDS) for _ in range(n))
+
+
+def _paragraphs(rnd, n):
+    return "".join(f"<p class='{rnd.choice(['copy', 'lead', 'muted text'])}'>{_text(rnd, rnd.randint(20, 60))}</p>"
+                   for _ in range(n))
+
+
+def synthetic_page(rnd: random.Random) -> str:
+    role = f"{rnd.choice(['Senior', 'Junior', 'Staff', ''])} {rnd.choice(['Backend', 'Data', 'ML'])} Engineer".strip()
+    head = [f"<title>{role} | Acme</title>" if rnd.random() < 0.8 else ""]
+    if rnd.random() < 0.4:
+        head.append(f"<meta property='og:site_name' content='{rnd.choice(['Acme Robotics', ''])}'>")
+    head.append("<script>var location = 'location: nowhere';</script><style>.job-title{}</style>")
+
+    title = rnd.choice([
+        f"<h1 class='job-title'>{role}</h1>", f"<h1 class='posting-headline big'>{role}</h1>",
+        f"<h1 class='position-title'>{role}</h1>", f"<div data-qa='job-title'>{role}</div>",
+        f"<span data-testid='job-title'>{role}</span>", f"<h1>{role}</h1>", "<h1>Hi</h1>",
+        f"<h1 class='JOB-TITLE'>{role}</h1>", f"<div data-qa='Job-Title'>{role}</div>",
+        f"<section aria-label='Job details: {role}'></section>", "",
+    ])
+    if rnd.random() < 0.3:
+        title = f"<div aria-label='Main menu'></div>{title}"
+
+    company = rnd.choice(["", "<span class='company-name'>Acme Robotics</span>",
+                          "<div class='employer'> Acme </div>", "<b data-qa='company'>ACME</b>"])
+    location = rnd.choice([
+        "", "<span class='job-location'>Berlin, Germany</span>", "<div class='location'>Remote</div>",
+        "<div class='location'></div><div class='job-meta'><span class='location'>Munich</span></div>",
+        "<div class='location'>x</div><div class='job-meta'><p><i class='location icon'>Hamburg</i></p></div>",
+        "<span data-qa='job-location'>Amsterdam</span>", "<span data-testid='location'>Lisbon</span>",
+        "<div class='posting-location'>Dublin</div>", "<p>📍 Vienna, Austria</p>",
+        "<li><b>Location:</b> Zurich</li>", "<p>LOCATION: Remote (EU)</p>",
+        "<!-- location: internal note --><p>location: Paris</p>", "<p>location:</p>",
+    ])
+    jd = _paragraphs(rnd, rnd.randint(1, 8))
+    description = rnd.choice([
+        f"<div class='job-description'>{jd}</div>", f"<div id='jobDescription'>{jd}</div>",
+        f"<section data-qa='job-description'>{jd}</section>", f"<div role='article'>{jd}</div>",
+        f"<div class='job_description'>short</div><article class='job'>{jd}</article>",
+        f"<div class='job'>{jd}</div>", f"<article>{jd}</article>", f"<main>{jd}</main>",
+        f"<div class='content'>{jd}</div>", f"<div class='vacancy-description'>{jd}</div>",
+    ])
+    apply = rnd.choice(["", "<a href='#apply'>Apply now</a>", "<button>Submit Application</button>",
+                        "<a href='/x'><span>Apply</span> <em>today</em></a>", "<a href='/jobs'>See all jobs</a>"])
+    noise = (f"<header><nav><a href='/'>Home</a><a href='/apply'>Apply</a></nav></header>"
+             f"<aside>{_paragraphs(rnd, 2)}</aside><footer>Location: HQ</footer>")
+    filler = _paragraphs(rnd, rnd.randint(5, 60))
+    body = [noise, title, company, location, description, apply, filler]
+    if rnd.random() < 0.5:
+        rnd.shuffle(body)
+    body_tag = "".join(body) if rnd.random() < 0.05 else f"<body>{''.join(body)}</body>"
+    return f"<!DOCTYPE html><html><head>{''.join(head)}</head>{body_tag}</html>"
+
+
+def load_corpus(directory: str | None, pages: int, seed: int) -> list[str]:
+    if directory:
+        return [p.read_text(errors="replace") for p in sorted(Path(directory).glob("*.html"))]
+    rnd = random.Random(seed)
+    return [synthetic_page(rnd) for _ in range(pages)]
+
+
+def fetch_corpus(url_file: str, directory: str):
+    """Save each URL in url_file (one per line) as <sha1>.html in directory."""
+    out = Path(directory)
+    out.mkdir(parents=True, exist_ok=True)
+    for url in Path(url_file).read_text().split():
+        try:
+            r = requests.get(url, headers=HEADERS, timeout=12)
+        except Exception as e:
+            print(f"  ✗ {url}: {e}")
+            continue
+        if r.status_code == 200:
+            (out / f"{hashlib.sha1(url.encode()).hexdigest()[:12]}.html").write_text(r.text)
+
+
+# ── Benchmark ─────────────────────────────────────────────────────────────────
+
+def run(corpus: list[str], repeat: int):
+    started = time.perf_counter()
+    soups = [make_soup(html) for html in corpus]
+    parse_ms = (time.perf_counter() - started) * 1000 / len(corpus)
+
+    mismatches = 0
+    for i, soup in enumerate(soups):
+        old, new = legacy_fields(soup, URL), scan_fields(soup, URL)
+        if old != new:
+            mismatches += 1
+            diff = [f for f, a, b in zip(FIELDS, old, new) if a != b]
+            print(f"  ✗ page {i}: {', '.join(diff)} differ")
+    print(f"🔎 {len(corpus)} pages ({sum(map(len, corpus)) / len(corpus) / 1024:.0f} KB avg): "
+          f"{mismatches} with differing fields")
+
+    timings = {}
+    for name, extract in (("legacy", legacy_fields), ("single-pass", scan_fields)):
+        started = time.perf_counter()
+        for _ in range(repeat):
+            for soup in soups:
+                extract(soup, URL)
+        timings[name] = (time.perf_counter() - started) * 1000 / (repeat * len(soups))
+    for name, ms in timings.items():
+        print(f"📊 {name:<12} {ms:6.2f} ms/page extracting all five fields")
+    print(f"   (make_soup: {parse_ms:.2f} ms/page; speed-up {timings['legacy'] / timings['single-pass']:.1f}×)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generic HTML field-extraction benchmark")
+    parser.add_argument("--corpus", help="directory of saved .html pages (default: synthetic)")
+    parser.add_argument("--fetch", help="file of URLs to save into --corpus first")
+    parser.add_argument("--pages", type=int, default=300, help="synthetic pages to generate")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args(argv)
+    if args.fetch:
+        if not args.corpus:
+            parser.error("--fetch needs --corpus")
+        fetch_corpus(args.fetch, args.corpus)
+    corpus = load_corpus(args.corpus, args.pages, args.seed)
+    if not corpus:
+        parser.error(f"no .html files in {args.corpus}")
+    run(corpus, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+# benchmarks/mock_telegram_api.py
+"""
+Local stand-in for the Telegram Bot API.
+Answers getMe and sendMessage like api.telegram.org, with configurable
+latency, random 429 (retry_after) and 5xx responses, an optional per-chat
+rate limit, and a record of every message received.
+
+Run standalone and point the agent at it:
+    python benchmarks/mock_telegram_api.py --port 8081 --latency 0.05
+    TELEGRAM_API_BASE=http://127.0.0.1:8081/bot python main.py
+"""
+
+import json
+import time
+import random
+import argparse
+import threading
+from urllib.parse import parse_qs
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class MockTelegramAPI:
+    """Threaded HTTP server speaking enough of the Bot API for the notifier."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0,
+                 latency: float = 0.0, jitter: float = 0.0,
+                 rate_limit_prob: float = 0.0, retry_after: int = 1,
+                 error_prob: float = 0.0, chat_rate: float = None,
+                 seed: int = None):
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_limit_prob = rate_limit_prob
+        self.retry_after = retry_after
+        self.error_prob = error_prob
+        self.chat_rate = chat_rate      # enforce msgs/sec per chat (None = off)
+        self.received = []              # [{"chat_id", "text", "ts"}]
+        self.stats = {"requests": 0, "delivered": 0, "rate_limited": 0, "errors": 0}
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._last_by_chat = {}
+        self._message_id = 0
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/bot"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever,
+                                        name="mock-telegram", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def reset(self):
+        with self._lock:
+            self.received.clear()
+            self._last_by_chat.clear()
+            for key in self.stats:
+                self.stats[key] = 0
+
+    # ── Request handling ──────────────────────────────────────────────────────
+
+    def _respond(self, method: str, params: dict) -> tuple[int, dict]:
+        if self.latency or self.jitter:
+            time.sleep(self.latency + self._random.uniform(0, self.jitter))
+
+        with self._lock:
+            self.stats["requests"] += 1
+
+            if method == "getMe":
+                return 200, {"ok": True, "result": {
+                    "id": 1, "is_bot": True, "first_name": "Mock", "username": "mock_bot",
+                }}
+            if method != "sendMessage":
+                return 200, {"ok": True, "result": True}
+
+            chat_id = params.get("chat_id")
+            now = time.monotonic()
+
+            if self._random.random() < self.error_prob:
+                self.stats["errors"] += 1
+                return 500, {"ok": False, "error_code": 500,
+                             "description": "Internal Server Error"}
+
+            retry_after = None
+            if self._random.random() < self.rate_limit_prob:
+                retry_after = self.retry_after
+            elif self.chat_rate and chat_id in self._last_by_chat:
+                gap = 1 / self.chat_rate - (now - self._last_by_chat[chat_id])
+                if gap > 0:
+                    retry_after = max(1, round(gap))
+            if retry_after is not None:
+                self.stats["rate_limited"] += 1
+                return 429, {"ok": False, "error_code": 429,
+                             "description": f"Too Many Requests: retry after {retry_after}",
+                             "parameters": {"retry_after": retry_after}}
+
+            self._last_by_chat[chat_id] = now
+            self._message_id += 1
+            self.stats["delivered"] += 1
+            self.received.append({"chat_id": chat_id, "text": params.get("text", ""),
+                                  "ts": time.time()})
+            return 200, {"ok": True, "result": {
+                "message_id": self._message_id,
+                "date": int(time.time()),
+                "chat": {"id": int(chat_id) if str(chat_id).lstrip("-").isdigit() else 0,
+                         "type": "group" if str(chat_id).startswith("-") else "private"},
+                "text": params.get("text", ""),
+            }}
+
+    def _handler(self):
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"   # keep-alive, like the real API
+            disable_nagle_algorithm = True  # headers + body go out without a 40ms ACK stall
+
+            def _params(self) -> dict:
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length).decode("utf-8") if length else ""
+                if "json" in (self.headers.get("Content-Type") or ""):
+                    return json.loads(body or "{}")
+                return {k: v[0] for k, v in parse_qs(body).items()}
+
+            def _handle(self):
+                # /bot<token>/<method>
+                method = self.path.rstrip("/").rsplit("/", 1)[-1]
+                status, payload = api._respond(method, self._params())
+                body = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            do_GET = do_POST = _handle
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Mock Telegram Bot API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds per request")
+    parser.add_argument("--jitter", type=float, default=0.0, help="extra random latency")
+    parser.add_argument("--rate-limit-prob", type=float, default=0.0, help="chance of a 429")
+    parser.add_argument("--retry-after", type=int, default=1)
+    parser.add_argument("--error-prob", type=float, default=0.0, help="chance of a 500")
+    parser.add_argument("--chat-rate", type=float, default=None,
+                        help="enforce this many msgs/sec per chat with 429s")
+    args = parser.parse_args()
+
+    api = MockTelegramAPI(args.host, args.port, args.latency, args.jitter,
+                          args.rate_limit_prob, args.retry_after,
+                          args.error_prob, args.chat_rate).start()
+    print(f"🧪 Mock Telegram API on {api.base_url} — Ctrl+C to stop")
+    try:
+        while True:
+            time.sleep(5)
+            print(f"   {api.stats}")
+    except KeyboardInterrupt:
+        api.stop()
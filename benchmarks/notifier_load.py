@@ -0,0 +1,135 @@
+# benchmarks/notifier_load.py
+"""
+Notifier load test against the local mock Bot API.
+Pushes N job alerts through NotifierService and reports throughput, per-alert
+latency (submit → Telegram ack), queue backlog over time and retry counts.
+
+    python benchmarks/notifier_load.py                     # 1k + 10k, Telegram's limits, 100 chats
+    python benchmarks/notifier_load.py --alerts 1000 --chats 1 --rate-limit-prob 0.02
+    python benchmarks/notifier_load.py --global-rate 1000 --chat-rate 1000   # raw pipeline ceiling
+"""
+
+import time
+import argparse
+import threading
+import statistics
+
+import sys, os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import TELEGRAM_GLOBAL_RATE
+from modules.notifier import NotifierService, format_job_alert
+from benchmarks.mock_telegram_api import MockTelegramAPI
+
+MOCK_TOKEN = "123456:MOCK-TOKEN"
+
+
+def _fake_job(i: int) -> dict:
+    return {
+        "job_title": f"Junior Software Engineer {i}",
+        "company": f"Company {i % 50}",
+        "location": "Bangalore, India",
+        "country": "India",
+        "job_url": f"https://example.com/jobs/{i}",
+        "source": "greenhouse",
+        "date_posted": "2026-01-01",
+    }
+
+
+def _pct(values: list[float], q: int) -> float:
+    if len(values) < 2:
+        return values[0] if values else 0.0
+    return statistics.quantiles(values, n=100)[q - 1]
+
+
+def run_load(api: MockTelegramAPI, alerts: int, chats: int = 100,
+             global_rate: float = TELEGRAM_GLOBAL_RATE, chat_rate: float = None,
+             sample_every: float = 0.25) -> dict:
+    """Send `alerts` messages spread over `chats` chat ids; return measurements."""
+    api.reset()
+    service = NotifierService(token=MOCK_TOKEN, chat_id="1", base_url=api.base_url,
+                              global_rate=global_rate, chat_rate=chat_rate).start()
+
+    # Backlog sampler — how deep the queue gets and how fast it drains
+    backlog, stop = [], threading.Event()
+
+    def sample():
+        while not stop.is_set():
+            backlog.append(service.backlog())
+            stop.wait(sample_every)
+
+    sampler = threading.Thread(target=sample, daemon=True)
+    sampler.start()
+
+    latencies = []
+    started = time.perf_counter()
+    futures = []
+    for i in range(alerts):
+        submitted = time.perf_counter()
+        future = service.submit(format_job_alert(_fake_job(i)), chat_id=str(1000 + i % chats))
+        future.add_done_callback(lambda f, t=submitted: latencies.append(time.perf_counter() - t))
+        futures.append(future)
+    enqueue_seconds = time.perf_counter() - started
+
+    delivered = sum(1 for f in futures if f.result() is not None)
+    elapsed = time.perf_counter() - started
+    stop.set()
+    sampler.join()
+    service.close()
+
+    return {
+        "alerts": alerts,
+        "delivered": delivered,
+        "received": len(api.received),
+        "seconds": elapsed,
+        "throughput": delivered / elapsed if elapsed else 0.0,
+        "enqueue_us": enqueue_seconds / alerts * 1e6 if alerts else 0.0,
+        "p50": _pct(latencies, 50),
+        "p95": _pct(latencies, 95),
+        "max": max(latencies, default=0.0),
+        "max_backlog": max(backlog, default=0),
+        "notifier": dict(service.stats),
+        "mock": dict(api.stats),
+    }
+
+
+def print_report(r: dict):
+    print(f"\n📨 {r['alerts']:,} alerts → {r['delivered']:,} delivered "
+          f"({r['received']:,} seen by mock) in {r['seconds']:.1f}s")
+    print(f"   ⚡ Throughput:   {r['throughput']:.1f} msg/s")
+    print(f"   📥 submit():     {r['enqueue_us']:.1f} µs per alert")
+    print(f"   ⏱  Latency:      p50 {r['p50']:.2f}s · p95 {r['p95']:.2f}s · max {r['max']:.2f}s")
+    print(f"   📦 Max backlog:  {r['max_backlog']:,}")
+    print(f"   🔁 Notifier:     {r['notifier']}")
+    print(f"   🧪 Mock API:     {r['mock']}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test the Telegram notifier")
+    parser.add_argument("--alerts", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--chats", type=int, default=100, help="spread alerts over N chats")
+    parser.add_argument("--global-rate", type=float, default=TELEGRAM_GLOBAL_RATE)
+    parser.add_argument("--chat-rate", type=float, default=None,
+                        help="override the per-chat limit (default: Telegram's)")
+    parser.add_argument("--latency", type=float, default=0.02, help="mock seconds per request")
+    parser.add_argument("--jitter", type=float, default=0.01)
+    parser.add_argument("--rate-limit-prob", type=float, default=0.0)
+    parser.add_argument("--error-prob", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args(argv)
+
+    api = MockTelegramAPI(latency=args.latency, jitter=args.jitter,
+                          rate_limit_prob=args.rate_limit_prob,
+                          error_prob=args.error_prob, seed=args.seed).start()
+    print(f"🧪 Mock Telegram API on {api.base_url}")
+    print(f"   limits: {args.global_rate}/s global, "
+          f"{args.chat_rate or 'Telegram default'} per chat, {args.chats} chats")
+    try:
+        for n in args.alerts:
+            print_report(run_load(api, n, args.chats, args.global_rate, args.chat_rate))
+    finally:
+        api.stop()
+
+
+if __name__ == "__main__":
+    main()
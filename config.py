@@ -9,6 +9,9 @@ load_dotenv()
 # ==========================================================
 TELEGRAM_TOKEN = os.getenv("TELEGRAM_TOKEN")
 TELEGRAM_CHAT_ID = os.getenv("TELEGRAM_CHAT_ID")
+# Bot API endpoint (token is appended). Point at benchmarks/mock_telegram_api.py
+# to load-test the notifier without messaging a real chat.
+TELEGRAM_API_BASE = os.getenv("TELEGRAM_API_BASE", "https://api.telegram.org/bot")
 
 # ==========================================================
 # DATABASE
@@ -91,4 +94,136 @@ GREENHOUSE_COMPANIES = [
 
 LEVER_COMPANIES = [
     "netlify", "postman", "webflow",
-]
\ No newline at end of file
+]
+
+# ==========================================================
+# RETENTION / ARCHIVE
+# ==========================================================
+RETENTION_DAYS          = 180   # jobs older than this move to Parquet
+AI_CACHE_RETENTION_DAYS = 30    # re-validate with Ollama after this
+DOMAIN_RETENTION_DAYS   = 90    # drop crawled domains that never yielded a job
+HTTP_CACHE_RETENTION_DAYS = 14  # drop cached pages not revalidated for this long
+ARCHIVE_DIR             = "archive"
+
+# ==========================================================
+# BACKGROUND STORAGE WRITER
+# ==========================================================
+WRITER_QUEUE_SIZE    = 1000  # jobs buffered before submit() applies backpressure
+WRITER_BATCH_SIZE    = 50    # commit once this many jobs are pending...
+WRITER_FLUSH_SECONDS = 1.0   # ...or once the oldest pending job is this old
+WRITER_RETRIES       = 2     # a failed batch is retried this many times, then written row by row
+WRITER_RETRY_SECONDS = 0.5   # first retry delay (doubles per retry)
+
+# ==========================================================
+# TELEGRAM RATE LIMITS (Bot API)
+# ==========================================================
+TELEGRAM_GLOBAL_RATE = 30       # messages/sec across all chats
+TELEGRAM_CHAT_RATE   = 1.0      # messages/sec to one private chat
+TELEGRAM_GROUP_RATE  = 20 / 60  # messages/sec to one group/channel
+NOTIFY_MAX_RETRIES   = 3        # retries after 429 / network errors
+
+# ==========================================================
+# DIGEST MODE (batch many alerts into few messages)
+# ==========================================================
+DIGEST_MODE            = False      # True → group alerts instead of one message per job
+DIGEST_GROUP_BY        = "company"  # "source" | "country" | "company"
+DIGEST_MAX_JOBS        = 25         # flush once this many jobs are buffered...
+DIGEST_MAX_SECONDS     = 600        # ...or once the oldest buffered job is this old
+DIGEST_IMMEDIATE_SCORE = 6          # rule score that skips the digest (None = never)
+TELEGRAM_MAX_MESSAGE   = 4096       # Telegram's hard limit per message
+
+# ==========================================================
+# NOTIFICATION OUTBOX (durable alert delivery)
+# ==========================================================
+OUTBOX_POLL_SECONDS        = 5      # how often the dispatcher looks for due alerts
+OUTBOX_BATCH_SIZE          = 100    # alerts claimed per poll
+OUTBOX_MAX_ATTEMPTS        = 8      # give up (status 'failed') after this many sends
+OUTBOX_BACKOFF_SECONDS     = 30     # first retry delay, doubled per attempt...
+OUTBOX_MAX_BACKOFF_SECONDS = 3600   # ...up to this
+OUTBOX_RETENTION_DAYS      = 30     # delivered/failed rows kept this long
+
+# ==========================================================
+# INCREMENTAL EXPORTS (CSV / JSONL / Parquet feeds)
+# ==========================================================
+EXPORT_DIR              = "exports"
+EXPORT_CHUNK_ROWS       = 50000  # rows per output file
+EXPORT_COMPRESS         = True   # gzip CSV/JSONL, zstd Parquet
+EXPORT_INTERVAL_MINUTES = 5      # how often main.py refreshes EXPORT_TARGETS
+EXPORT_TARGETS          = {}     # target name → format, e.g. {"dashboard": "parquet"}
+
+# ==========================================================
+# SCHEDULING (one job per source)
+# ==========================================================
+SOURCE_INTERVALS = {           # minutes between scans of each source
+    "jobspy":     60,          # slow: 100 searches with pauses
+    "greenhouse": 10,          # cheap JSON APIs
+    "lever":      10,
+}
+SCHEDULER_WORKERS         = 4     # scans that may run at the same time
+SCHEDULER_MAX_INSTANCES   = 1     # a source never overlaps itself
+SCHEDULER_COALESCE        = True  # several missed runs collapse into one
+SCHEDULER_MISFIRE_SECONDS = 300   # a run this late still starts; later → skipped
+
+# ==========================================================
+# ADAPTIVE POLLING (per-board cadence for Greenhouse / Lever)
+# ==========================================================
+ADAPTIVE_CADENCE     = True
+CADENCE_TICK_MINUTES = 1     # how often due boards are checked (one indexed query)
+CADENCE_MIN_MINUTES  = 5     # busiest boards: polled at most this often
+CADENCE_MAX_MINUTES  = 720   # quietest boards: polled at least this often
+CADENCE_WINDOW_DAYS  = 30    # arrival history used to estimate posting rates
+CADENCE_PRIOR_JOBS   = 1     # pseudo-arrivals per window so new/quiet boards aren't starved
+
+# ==========================================================
+# STAGED SCAN PIPELINE (discover → crawl → parse → filter → AI → store → notify)
+# ==========================================================
+PIPELINE_INTERVAL_MINUTES  = 60    # web discovery + all ATS adapters
+PIPELINE_DISCOVERY_QUERIES = 15    # DuckDuckGo queries per run
+PIPELINE_CRAWL_DOMAINS     = 2000  # domains crawled per run (taken from the crawl frontier)
+PIPELINE_AI_VALIDATE       = True  # Ollama check before saving (accepts when offline)
+PIPELINE_STAGES = {                # stage → (worker threads, queue bound)
+    "parse":       (2, 500),       # batches of 50 job pages, fetched 20 at a time on one session
+    "filter":      (2, 1000),
+    "ai_validate": (2, 200),       # Ollama is one local GPU — keep this low
+    "store":       (1, 1000),
+    "notify":      (1, 1000),
+}
+
+# ==========================================================
+# SHARDED SCANNING (python main.py --workers N, on one or more machines)
+# ==========================================================
+SHARD_COUNTS = {               # source → shards its boards / queries are split into
+    "jobspy":         8,       # (location, term) queries
+    "greenhouse":     8,       # company boards — scraper and ats:greenhouse boards, deduped
+    "lever":          3,       # likewise with ats:lever
+    "ats:ashby":      2,
+    "ats:workable":   2,
+    "discover":       1,       # web discovery → crawl → parse (not split)
+}
+SHARD_LEASE_SECONDS     = 120  # a shard whose owner stops heartbeating is reclaimable after this
+SHARD_HEARTBEAT_SECONDS = 30   # lease renewal interval while a shard is being scanned
+SHARD_POLL_SECONDS      = 15   # idle workers look for due shards this often
+
+# ==========================================================
+# CHECKPOINTS (resume a crashed / restarted scan)
+# ==========================================================
+CHECKPOINT_SECONDS   = 30   # how often finished boards / queries / domains are recorded
+CHECKPOINT_MAX_HOURS = 6    # older checkpoints are discarded (that work is re-fetched)
+
+# ==========================================================
+# CRAWL FRONTIER (persistent, prioritised domain queue for the career crawler)
+# ==========================================================
+FRONTIER_WORKERS          = 50    # async crawl workers per run
+FRONTIER_CLAIM_BATCH      = 100   # domains claimed from crawl_frontier at a time
+FRONTIER_HOST_CONCURRENCY = 2     # open connections per host
+FRONTIER_HOST_DELAY       = 1.0   # seconds between request starts to one host
+FRONTIER_DOMAIN_TIMEOUT   = 180   # one domain's whole crawl (robots, sitemaps, pages)
+FRONTIER_MAX_ATTEMPTS     = 3     # failed crawls are retried, then left until the next recrawl
+FRONTIER_RETRY_MINUTES    = 10    # first retry delay (doubles per attempt)
+FRONTIER_LEASE_MINUTES    = 15    # domains held by a dead worker return to the queue after this
+FRONTIER_CRAWLED_HOURS    = 24    # crawled rows whose jobs were never saved are dropped after this
+FRONTIER_RESULT_QUEUE     = 100   # crawled domains waiting for the pipeline before workers pause
+FRONTIER_RECRAWL_HOURS    = 24    # crawled domains are queued again after this
+FRONTIER_YIELD_WEIGHT     = 1.0   # priority = weight × ln(1 + past job links) + freshness
+FRONTIER_FRESH_DAYS       = 7     # freshness half-life (new domains) / ramp (re-crawls)
+HTTP_CACHE                = True  # revalidate career / job pages; reuse results when unchanged
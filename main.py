@@ -1,6 +1,7 @@
 """
 main.py — Aggressive Job Discovery Agent
-Scans every 60 minutes. Filters, saves to SQLite, sends Telegram alerts.
+Scans every source on its own interval (ATS boards every 10 minutes, JobSpy
+hourly). Filters, saves to SQLite, sends Telegram alerts.
 NO HR review. NO resume. NO applying. JUST discovery.
 """
 import sys
@@ -8,19 +9,63 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 import time
+import signal
+import argparse
+import threading
+import multiprocessing
 from datetime import datetime
-from apscheduler.schedulers.blocking import BlockingScheduler
-
-from modules.scraper import search_jobs
-from modules.tracker import init_db, job_exists, save_job
-from modules.notifier import send_message, notify_job_found
+from functools import partial
+from apscheduler.schedulers.background import BackgroundScheduler
+from apscheduler.executors.pool import ThreadPoolExecutor
+from apscheduler.events import EVENT_JOB_MISSED, EVENT_JOB_MAX_INSTANCES, EVENT_JOB_ERROR
+
+from modules.scraper import SOURCES, BOARDS
+from modules.tracker import init_db
+from modules.storage import get_storage
+from modules.writer import JobWriter
+from modules.notifier import send_message, close_notifier
+from modules.outbox import OutboxDispatcher
+from modules.retention import run_retention
+from modules.incremental_export import export_all
+from modules.cadence import BoardCadence
+from modules.pipeline import build_scan_pipeline, ats_sources, print_report
+from modules.shards import (
+    ShardWorker, Lease, define_shards, define_role, worker_id,
+    work_items, fetch_items, fetch_shard,
+)
+from modules.checkpoints import ScanCheckpoint, checkpointed
 
 from config import (
     SPONSORSHIP_KEYWORDS,
     NON_ENGLISH_KEYWORDS,
     REJECT_TITLE_KEYWORDS,
+    EXPORT_TARGETS,
+    EXPORT_INTERVAL_MINUTES,
+    SOURCE_INTERVALS,
+    SCHEDULER_WORKERS,
+    SCHEDULER_MAX_INSTANCES,
+    SCHEDULER_COALESCE,
+    SCHEDULER_MISFIRE_SECONDS,
+    ADAPTIVE_CADENCE,
+    CADENCE_TICK_MINUTES,
+    PIPELINE_INTERVAL_MINUTES,
+    SHARD_COUNTS,
+    SHARD_POLL_SECONDS,
 )
 
+# Single background writer — scan loops enqueue, it commits each job
+# together with its Telegram alert in the notification outbox
+writer = JobWriter(alerts=True)
+
+# Delivers outbox alerts (one by one, or as digests when DIGEST_MODE is on)
+dispatcher = OutboxDispatcher()
+
+# Picks which ATS boards to poll on each tick from their posting rates
+cadence = BoardCadence() if ADAPTIVE_CADENCE else None
+
+# Sharded mode: the node holding this lease runs the dispatcher + maintenance
+MAINTENANCE_ROLE = "role:maintenance"
+
 
 # ==========================================================
 # FILTER FUNCTIONS
@@ -80,64 +125,86 @@ def is_valid_job(job):
 # MAIN SCAN FUNCTION
 # ==========================================================
 
-def scan_jobs():
-    """Discover → Filter → Save → Notify"""
+def scan_jobs(sources=tuple(SOURCES), discover=True):
+    """
+    Discover → Filter → Save → Notify through the staged pipeline: the given
+    scraper sources, the four ATS adapters and (optionally) web discovery
+    → crawl → parse, all feeding one filter → AI-validate → store → notify chain.
+    Resumes from its checkpoint if the previous run was cut short.
+    """
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
     print(f"\n{'='*55}")
     print(f"🔎 Scan started at {timestamp}")
     print(f"{'='*55}\n")
 
-    jobs = search_jobs()
+    checkpoint = ScanCheckpoint("scan:all" if sources else "scan:pipeline", writer)
+    feeds = {}
+    for name in list(sources) + list(ats_sources()):
+        feeds[name] = partial(checkpointed, checkpoint, name, work_items(name),
+                              partial(fetch_items, name))
+    run_pipeline(feeds, "Scan", timestamp, discover=discover, checkpoint=checkpoint)
 
-    print(f"\n📊 Total unique jobs from scraper: {len(jobs)}")
 
-    new_count         = 0
-    skipped_filter    = 0
-    skipped_duplicate = 0
+def scan_source(name):
+    """Discover → Filter → Save → Notify for one source (one scheduled job)."""
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
-    for job in jobs:
+    boards = None
+    if cadence and name in BOARDS:
+        boards = cadence.due(name, BOARDS[name], SOURCE_INTERVALS.get(name, 60))
+        if not boards:
+            return
+        print(f"\n🎯 {name}: {len(boards)}/{len(BOARDS[name])} boards due")
 
-        if not is_valid_job(job):
-            skipped_filter += 1
-            continue
+    print(f"\n🔎 {name} scan started at {timestamp}")
 
-        job_url = job.get("job_url", "")
-        if not job_url or job_exists(job_url):
-            skipped_duplicate += 1
-            continue
+    checkpoint = ScanCheckpoint(f"scan:{name}", writer)
+    items = work_items(name) if boards is None else boards
 
-        # Enrich
-        job["visa_sponsorship"] = (
-            "sponsored" if contains_sponsorship(job.get("jd_content", ""))
-            else "not_required"
-        )
-        job["status"]   = "discovered"
-        job["hr_score"] = 0
-        job["notes"]    = f"Source: {job.get('source', 'unknown')}"
+    def fetch():
+        started = time.time()
+        yield from checkpointed(checkpoint, name, items, partial(fetch_items, name))
+        if boards:
+            cadence.mark_polled(name, boards, started)
 
-        # Save
-        save_job(job)
+    run_pipeline({name: fetch}, f"{name.capitalize()} scan", timestamp,
+                 checkpoint=checkpoint)
 
-        # Notify
-        try:
-            notify_job_found(job)
-        except Exception as e:
-            print(f"  ⚠️ Telegram failed: {e}")
 
-        new_count += 1
-        time.sleep(2)
+def run_pipeline(sources, label, timestamp, discover=False, checkpoint=None):
+    """Run one pipeline scan to completion, then print and send the summary."""
+    if checkpoint:
+        checkpoint.start()
+    pipe = build_scan_pipeline(writer, dispatcher, is_valid_job, sources,
+                               discover=discover, checkpoint=checkpoint)
+    metrics = pipe.run()
+    if checkpoint:
+        checkpoint.finish()
+
+    writer.flush()
+    dispatcher.nudge()
+
+    # 'new' / 'duplicate' are counted as the writer commits, so read them after the flush
+    metrics["counters"] = counters = dict(pipe.counters)
+    new_count         = counters.get("new", 0)
+    skipped_filter    = counters.get("filtered", 0) + counters.get("ai_rejected", 0)
+    skipped_duplicate = counters.get("duplicate", 0)
 
     # Summary
-    print(f"\n📊 Scan Summary:")
+    print(f"\n📊 {label} Summary:")
     print(f"  ✅ New jobs sent:   {new_count}")
     print(f"  🔍 Filtered out:   {skipped_filter}")
     print(f"  🔁 Duplicates:     {skipped_duplicate}")
+    print_report(metrics)
+    for t in get_storage().timings()[:3]:
+        print(f"  🗄  {t['statement']}: {t['calls']} calls, "
+              f"{t['avg_ms']:.2f} ms avg, {t['max_ms']:.2f} ms max")
 
     if new_count > 0:
         try:
             send_message(
-                f"📊 *Scan Complete — {timestamp}*\n"
+                f"📊 *{label} Complete — {timestamp}*\n"
                 f"✅ New jobs: {new_count}\n"
                 f"🔍 Filtered: {skipped_filter}\n"
                 f"🔁 Duplicates: {skipped_duplicate}"
@@ -146,29 +213,208 @@ def scan_jobs():
             pass
 
 
+# ==========================================================
+# SCHEDULER
+# ==========================================================
+
+def _on_job_event(event):
+    """Log scans that were skipped or failed instead of dropping them silently."""
+    if event.code == EVENT_JOB_MAX_INSTANCES:
+        if cadence and event.job_id.split(":", 1)[-1] in BOARDS:
+            return      # a board sweep outlasting one cadence tick is expected
+        print(f"⏭  {event.job_id}: previous run still going — skipped")
+    elif event.code == EVENT_JOB_MISSED:
+        print(f"⏭  {event.job_id}: missed run at {event.scheduled_run_time:%H:%M} — skipped")
+    elif event.code == EVENT_JOB_ERROR:
+        print(f"❌ {event.job_id} failed: {event.exception}")
+
+
+def build_scheduler(scans=True):
+    """
+    One job per source, each on its own interval, plus maintenance jobs
+    (only the maintenance jobs with scans=False).
+    A source never overlaps itself (max_instances); if the process was busy
+    or asleep, missed runs collapse into one (coalesce) and runs later than
+    the grace period are skipped until the next slot.
+    """
+    scheduler = BackgroundScheduler(
+        executors={"default": ThreadPoolExecutor(SCHEDULER_WORKERS)},
+        job_defaults={
+            "max_instances": SCHEDULER_MAX_INSTANCES,
+            "coalesce": SCHEDULER_COALESCE,
+            "misfire_grace_time": SCHEDULER_MISFIRE_SECONDS,
+        },
+    )
+    scheduler.add_listener(_on_job_event,
+                           EVENT_JOB_MISSED | EVENT_JOB_MAX_INSTANCES | EVENT_JOB_ERROR)
+
+    now = datetime.now()
+    for name in (SOURCES if scans else ()):
+        minutes = SOURCE_INTERVALS.get(name, 60)
+        if cadence and name in BOARDS:
+            # Tick often; the cadence decides which boards are actually due
+            minutes = CADENCE_TICK_MINUTES
+        scheduler.add_job(scan_source, "interval", minutes=minutes, args=[name],
+                          id=f"scan:{name}", name=f"{name} scan",
+                          next_run_time=now)    # first run straight away
+
+    # Web discovery + crawl + the four ATS adapters; scraper sources above
+    # keep their own schedules
+    if scans:
+        scheduler.add_job(scan_jobs, "interval", minutes=PIPELINE_INTERVAL_MINUTES,
+                          kwargs={"sources": ()}, id="scan:pipeline", name="pipeline scan",
+                          next_run_time=now)
+
+    scheduler.add_job(run_retention, "cron", hour=3, minute=30, id="retention")
+    if EXPORT_TARGETS:
+        scheduler.add_job(export_all, "interval", minutes=EXPORT_INTERVAL_MINUTES,
+                          args=[EXPORT_TARGETS], id="export")
+    return scheduler
+
+
+# ==========================================================
+# SHARDED MODE (python main.py --workers N)
+# ==========================================================
+
+def scan_shard(source, items, label):
+    """Scan one claimed shard: its slice of a source's queries / boards."""
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    # Named after the shard, so a worker that reclaims it resumes the scan
+    checkpoint = ScanCheckpoint(label, writer)
+
+    if source == "discover":
+        print(f"\n🧩 {label} started at {timestamp}")
+        run_pipeline({}, label, timestamp, discover=True, checkpoint=checkpoint)
+        return
+    if not items:
+        return
+
+    print(f"\n🧩 {label}: {len(items)} boards/queries — started at {timestamp}")
+    fetch = partial(checkpointed, checkpoint, source, items, partial(fetch_shard, source))
+    run_pipeline({source: fetch}, f"{label} scan", timestamp, checkpoint=checkpoint)
+
+
+def shard_worker_main():
+    """One worker process: claim shards and scan them until SIGTERM."""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)    # the coordinator handles Ctrl+C
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+
+    init_db()
+    writer.start()
+    worker = ShardWorker(scan_shard)
+    print(f"🧩 Shard worker {worker.owner} started")
+    try:
+        worker.run(stop)
+    finally:
+        writer.close()
+
+
+def run_sharded(workers, stop):
+    """
+    Coordinator for one machine: keeps `workers` shard-worker processes
+    alive, and — while it holds the maintenance lease — runs the outbox
+    dispatcher, retention and exports (one node at a time does that).
+    """
+    ctx = multiprocessing.get_context("spawn")
+
+    def spawn(i):
+        proc = ctx.Process(target=shard_worker_main, name=f"shard-worker-{i}")
+        proc.start()
+        return proc
+
+    procs = [spawn(i) for i in range(workers)]
+
+    init_db()
+    define_shards()
+    define_role(MAINTENANCE_ROLE)
+    role = Lease(MAINTENANCE_ROLE, worker_id())
+    maintenance = build_scheduler(scans=False)
+    maintenance.start(paused=True)
+    holding = False
+    print(f"🧩 Sharded mode: {workers} worker process(es), "
+          f"{sum(SHARD_COUNTS.values())} shards\nPress Ctrl+C to stop.\n")
+
+    try:
+        while True:
+            for i, proc in enumerate(procs):
+                if not proc.is_alive():
+                    print(f"⚠️  {proc.name} exited ({proc.exitcode}) — restarting")
+                    procs[i] = spawn(i)
+
+            if holding and role.lost.is_set():
+                print("⚠️  Maintenance lease lost — another node took over")
+                maintenance.pause()
+                dispatcher.close()
+                holding = False
+            if not holding and role.acquire():
+                print("📮 Holding the maintenance lease — dispatching alerts on this node")
+                dispatcher.start()
+                maintenance.resume()
+                holding = True
+
+            if stop.wait(SHARD_POLL_SECONDS):
+                break
+    finally:
+        print("\n👋 Agent stopping — waiting for running shards...")
+        for proc in procs:
+            proc.terminate()
+        for proc in procs:
+            proc.join()
+        maintenance.shutdown(wait=True)
+        if holding:
+            dispatcher.close()
+            role.release()
+        close_notifier()
+
+
 # ==========================================================
 # ENTRY POINT
 # ==========================================================
 
 if __name__ == "__main__":
 
+    parser = argparse.ArgumentParser(description="Job discovery agent")
+    parser.add_argument("--workers", type=int, default=0,
+                        help="sharded mode: scan with N worker processes (run on every machine)")
+    args = parser.parse_args()
+
     print("\n🚀 Aggressive Job Discovery Agent Started")
-    print("📡 Sources: LinkedIn, Indeed, Glassdoor, Greenhouse, Lever")
-    print("⏱  Interval: every 60 minutes")
+    print("📡 Sources: LinkedIn, Indeed, Glassdoor, Greenhouse, Lever, Ashby, Workable, web discovery")
+    print("⏱  Interval: " + ", ".join(f"{n} every {m} min" for n, m in SOURCE_INTERVALS.items()))
     print("🌍 Regions: India, UK, Germany, Netherlands, Ireland, UAE, Sweden, Poland, Spain, Remote\n")
 
-    init_db()
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+
+    if args.workers:
+        try:
+            run_sharded(args.workers, stop)
+        except KeyboardInterrupt:
+            pass
+        sys.exit(0)
 
-    # Run immediately
-    scan_jobs()
+    init_db()
+    writer.start()
+    dispatcher.start()
 
-    # Schedule recurring
-    scheduler = BlockingScheduler()
-    scheduler.add_job(scan_jobs, "interval", minutes=60)
+    # Scans run on the scheduler's worker threads; the main thread only
+    # waits for a shutdown signal
+    scheduler = build_scheduler()
+    scheduler.start()
 
-    print("\n⏰ Next scan in 60 minutes. Press Ctrl+C to stop.\n")
+    for job in scheduler.get_jobs():
+        print(f"⏰ {job.name}: {job.trigger}")
+    print("\nPress Ctrl+C to stop.\n")
 
     try:
-        scheduler.start()
+        while not stop.wait(1):
+            pass
     except KeyboardInterrupt:
-        print("\n👋 Agent stopped")
+        pass
+    finally:
+        print("\n👋 Agent stopping — waiting for running scans...")
+        scheduler.shutdown(wait=True)
+        writer.close()
+        dispatcher.close()
+        close_notifier()
@@ -0,0 +1,163 @@
+# modules/cadence.py
+"""
+Adaptive polling cadence for ATS boards (Greenhouse / Lever companies).
+Each board's posting rate is learned from new-job arrivals in the jobs table
+over the last CADENCE_WINDOW_DAYS, smoothed with CADENCE_PRIOR_JOBS
+pseudo-arrivals so new or quiet boards are never starved.
+
+Poll frequency is then set proportional to sqrt(rate): for Poisson arrivals
+that is the split of a fixed number of polls that minimises average
+discovery latency (busy boards are polled more, quiet ones back off).
+Intervals are clipped to [CADENCE_MIN_MINUTES, CADENCE_MAX_MINUTES], and the
+total stays within the budget of polling every board once per
+SOURCE_INTERVALS[source] minutes.
+
+Each board's last poll is stored in the board_polls table and read back the
+first time a source is planned, so a restart doesn't make every board due
+at once.
+"""
+
+import math
+import time
+import logging
+import threading
+
+import sys, os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import (
+    CADENCE_TICK_MINUTES,
+    CADENCE_MIN_MINUTES,
+    CADENCE_MAX_MINUTES,
+    CADENCE_WINDOW_DAYS,
+    CADENCE_PRIOR_JOBS,
+    SOURCE_INTERVALS,
+)
+from modules.storage import init_storage, get_storage
+from modules.scraper import board_company, BOARDS
+
+log = logging.getLogger(__name__)
+
+
+def allocate_intervals(rates: dict, polls_per_second: float,
+                       min_interval: float, max_interval: float) -> dict:
+    """
+    Poll interval (seconds) per board for a total budget of polls_per_second.
+    Frequencies ∝ sqrt(rate); boards that hit a bound are pinned there and
+    the remaining budget is re-split among the rest (water-filling).
+    """
+    weights = {b: math.sqrt(max(r, 0.0)) for b, r in rates.items()}
+    lo, hi = 1.0 / max_interval, 1.0 / min_interval
+    freq, free = {}, set(weights)
+
+    while free:
+        budget = polls_per_second - sum(freq.values())
+        total = sum(weights[b] for b in free)
+        share = {b: budget * weights[b] / total if total > 0 else budget / len(free)
+                 for b in free}
+        # Pin the fastest boards first — that frees budget for the rest,
+        # which may lift some of them back above the floor
+        over = [b for b in free if share[b] >= hi]
+        under = [b for b in free if share[b] <= lo] if not over else []
+        if not over and not under:
+            freq.update(share)
+            break
+        for board in over or under:
+            freq[board] = hi if over else lo
+            free.discard(board)
+
+    return {board: 1.0 / f for board, f in freq.items()}
+
+
+class BoardCadence:
+    """Decides which boards of a source are due on each scheduler tick."""
+
+    def __init__(self, tick_minutes: float = CADENCE_TICK_MINUTES,
+                 min_minutes: float = CADENCE_MIN_MINUTES,
+                 max_minutes: float = CADENCE_MAX_MINUTES,
+                 window_days: float = CADENCE_WINDOW_DAYS,
+                 prior_jobs: float = CADENCE_PRIOR_JOBS):
+        self.tick = tick_minutes * 60
+        self.min_interval = min_minutes * 60
+        self.max_interval = max_minutes * 60
+        self.window = window_days * 86400
+        self.prior_jobs = prior_jobs
+        self._last_polled = {}          # (source, board) → epoch seconds
+        self._loaded = set()            # sources seeded from board_polls
+        self._lock = threading.Lock()
+
+    def _load(self, source: str):
+        """Seed a source's last-poll times from board_polls (once per process)."""
+        with self._lock:
+            if source in self._loaded:
+                return
+            for board, polled_ts in get_storage().fetchall("board_polls_load", (source,)):
+                key = (source, board)
+                self._last_polled[key] = max(self._last_polled.get(key, 0), polled_ts)
+            self._loaded.add(source)
+
+    def rates(self, source: str, boards: list[str], now: float = None) -> dict:
+        """Smoothed new-job arrivals per second for each board."""
+        now = now or time.time()
+        counts = dict(get_storage().fetchall(
+            "board_arrivals", (source, int(now - self.window))
+        ))
+        return {
+            board: (counts.get(board_company(board), 0) + self.prior_jobs) / self.window
+            for board in boards
+        }
+
+    def intervals(self, source: str, boards: list[str], base_minutes: float,
+                  now: float = None) -> dict:
+        """Poll interval (seconds) per board, spending the same polls as a fixed base_minutes."""
+        if not boards:
+            return {}
+        budget = len(boards) / (base_minutes * 60)
+        return allocate_intervals(self.rates(source, boards, now), budget,
+                                  self.min_interval, self.max_interval)
+
+    def due(self, source: str, boards: list[str], base_minutes: float,
+            now: float = None) -> list[str]:
+        """Boards whose interval has elapsed, most overdue first. Never-polled boards are due."""
+        now = now or time.time()
+        intervals = self.intervals(source, boards, base_minutes, now)
+        # Half a tick of slack rounds each interval to the nearest tick
+        # instead of always up, which keeps polls on budget
+        slack = self.tick / 2
+        self._load(source)
+        with self._lock:
+            elapsed = {b: now - self._last_polled.get((source, b), 0) for b in boards}
+        return [
+            board for board in sorted(boards, key=lambda b: -elapsed[b] / intervals[b])
+            if elapsed[board] + slack >= intervals[board]
+        ]
+
+    def mark_polled(self, source: str, boards: list[str], now: float = None):
+        now = now or time.time()
+        with self._lock:
+            for board in boards:
+                self._last_polled[(source, board)] = now
+        storage = get_storage()
+        with storage.transaction():
+            storage.executemany("board_poll_put",
+                                [(source, board, int(now)) for board in boards])
+
+    def plan(self, source: str, boards: list[str], base_minutes: float) -> list[dict]:
+        """Per-board rate and interval, busiest first (for logs / inspection)."""
+        rates = self.rates(source, boards)
+        intervals = self.intervals(source, boards, base_minutes)
+        return sorted(
+            ({"board": b, "jobs_per_day": rates[b] * 86400,
+              "interval_minutes": intervals[b] / 60} for b in boards),
+            key=lambda row: row["interval_minutes"],
+        )
+
+
+if __name__ == "__main__":
+    init_storage()
+    cadence = BoardCadence()
+    for source, boards in BOARDS.items():
+        print(f"\n🎯 {source} (budget: every board every {SOURCE_INTERVALS[source]} min)")
+        for row in cadence.plan(source, boards, SOURCE_INTERVALS[source]):
+            print(f"  {row['board']:<24} {row['jobs_per_day']:6.2f} jobs/day → "
+                  f"every {row['interval_minutes']:5.0f} min")
@@ -0,0 +1,169 @@
+# modules/checkpoints.py
+"""
+Checkpointed, resumable scans.
+A scan is split into work units — a board or JobSpy query at the fetch
+stage, a company domain at the crawl stage. Jobs carry their unit in
+job["_unit"]; a unit is settled once every job it produced has left the
+pipeline (stored, filtered out or rejected). Every CHECKPOINT_SECONDS the
+writer is flushed and the settled units are recorded in scan_checkpoints,
+so a recorded unit's jobs (and their alerts) are already committed — a
+unit with a job the writer could not save is never recorded.
+
+If the process dies mid-scan, the next run of the same scan skips the
+recorded units and fetches only the rest. A scan that completes clears its
+checkpoints. Units recorded more than CHECKPOINT_MAX_HOURS ago are
+discarded, and fetched again.
+"""
+
+import time
+import logging
+import threading
+
+import sys, os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import CHECKPOINT_SECONDS, CHECKPOINT_MAX_HOURS
+from modules.storage import get_storage
+
+log = logging.getLogger(__name__)
+
+
+def item_key(item) -> str:
+    """Stored form of a work item ('stripe', or 'Berlin|python developer')."""
+    return "|".join(item) if isinstance(item, tuple) else str(item)
+
+
+class ScanCheckpoint:
+    """Tracks the units of one named scan (e.g. 'scan:jobspy') and records settled ones."""
+
+    def __init__(self, scan: str, writer,
+                 interval: float = CHECKPOINT_SECONDS,
+                 max_hours: float = CHECKPOINT_MAX_HOURS):
+        self.scan = scan
+        self.writer = writer
+        self.interval = interval
+        self.max_age = max_hours * 3600
+        self.stats = {"resumed": 0, "skipped": 0, "recorded": 0}
+        self._done = set()          # (stage, source, key) recorded earlier
+        self._open = {}             # unit → [jobs outstanding, jobs total, on_settle]
+        self._settled = []          # (unit, jobs, on_settle) waiting to be recorded
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    # ── Lifecycle ─────────────────────────────────────────────────────────────
+
+    def start(self):
+        """Drop expired checkpoints, load this scan's, start periodic recording."""
+        storage = get_storage()
+        storage.execute("checkpoint_expire", (int(time.time() - self.max_age),))
+        self._done = {tuple(row) for row in storage.fetchall("checkpoint_load", (self.scan,))}
+        self.stats["resumed"] = len(self._done)
+        if self._done:
+            print(f"↩️  {self.scan}: resuming — {len(self._done)} unit(s) already done")
+
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name=f"checkpoint-{self.scan}",
+                                        daemon=True)
+        self._thread.start()
+        return self
+
+    def finish(self):
+        """The scan ran to the end: record what settled, then forget its checkpoints."""
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+        self.commit()
+        get_storage().execute("checkpoint_clear", (self.scan,))
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.commit()
+            except Exception as e:
+                log.warning(f"Checkpoint {self.scan} failed: {e}")
+
+    # ── Units ─────────────────────────────────────────────────────────────────
+
+    def is_done(self, stage: str, source: str, item) -> bool:
+        done = (stage, source, item_key(item)) in self._done
+        if done:
+            self.stats["skipped"] += 1
+        return done
+
+    def open(self, stage: str, source: str, item, jobs: int, on_settle=None) -> tuple:
+        """Start tracking a unit that produced `jobs` pipeline items. Returns the unit tag."""
+        unit = (stage, source, item_key(item))
+        with self._lock:
+            if jobs:
+                self._open[unit] = [jobs, jobs, on_settle]
+            else:
+                self._settled.append((unit, 0, on_settle))
+        return unit
+
+    def close(self, item):
+        """Pipeline exit hook: an item left the graph; settle its unit if it was the last."""
+        unit = item.get("_unit") if isinstance(item, dict) else None
+        if unit is None:
+            return
+        with self._lock:
+            entry = self._open.get(unit)
+            if entry is None:
+                return
+            entry[0] -= 1
+            if entry[0] == 0:
+                del self._open[unit]
+                self._settled.append((unit, entry[1], entry[2]))
+
+    def commit(self):
+        """
+        Make settled units durable: flush the writer first, then record them.
+        A unit with a job the writer failed to save stays unrecorded (and its
+        on_settle is not called), so a resumed run fetches it again.
+        """
+        with self._lock:
+            settled, self._settled = self._settled, []
+        if not settled:
+            return
+        self.writer.flush()
+        failed = self.writer.take_failed(entry[0] for entry in settled)
+        lost = [entry for entry in settled if entry[0] in failed]
+        if lost:
+            log.warning(f"Checkpoint {self.scan}: {len(lost)} unit(s) had jobs that failed "
+                        f"to save — left open")
+            settled = [entry for entry in settled if entry[0] not in failed]
+
+        storage = get_storage()
+        now = int(time.time())
+        with storage.transaction():
+            for (stage, source, key), jobs, _ in settled:
+                storage.execute("checkpoint_put", (self.scan, stage, source, key, jobs, now))
+        for _, _, on_settle in settled:
+            if on_settle:
+                on_settle()
+        self.stats["recorded"] += len(settled)
+
+
+def checkpointed(checkpoint, source: str, items: list, fetch, stage: str = "fetch"):
+    """
+    Yield the jobs of every item not yet done in this scan, one item at a
+    time: fetch([item]) → jobs, each tagged with the item's unit. Without a
+    checkpoint it is just fetch(items).
+    """
+    if checkpoint is None:
+        yield from fetch(items)
+        return
+
+    for item in items:
+        if checkpoint.is_done(stage, source, item):
+            continue
+        try:
+            jobs = fetch([item])
+        except Exception as e:
+            # Left open: a resumed run fetches it again
+            log.warning(f"{source} | {item_key(item)}: {e}")
+            continue
+        unit = checkpoint.open(stage, source, item, len(jobs))
+        for job in jobs:
+            job["_unit"] = unit
+            yield job
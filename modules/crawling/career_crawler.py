@@ -3,16 +3,36 @@
 Intelligent career page crawler.
 Visits discovered domains, detects career pages, extracts job posting links.
 Uses aiohttp for async crawling with Playwright fallback for JS-heavy sites.
+
+Sites whose sitemaps list their job pages are read from the sitemaps instead
+(streamed, gzipped or not, following sitemap indexes). On a re-crawl only
+job URLs whose <lastmod> is newer than the domain's last crawl are returned.
+
+Links are pulled out of pages with a regex anchor scanner rather than a
+parse tree. Pages over OFFLOAD_BYTES are scanned in a parser pool, so the
+event loop keeps serving the other in-flight fetches.
+
+iter_career_pages() is the crawl as an async generator of (domain, job URL),
+yielded as each domain finishes; crawl_jobs() parses those pages on the same
+event loop and session while the other domains are still being crawled.
 """
 
 import re
+import os
+import html as htmllib
+import zlib
 import asyncio
 import logging
-from urllib.parse import urljoin, urlparse
-from datetime import datetime
+import statistics
+import multiprocessing
+from contextlib import contextmanager, aclosing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import xml.etree.ElementTree as ET
+from urllib.parse import urljoin, urlparse, unquote
+from datetime import datetime, timezone
+from collections import Counter, defaultdict
 
 import aiohttp
-from bs4 import BeautifulSoup
 
 log = logging.getLogger(__name__)
 
@@ -63,6 +83,17 @@ JOB_LINK_PATTERNS = [
     re.compile(r"workable\.com/.+/j/", re.IGNORECASE),
 ]
 
+# Hosted ATS boards: (platform, board slug) for the JSON adapters in modules/parsing/
+ATS_BOARD_PATTERNS = {
+    "greenhouse": re.compile(
+        r"(?:job-)?boards(?:-api)?(?:\.eu)?\.greenhouse\.io/"
+        r"(?:v1/boards/|embed/job_(?:board|app)\?for=)?([\w-]+)", re.IGNORECASE),
+    "lever": re.compile(r"//jobs\.lever\.co/([\w.-]+)", re.IGNORECASE),
+    "ashby": re.compile(r"//jobs\.ashbyhq\.com/([\w.%-]+)", re.IGNORECASE),
+    "workable": re.compile(r"//apply\.workable\.com/([\w-]+)", re.IGNORECASE),
+}
+ATS_RESERVED_SLUGS = {"embed", "v1", "api", "j", "jobs"}
+
 HEADERS = {
     "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36",
     "Accept": "text/html,application/xhtml+xml",
@@ -70,6 +101,33 @@ HEADERS = {
 
 MAX_CONCURRENT = 10
 TIMEOUT = 15
+MAX_SITEMAPS = 2                    # sitemap files read per domain while probing
+MAX_SITEMAP_BYTES = 512 * 1024      # enough for the <loc>s of a typical site
+
+# A path segment that names a careers section ('careers', 'jobs', 'join-us', ...)
+CAREER_SEGMENT = re.compile(
+    r"careers?|jobs?|join(-us)?|work-with-us|openings?|opportunities|vacancies|"
+    r"positions|hiring|internships?|talent",
+    re.IGNORECASE,
+)
+SITEMAP_LOC = re.compile(r"<loc>\s*([^<\s]+)\s*</loc>", re.IGNORECASE)
+
+MAX_SITEMAP_FILES = 10                  # sitemap files streamed per domain (indexes included)
+MAX_SITEMAP_STREAM = 50 * 1024 * 1024   # decompressed bytes per file (the protocol's limit)
+SITEMAP_CHUNK = 64 * 1024
+
+PARSE_POOL = "process"                      # "process", "thread" or "inline"
+PARSE_WORKERS = min(4, os.cpu_count() or 1)
+OFFLOAD_BYTES = 32 * 1024                   # smaller pages are scanned on the loop (sub-ms)
+
+# Anchor scanning: drop comments / scripts / styles, then take each <a ...>…</a>
+# (an unclosed <a> ends at the next one)
+NON_CONTENT = re.compile(r"<!--.*?-->|<(script|style)\b.*?</\1\s*>", re.IGNORECASE | re.DOTALL)
+ANCHOR = re.compile(r"<a\s([^>]*)>(.*?)(?=</a\s*>|<a\s)", re.IGNORECASE | re.DOTALL)
+HREF = re.compile(r"""\bhref\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'>]+))""", re.IGNORECASE)
+TAG = re.compile(r"<[^>]*>")
+
+_DONE = object()
 
 
 async def fetch_url(session: aiohttp.ClientSession, url: str) -> str | None:
@@ -89,14 +147,24 @@ async def fetch_url(session: aiohttp.ClientSession, url: str) -> str | None:
         return None
 
 
-def find_career_links(soup: BeautifulSoup, base_url: str) -> list[str]:
-    """Find links that point to career/jobs pages."""
+def extract_anchors(html: str) -> list[tuple[str, str]]:
+    """(href, text) of every link in a page — text whitespace-collapsed."""
+    anchors = []
+    for attrs, inner in ANCHOR.findall(NON_CONTENT.sub("", html or "")):
+        href = HREF.search(attrs)
+        if not href:
+            continue
+        text = " ".join(htmllib.unescape(TAG.sub(" ", inner)).split())
+        anchors.append((htmllib.unescape(next(g for g in href.groups() if g is not None)), text))
+    return anchors
+
+
+def career_links_from(anchors: list[tuple[str, str]], base_url: str) -> list[str]:
+    """Career/jobs page URLs among a page's (href, text) anchors."""
     career_urls = set()
     parsed_base = urlparse(base_url)
 
-    for a in soup.find_all("a", href=True):
-        href = a.get("href", "")
-        text = a.get_text(strip=True)
+    for href, text in anchors:
         full_url = urljoin(base_url, href)
         parsed = urlparse(full_url)
 
@@ -117,12 +185,11 @@ def find_career_links(soup: BeautifulSoup, base_url: str) -> list[str]:
     return list(career_urls)
 
 
-def find_job_links(soup: BeautifulSoup, base_url: str) -> list[str]:
-    """Find links that point to individual job postings."""
+def job_links_from(anchors: list[tuple[str, str]], base_url: str) -> list[str]:
+    """Job posting URLs among a page's (href, text) anchors."""
     job_urls = set()
 
-    for a in soup.find_all("a", href=True):
-        href = a.get("href", "")
+    for href, text in anchors:
         full_url = urljoin(base_url, href)
 
         for pattern in JOB_LINK_PATTERNS:
@@ -131,112 +198,556 @@ def find_job_links(soup: BeautifulSoup, base_url: str) -> list[str]:
                 break
 
         # Also check for apply buttons/links
-        text = a.get_text(strip=True).lower()
-        if "apply" in text and href and href != "#":
+        if "apply" in text.lower() and href and href != "#":
             job_urls.add(full_url)
 
     return list(job_urls)
 
 
-async def detect_career_page(session: aiohttp.ClientSession,
-                              domain: str) -> list[str]:
-    """Try common career paths on a domain and return working URLs."""
-    career_pages = []
+def parse_links(html: str, base_url: str, kind: str) -> list[str]:
+    """Career ('career') or job ('job') links of a page. Runs in the parser pool."""
+    anchors = extract_anchors(html)
+    return career_links_from(anchors, base_url) if kind == "career" else job_links_from(anchors, base_url)
+
+
+# ── Parser Pool ───────────────────────────────────────────────────────────────
+
+_pool = None
+
+
+@contextmanager
+def parser_pool(mode: str = PARSE_POOL, workers: int = PARSE_WORKERS):
+    """
+    Scan large pages in a process (or thread) pool while the block runs.
+    Processes are spawned, not forked: the crawler runs beside other threads.
+    """
+    global _pool
+    previous = _pool
+    if mode == "process":
+        _pool = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn"))
+    elif mode == "thread":
+        _pool = ThreadPoolExecutor(workers, thread_name_prefix="crawl-parse")
+    else:
+        _pool = None
+    try:
+        yield _pool
+    finally:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = previous
+
+
+async def extract_links(html: str, base_url: str, kind: str) -> list[str]:
+    """parse_links off the event loop when the page is large and a pool is running."""
+    if _pool is None or len(html) < OFFLOAD_BYTES:
+        return parse_links(html, base_url, kind)
+    try:
+        return await asyncio.get_running_loop().run_in_executor(
+            _pool, parse_links, html, base_url, kind)
+    except RuntimeError:        # pool shut down under us
+        return parse_links(html, base_url, kind)
+
+
+class LoopLag:
+    """How late the event loop wakes a sleep(interval): a direct measure of blocking."""
+
+    def __init__(self, interval: float = 0.05):
+        self.interval = interval
+        self.samples = []
+        self._task = None
+
+    async def _sample(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            await asyncio.sleep(self.interval)
+            self.samples.append(loop.time() - started - self.interval)
+
+    def start(self):
+        self._task = asyncio.get_running_loop().create_task(self._sample())
+        return self
+
+    def stop(self):
+        if self._task:
+            self._task.cancel()
+
+    def percentiles(self) -> dict:
+        if len(self.samples) < 2:
+            return {"p50_ms": 0.0, "p99_ms": 0.0, "max_ms": 0.0}
+        cuts = statistics.quantiles(self.samples, n=100, method="inclusive")
+        return {"p50_ms": cuts[49] * 1000, "p99_ms": cuts[98] * 1000,
+                "max_ms": max(self.samples) * 1000}
+
+    def summary(self) -> str:
+        p = self.percentiles()
+        return f"loop lag p50 {p['p50_ms']:.1f} ms, p99 {p['p99_ms']:.1f} ms, max {p['max_ms']:.0f} ms"
+
+
+def ats_board(url: str) -> tuple[str, str] | None:
+    """('greenhouse', 'stripe') for a link into a hosted ATS board, else None."""
+    for platform, pattern in ATS_BOARD_PATTERNS.items():
+        match = pattern.search(url or "")
+        if match and match.group(1).lower() not in ATS_RESERVED_SLUGS:
+            return platform, unquote(match.group(1))
+    return None
+
+
+def route_ats_links(urls: list[str], boards: set) -> list[str]:
+    """Move links into hosted ATS boards to `boards`; return the rest."""
+    rest = []
+    for url in urls:
+        board = ats_board(url)
+        if board:
+            boards.add(board)
+        else:
+            rest.append(url)
+    return rest
+
+
+# ── Career Page Detection ─────────────────────────────────────────────────────
+
+class RequestStats:
+    """
+    Requests made per domain, by kind (homepage, robots, sitemap, head, range,
+    page), plus how many job URLs each domain's sitemaps list, how many of
+    its job sitemaps were skipped as unchanged since the last crawl, how
+    many of its career pages revalidated as unchanged (HTTP cache), and the
+    hosted ATS boards its links lead to.
+    """
+
+    def __init__(self):
+        self.by_domain = defaultdict(Counter)
+        self.listed = Counter()
+        self.unchanged = Counter()
+        self.pages_unchanged = Counter()
+        self.boards = defaultdict(set)
+        self.loop_lag = None        # LoopLag of the crawl, when measured
+
+    def add(self, domain: str, kind: str):
+        self.by_domain[domain][kind] += 1
+
+    def total(self) -> int:
+        return sum(sum(c.values()) for c in self.by_domain.values())
+
+    def by_kind(self) -> Counter:
+        kinds = Counter()
+        for counts in self.by_domain.values():
+            kinds.update(counts)
+        return kinds
+
+    def summary(self) -> str:
+        domains = len(self.by_domain) or 1
+        kinds = ", ".join(f"{k} {v}" for k, v in self.by_kind().most_common())
+        lag = f"; {self.loop_lag.summary()}" if self.loop_lag else ""
+        return (f"{self.total()} requests for {len(self.by_domain)} domains "
+                f"({self.total() / domains:.1f} per domain: {kinds}){lag}")
+
+
+def _count(stats, domain: str, kind: str):
+    if stats is not None:
+        stats.add(domain, kind)
+
+
+def _is_html(resp) -> bool:
+    content_type = resp.headers.get("Content-Type", "")
+    return "text/html" in content_type or "application/xhtml" in content_type
+
+
+async def fetch_text(session: aiohttp.ClientSession, url: str,
+                     limit: int = MAX_SITEMAP_BYTES) -> str | None:
+    """GET a small text resource (robots.txt, sitemap.xml), reading at most `limit` bytes."""
+    try:
+        async with session.get(url, timeout=aiohttp.ClientTimeout(total=TIMEOUT),
+                               headers=HEADERS, allow_redirects=True, ssl=False) as resp:
+            if resp.status != 200 or _is_html(resp):
+                return None     # soft 404s serve the homepage instead
+            return (await resp.content.read(limit)).decode("utf-8", errors="replace")
+    except Exception as e:
+        log.debug(f"Fetch error {url[:60]}: {e}")
+        return None
 
+
+def career_paths_from_robots(robots: str, base_url: str) -> tuple[list[str], list[str]]:
+    """
+    (candidate career URLs, sitemap URLs) from robots.txt. Allow/Disallow
+    rules such as 'Disallow: /careers/apply' reveal that /careers exists.
+    """
+    candidates, sitemaps = [], []
+    parsed = urlparse(base_url)
+    root = f"{parsed.scheme}://{parsed.netloc}"
+    for line in (robots or "").splitlines():
+        field, _, value = line.partition(":")
+        field, value = field.strip().lower(), value.split("#")[0].strip()
+        if field == "sitemap" and value:
+            sitemaps.append(urljoin(base_url + "/", value))
+        elif field in ("allow", "disallow") and value.startswith("/"):
+            segments = value.split("*")[0].strip("/$").split("/")
+            for i, segment in enumerate(segments):
+                if CAREER_SEGMENT.fullmatch(segment):
+                    candidates.append(root + "/" + "/".join(segments[:i + 1]))
+                    break
+    return list(dict.fromkeys(candidates)), list(dict.fromkeys(sitemaps))
+
+
+def career_index_url(url: str, host: str) -> str | None:
+    """The careers section a same-host URL sits in ('.../careers/eng/123' → '.../careers')."""
+    parsed = urlparse(url.strip())
+    if parsed.netloc != host:
+        return None
+    segments = parsed.path.strip("/").split("/")
+    for i, segment in enumerate(segments):
+        if CAREER_SEGMENT.fullmatch(segment):
+            return f"{parsed.scheme}://{host}/" + "/".join(segments[:i + 1])
+    return None
+
+
+def career_urls_from_sitemap(xml: str, base_url: str) -> list[str]:
+    """Career index pages listed in a sitemap, shallowest first."""
+    host = urlparse(base_url).netloc
+    found = (career_index_url(loc, host) for loc in SITEMAP_LOC.findall(xml or ""))
+    return sorted(dict.fromkeys(u for u in found if u), key=lambda u: u.count("/"))
+
+
+async def probe_career_url(session: aiohttp.ClientSession, url: str, base_url: str,
+                           stats=None, domain: str = "") -> bool:
+    """
+    Cheap existence check: HEAD, or a 1 KB ranged GET when HEAD is refused.
+    Confirmed when it ends in an HTML 200/206 that isn't a redirect back to
+    the homepage (the usual soft 404).
+    """
+    home = urlparse(base_url).path.rstrip("/")
+    timeout = aiohttp.ClientTimeout(total=TIMEOUT)
+    try:
+        _count(stats, domain, "head")
+        async with session.head(url, timeout=timeout, headers=HEADERS,
+                                allow_redirects=True, ssl=False) as resp:
+            status, final, html = resp.status, resp.url, _is_html(resp)
+        if status in (403, 405, 501):
+            _count(stats, domain, "range")
+            async with session.get(url, timeout=timeout, allow_redirects=True, ssl=False,
+                                   headers={**HEADERS, "Range": "bytes=0-1023"}) as resp:
+                # The body is never read, even if the server ignored the Range
+                status, final, html = resp.status, resp.url, _is_html(resp)
+    except Exception as e:
+        log.debug(f"Probe error {url[:60]}: {e}")
+        return False
+    return status in (200, 206) and html and final.path.rstrip("/") != home
+
+
+async def detect_career_page(session: aiohttp.ClientSession, domain: str,
+                             stats: RequestStats = None, robots: str = None,
+                             sitemap_pages: list[str] = None) -> list[str]:
+    """
+    Find a domain's career page(s) with as few requests as possible, stopping
+    at the first step that confirms one:
+      1. career links on the homepage (one GET, no probing needed)
+      2. robots.txt — career paths in Allow/Disallow rules, Sitemap: entries
+      3. sitemap.xml — career pages it lists
+      4. HEAD probes of those candidates, then of CAREER_PATHS, one at a time
+    A robots.txt or sitemap candidates the caller already fetched are reused
+    (robots="" for a site that has none, so it isn't requested again).
+    """
     # Normalize domain
-    if not domain.startswith("http"):
-        domain = f"https://{domain}"
-    domain = domain.rstrip("/")
-
-    # Try common career paths
-    tasks = []
-    for path in CAREER_PATHS[:10]:  # Limit to avoid too many requests
-        url = f"{domain}{path}"
-        tasks.append(fetch_url(session, url))
-
-    results = await asyncio.gather(*tasks, return_exceptions=True)
-
-    for i, html in enumerate(results):
-        if isinstance(html, str) and html:
-            url = f"{domain}{CAREER_PATHS[i]}"
-            career_pages.append(url)
+    base = domain if domain.startswith("http") else f"https://{domain}"
+    base = base.rstrip("/")
+
+    # 1. Homepage links
+    _count(stats, domain, "homepage")
+    homepage_html = await fetch_url(session, base)
+    if homepage_html:
+        career_links = await extract_links(homepage_html, base, "career")
+        if career_links:
+            return career_links[:5]
+
+    # 2. robots.txt
+    if robots is None:
+        _count(stats, domain, "robots")
+        robots = await fetch_text(session, f"{base}/robots.txt")
+    candidates, sitemaps = career_paths_from_robots(robots, base)
+
+    # 3. sitemap.xml (as listed in robots.txt, else the default location)
+    if sitemap_pages is None:
+        for sitemap in (sitemaps or [f"{base}/sitemap.xml"])[:MAX_SITEMAPS]:
+            _count(stats, domain, "sitemap")
+            candidates.extend(career_urls_from_sitemap(await fetch_text(session, sitemap), base))
+    else:
+        candidates.extend(sitemap_pages)
+
+    # 4. Probe, most likely first, until one is confirmed
+    for url in dict.fromkeys(candidates + [f"{base}{path}" for path in CAREER_PATHS[:10]]):
+        if await probe_career_url(session, url, base, stats, domain):
             log.debug(f"  Found career page: {url}")
+            return [url]
+
+    return []
+
+
+# ── Sitemap Ingestion ─────────────────────────────────────────────────────────
+
+def parse_lastmod(value: str) -> float | None:
+    """Epoch seconds of a sitemap <lastmod> (W3C datetime; dates are taken as UTC)."""
+    try:
+        parsed = datetime.fromisoformat((value or "").strip())
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
 
-    # If no direct paths work, try homepage and look for career links
-    if not career_pages:
-        homepage_html = await fetch_url(session, domain)
-        if homepage_html:
-            soup = BeautifulSoup(homepage_html, "html.parser")
-            career_links = find_career_links(soup, domain)
-            career_pages.extend(career_links[:5])
 
-    return career_pages
+def is_job_url(url: str) -> bool:
+    return any(pattern.search(url) for pattern in JOB_LINK_PATTERNS)
 
 
-async def extract_jobs_from_page(session: aiohttp.ClientSession,
-                                  career_url: str) -> list[str]:
-    """Extract individual job posting URLs from a career page."""
-    html = await fetch_url(session, career_url)
-    if not html:
+async def stream_sitemap(session: aiohttp.ClientSession, url: str):
+    """
+    Yield (tag, loc, lastmod) for every <url> and <sitemap> entry of a
+    sitemap, parsing it as it downloads. Gzipped files (.xml.gz) are
+    inflated on the fly; nothing past MAX_SITEMAP_STREAM bytes is read.
+    """
+    parser = ET.XMLPullParser(events=("end",))
+    inflate, size = None, 0
+    async with session.get(url, timeout=aiohttp.ClientTimeout(total=TIMEOUT * 4),
+                           headers=HEADERS, allow_redirects=True, ssl=False) as resp:
+        if resp.status != 200 or _is_html(resp):
+            return
+        async for chunk in resp.content.iter_chunked(SITEMAP_CHUNK):
+            if inflate is None:
+                gzipped = chunk[:2] == b"\x1f\x8b"
+                inflate = zlib.decompressobj(16 + zlib.MAX_WBITS) if gzipped else False
+            if inflate:
+                chunk = inflate.decompress(chunk, MAX_SITEMAP_STREAM - size)
+            size += len(chunk)
+            parser.feed(chunk)
+
+            for _, elem in parser.read_events():
+                tag = elem.tag.rsplit("}", 1)[-1]
+                if tag not in ("url", "sitemap"):
+                    continue
+                fields = {child.tag.rsplit("}", 1)[-1]: (child.text or "").strip()
+                          for child in elem}
+                elem.clear()        # keep memory flat on 50k-entry files
+                if fields.get("loc"):
+                    yield tag, fields["loc"], fields.get("lastmod")
+            if size >= MAX_SITEMAP_STREAM:
+                log.debug(f"Sitemap {url[:60]} truncated at {size} bytes")
+                return
+
+
+async def sitemap_job_urls(session: aiohttp.ClientSession, sitemaps: list[str],
+                           base_url: str, since: float = None,
+                           stats: RequestStats = None,
+                           domain: str = "") -> tuple[int, int, list[str], list[str]]:
+    """
+    Job URLs listed in a site's sitemaps (JOB_LINK_PATTERNS), following
+    sitemap indexes. With `since` (epoch of the last crawl), entries and
+    child sitemaps whose <lastmod> is not newer are skipped.
+    Returns (job URLs listed, job-named child sitemaps skipped as unchanged,
+    job URLs new or changed, career index pages).
+    """
+    queue, seen = list(sitemaps), set()
+    listed, skipped, fresh, pages = 0, 0, [], []
+    host = urlparse(base_url).netloc
+
+    while queue and len(seen) < MAX_SITEMAP_FILES:
+        url = queue.pop(0)
+        if url in seen:
+            continue
+        seen.add(url)
+        _count(stats, domain, "sitemap")
+        children = []
+        try:
+            async for tag, loc, lastmod in stream_sitemap(session, url):
+                modified = parse_lastmod(lastmod) if lastmod else None
+                unchanged = since is not None and modified is not None and modified <= since
+                if tag == "sitemap":
+                    if not unchanged:
+                        children.append(loc)
+                    elif CAREER_SEGMENT.search(urlparse(loc).path):
+                        skipped += 1
+                elif is_job_url(loc):
+                    listed += 1
+                    if not unchanged:
+                        fresh.append(loc)
+                elif len(pages) < 50 and (page := career_index_url(loc, host)):
+                    pages.append(page)
+        except (ET.ParseError, zlib.error, aiohttp.ClientError, asyncio.TimeoutError) as e:
+            log.debug(f"Sitemap error {url[:60]}: {e}")
+        # Job-looking child sitemaps first ('sitemap-jobs.xml')
+        queue.extend(sorted(children, key=lambda u: not CAREER_SEGMENT.search(u)))
+
+    pages = sorted(dict.fromkeys(pages), key=lambda u: u.count("/"))
+    return listed, skipped, list(dict.fromkeys(fresh)), pages
+
+
+# ── Crawling ──────────────────────────────────────────────────────────────────
+
+async def extract_jobs_from_page(session: aiohttp.ClientSession, career_url: str,
+                                 stats: RequestStats = None, domain: str = "",
+                                 cache=None) -> list[str]:
+    """
+    Extract individual job posting URLs from a career page. With a cache
+    (modules/http_cache), the page is revalidated and an unchanged page's
+    previous links are returned without parsing it; cache reads and writes
+    are SQLite calls, so they run off the event loop.
+    """
+    _count(stats, domain, "page")
+    if cache is None:
+        html = await fetch_url(session, career_url)
+        if not html:
+            return []
+        return await extract_links(html, career_url, "job")
+
+    entry = await asyncio.to_thread(cache.lookup, career_url)
+    try:
+        async with session.get(career_url, timeout=aiohttp.ClientTimeout(total=TIMEOUT),
+                               headers={**HEADERS, **cache.conditional_headers(entry)},
+                               allow_redirects=True, ssl=False) as resp:
+            if resp.status == 304 and entry:
+                html, digest = None, entry.body_hash
+            elif resp.status != 200 or not _is_html(resp):
+                return []
+            else:
+                body = await resp.read()
+                html = body.decode(resp.get_encoding(), errors="replace")
+                digest = cache.body_hash(body)
+            etag, last_modified = resp.headers.get("ETag"), resp.headers.get("Last-Modified")
+    except Exception as e:
+        log.debug(f"Fetch error {career_url[:60]}: {e}")
         return []
 
-    soup = BeautifulSoup(html, "html.parser")
-    return find_job_links(soup, career_url)
+    if entry and digest == entry.body_hash:
+        await asyncio.to_thread(cache.touch, career_url)
+        if stats is not None:
+            stats.pages_unchanged[domain] += 1
+        return cache.cached_result(entry) or []
+
+    links = await extract_links(html, career_url, "job")
+    await asyncio.to_thread(cache.store, career_url, etag, last_modified, digest, links)
+    return links
 
 
-async def crawl_domain(session: aiohttp.ClientSession,
-                       domain: str) -> list[str]:
+async def crawl_domain(session: aiohttp.ClientSession, domain: str,
+                       stats: RequestStats = None, since: float = None,
+                       cache=None) -> list[str]:
     """
     Full crawl pipeline for a single domain:
-    1. Detect career pages
-    2. Extract job links from those pages
+    1. Read job URLs from its sitemaps; if they list any, that's the answer
+       (only those changed since `since`, the last crawl, when given — a
+       job sitemap the index marks unchanged means nothing new)
+    2. Otherwise detect career pages
+    3. Extract job links from those pages (revalidated through `cache`)
+    Links into Greenhouse / Lever / Ashby / Workable boards are not fetched:
+    the (platform, slug) pairs go to stats.boards for the JSON adapters.
     """
-    career_pages = await detect_career_page(session, domain)
+    boards = stats.boards[domain] if stats is not None else set()
+    base = (domain if domain.startswith("http") else f"https://{domain}").rstrip("/")
+    _count(stats, domain, "robots")
+    robots = await fetch_text(session, f"{base}/robots.txt")
+    _, sitemaps = career_paths_from_robots(robots, base)
+
+    listed, skipped, fresh, pages = await sitemap_job_urls(
+        session, sitemaps or [f"{base}/sitemap.xml"], base, since, stats, domain)
+    if stats is not None:
+        stats.listed[domain], stats.unchanged[domain] = listed, skipped
+    if listed or skipped:
+        log.debug(f"  {domain}: {listed} job URLs in sitemaps, {len(fresh)} new or changed")
+        return route_ats_links(fresh, boards)
+
+    career_pages = await detect_career_page(session, domain, stats,
+                                            robots=robots or "", sitemap_pages=pages)
     if not career_pages:
         return []
 
     all_job_urls = []
-    for page in career_pages[:5]:  # Limit pages per domain
-        job_urls = await extract_jobs_from_page(session, page)
+    for page in route_ats_links(career_pages[:5], boards):  # Limit pages per domain
+        job_urls = await extract_jobs_from_page(session, page, stats, domain, cache)
         all_job_urls.extend(job_urls)
 
     # Deduplicate
-    return list(set(all_job_urls))
+    return route_ats_links(list(set(all_job_urls)), boards)
 
 
-async def crawl_career_pages(domains: list[str]) -> dict[str, list[str]]:
+async def iter_career_pages(session: aiohttp.ClientSession, domains: list[str],
+                            stats: RequestStats = None, since: dict = None, cache=None):
     """
-    Crawl multiple domains concurrently.
-    Returns dict mapping domain -> list of job URLs.
+    Crawl domains concurrently on `session`, yielding (domain, job URL) for
+    each domain's links as soon as that domain finishes. Closing the
+    generator early cancels the crawls still running.
     """
-    log.info(f"🕸️  Crawling {len(domains)} domains for career pages...")
-
-    results = {}
+    since = since or {}
     semaphore = asyncio.Semaphore(MAX_CONCURRENT)
 
     async def bounded_crawl(domain):
         async with semaphore:
-            return domain, await crawl_domain(session, domain)
-
-    connector = aiohttp.TCPConnector(limit=MAX_CONCURRENT, ssl=False)
-    async with aiohttp.ClientSession(connector=connector) as session:
-        tasks = [bounded_crawl(d) for d in domains]
-        completed = await asyncio.gather(*tasks, return_exceptions=True)
-
-        for result in completed:
-            if isinstance(result, tuple):
-                domain, urls = result
-                if urls:
-                    results[domain] = urls
-                    log.info(f"  ✅ {domain}: {len(urls)} job links")
-            elif isinstance(result, Exception):
-                log.debug(f"  Crawl error: {result}")
-
-    total_jobs = sum(len(v) for v in results.values())
-    log.info(f"  🕸️  Total job links found: {total_jobs} across {len(results)} domains")
-    return results
-
-
-def run_crawler(domains: list[str]) -> dict[str, list[str]]:
-    """Synchronous wrapper for the async crawler."""
-    return asyncio.run(crawl_career_pages(domains))
+            try:
+                return domain, await crawl_domain(session, domain, stats, since.get(domain), cache)
+            except Exception as e:
+                log.debug(f"  Crawl error {domain}: {e}")
+                return domain, []
+
+    tasks = [asyncio.ensure_future(bounded_crawl(d)) for d in domains]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            domain, urls = await next_done
+            for url in urls:
+                yield domain, url
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def crawl_jobs(domains: list[str], stats: RequestStats = None, since: dict = None,
+                     cache=None, on_unchanged=None):
+    """
+    Crawl domains and parse their job pages on one event loop and session,
+    yielding (domain, job) as each page is parsed — a job page is fetched as
+    soon as its URL comes out of iter_career_pages, while other domains are
+    still being crawled. Pages that aren't jobs are skipped; hosted ATS
+    boards go to stats.boards, not the parser.
+    """
+    from modules.parsing.generic_html import parse_job_page_async
+
+    stats = stats if stats is not None else RequestStats()
+    results = asyncio.Queue()
+    parsing = asyncio.Semaphore(MAX_CONCURRENT)
+    pending = set()
+
+    async def parse(domain, url):
+        try:
+            async with parsing:
+                job = await parse_job_page_async(session, url, cache, on_unchanged, executor=_pool)
+        except Exception as e:
+            log.debug(f"  Parse error {url[:60]}: {e}")
+            return
+        if job:
+            results.put_nowait((domain, job))
+
+    async def produce():
+        try:
+            async with aclosing(iter_career_pages(session, domains, stats, since, cache)) as crawled:
+                async for domain, url in crawled:
+                    task = asyncio.ensure_future(parse(domain, url))
+                    pending.add(task)
+                    task.add_done_callback(pending.discard)
+            while pending:
+                await asyncio.wait(set(pending))
+        finally:
+            results.put_nowait(_DONE)
+
+    connector = aiohttp.TCPConnector(limit=MAX_CONCURRENT * 2, ssl=False)
+    stats.loop_lag = LoopLag().start()
+    try:
+        with parser_pool():
+            async with aiohttp.ClientSession(connector=connector) as session:
+                producer = asyncio.ensure_future(produce())
+                try:
+                    while (result := await results.get()) is not _DONE:
+                        yield result
+                    producer.result()
+                finally:
+                    for task in (producer, *pending):
+                        task.cancel()
+    finally:
+        stats.loop_lag.stop()
+    log.info(f"  🕸️  {stats.summary()}")
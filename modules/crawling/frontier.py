@@ -0,0 +1,355 @@
+# modules/crawling/frontier.py
+"""
+Persistent crawl frontier.
+Domains waiting to be crawled live in the crawl_frontier table, so a crawl
+of thousands of domains survives restarts and can be shared by every worker
+using the same jobs.db. Each row has a priority built from the domain's past
+job yield and its freshness. Workers claim the highest-priority due domains
+in batches.
+
+A run spreads claimed domains over FRONTIER_WORKERS async workers, each with
+its own deque (domains of one host stay on one worker). A worker whose deque
+runs dry steals from the back of the busiest peer's. Politeness is enforced
+by the shared session: at most FRONTIER_HOST_CONCURRENCY connections per
+host, with request starts to one host spaced FRONTIER_HOST_DELAY seconds
+apart. Large pages are scanned for links in the crawler's parser pool.
+
+A crawled domain stays in the frontier until its jobs are saved
+(frontier_done). Domains claimed by a dead worker return to the queue
+after FRONTIER_LEASE_MINUTES. Crawled rows whose jobs were never saved are
+dropped (and reseeded) once their owner is known to be dead — a process on
+this host that no longer exists — or, for a live or remote owner that may
+still be saving them, after FRONTIER_CRAWLED_HOURS.
+
+Results reach the caller through a queue of FRONTIER_RESULT_QUEUE domains;
+when the pipeline falls behind, crawl workers wait instead of piling up
+results in memory.
+"""
+
+import math
+import time
+import queue
+import socket
+import asyncio
+import inspect
+import logging
+import threading
+from collections import deque
+from urllib.parse import urlparse
+
+import aiohttp
+
+import sys, os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from config import (
+    FRONTIER_WORKERS,
+    FRONTIER_CLAIM_BATCH,
+    FRONTIER_HOST_CONCURRENCY,
+    FRONTIER_HOST_DELAY,
+    FRONTIER_DOMAIN_TIMEOUT,
+    FRONTIER_MAX_ATTEMPTS,
+    FRONTIER_RETRY_MINUTES,
+    FRONTIER_LEASE_MINUTES,
+    FRONTIER_CRAWLED_HOURS,
+    FRONTIER_RESULT_QUEUE,
+    FRONTIER_RECRAWL_HOURS,
+    FRONTIER_YIELD_WEIGHT,
+    FRONTIER_FRESH_DAYS,
+    PIPELINE_CRAWL_DOMAINS,
+)
+from modules.storage import init_storage, get_storage
+from modules.crawling.career_crawler import crawl_domain, RequestStats, LoopLag, parser_pool
+
+log = logging.getLogger(__name__)
+
+_DONE = object()
+
+
+# ── Priorities ────────────────────────────────────────────────────────────────
+
+def domain_priority(job_count: int, discovered_ts: int, crawled_ts: int,
+                    now: float = None) -> float:
+    """
+    Past yield plus freshness. A never-crawled domain's freshness halves
+    every FRONTIER_FRESH_DAYS since discovery, so the newest come first. A
+    re-crawl's freshness grows to 1 over FRONTIER_FRESH_DAYS since its last
+    crawl, so the stalest come first.
+    """
+    now = now or time.time()
+    window = FRONTIER_FRESH_DAYS * 86400
+    if crawled_ts:
+        freshness = min(max(now - crawled_ts, 0) / window, 1.0)
+    else:
+        freshness = 0.5 ** (max(now - (discovered_ts or now), 0) / window)
+    return FRONTIER_YIELD_WEIGHT * math.log1p(job_count or 0) + freshness
+
+
+# ── Queue Operations ──────────────────────────────────────────────────────────
+
+def seed_frontier(now: float = None) -> int:
+    """Queue every discovered domain due for a crawl that isn't queued yet."""
+    storage = get_storage()
+    now = now or time.time()
+    cutoff = int(now - FRONTIER_RECRAWL_HOURS * 3600)
+    rows = storage.fetchall("frontier_candidates", (cutoff,))
+    with storage.transaction():
+        for domain, job_count, discovered_ts, crawled_ts in rows:
+            storage.execute("frontier_add", (
+                domain, domain_priority(job_count, discovered_ts, crawled_ts, now),
+                int(now), int(now),
+            ))
+    return len(rows)
+
+
+def owner_alive(owner: str) -> bool | None:
+    """Whether a frontier owner ('host:pid') is still running; None if it's on another host."""
+    host, _, pid = (owner or "").rpartition(":")
+    if host != socket.gethostname() or not pid.isdigit():
+        return None
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def recover_frontier(now: float = None) -> int:
+    """
+    Return domains claimed by a worker that died to the queue, and drop
+    crawled rows whose jobs will never be saved (see the module docstring).
+    """
+    storage = get_storage()
+    now = now or time.time()
+    cutoff = int(now - FRONTIER_LEASE_MINUTES * 60)
+    retention = int(now - FRONTIER_CRAWLED_HOURS * 3600)
+    stale = [domain for domain, owner, leased_ts
+             in storage.fetchall("frontier_stale_crawled", (cutoff,))
+             if leased_ts < retention or owner_alive(owner) is False]
+    with storage.transaction():
+        recovered = storage.execute("frontier_recover", (cutoff,)).rowcount
+        # Crawled but never saved: reseeded from discovered_domains next run
+        for domain in stale:
+            recovered += storage.execute("frontier_done", (domain,)).rowcount
+    return recovered
+
+
+def claim_domains(owner: str, limit: int, now: float = None) -> list[tuple]:
+    """Claim up to `limit` due domains, best first: [(domain, attempts, crawled_ts)]."""
+    storage = get_storage()
+    now = int(now or time.time())
+    claimed = []
+    with storage.transaction():
+        for domain, attempts, crawled_ts in storage.fetchall("frontier_next", (now, limit)):
+            if storage.execute("frontier_claim", (owner, now, domain)).rowcount:
+                claimed.append((domain, attempts, crawled_ts))
+    return claimed
+
+
+def frontier_done(domain: str):
+    """The domain's jobs are saved; drop it until its next recrawl is due."""
+    get_storage().execute("frontier_done", (domain,))
+
+
+def frontier_status() -> dict:
+    return {state: (count, top) for state, count, top
+            in get_storage().fetchall("frontier_status")}
+
+
+# ── Politeness ────────────────────────────────────────────────────────────────
+
+class HostPoliteness:
+    """Spaces request starts to the same host `delay` seconds apart (aiohttp trace hook)."""
+
+    def __init__(self, delay: float = FRONTIER_HOST_DELAY):
+        self.delay = delay
+        self._next = {}         # host → earliest start of its next request
+
+    def trace_config(self) -> aiohttp.TraceConfig:
+        trace = aiohttp.TraceConfig()
+        trace.on_request_start.append(self._on_request_start)
+        return trace
+
+    async def _on_request_start(self, session, ctx, params):
+        host = params.url.host
+        now = asyncio.get_running_loop().time()
+        slot = max(now, self._next.get(host, 0.0))
+        self._next[host] = slot + self.delay
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+# ── Crawler ───────────────────────────────────────────────────────────────────
+
+class FrontierCrawler:
+    """
+    Crawls up to max_domains from the frontier with work-stealing async
+    workers. on_result(domain, job_urls) is called as each domain finishes;
+    if it returns an awaitable the worker waits on it (backpressure).
+    With a cache (modules/http_cache) career pages are revalidated.
+    """
+
+    def __init__(self, owner: str = None, workers: int = FRONTIER_WORKERS,
+                 batch: int = FRONTIER_CLAIM_BATCH,
+                 max_domains: int = PIPELINE_CRAWL_DOMAINS,
+                 stats: RequestStats = None, cache=None):
+        self.owner = owner or f"{socket.gethostname()}:{os.getpid()}"
+        self.workers = workers
+        self.batch = batch
+        self.max_domains = max_domains
+        self.stats = stats if stats is not None else RequestStats()
+        self.cache = cache
+        self.counts = {"claimed": 0, "crawled": 0, "failed": 0, "stolen": 0}
+        self._deques = [deque() for _ in range(workers)]
+        self._refill_lock = None
+        self._exhausted = False
+
+    def _host_slot(self, domain: str) -> int:
+        host = urlparse(domain if "//" in domain else f"//{domain}").hostname or domain
+        return hash(host) % self.workers
+
+    async def _refill(self) -> bool:
+        """Claim another batch into the deques. False when the frontier has nothing left for us."""
+        async with self._refill_lock:
+            if any(self._deques):
+                return True
+            limit = min(self.batch, self.max_domains - self.counts["claimed"])
+            if self._exhausted or limit <= 0:
+                return False
+            claimed = await asyncio.to_thread(claim_domains, self.owner, limit)
+            if not claimed:
+                self._exhausted = True
+                return False
+            self.counts["claimed"] += len(claimed)
+            for entry in claimed:
+                self._deques[self._host_slot(entry[0])].append(entry)
+            return True
+
+    def _next(self, index: int):
+        own = self._deques[index]
+        if own:
+            return own.popleft()
+        victim = max(self._deques, key=len)
+        if victim:
+            self.counts["stolen"] += 1
+            return victim.pop()
+        return None
+
+    async def _worker(self, index: int, session: aiohttp.ClientSession, on_result):
+        while True:
+            entry = self._next(index)
+            if entry is None:
+                if not await self._refill():
+                    return
+                continue
+            domain, attempts, crawled_ts = entry
+            try:
+                urls = await asyncio.wait_for(
+                    crawl_domain(session, domain, self.stats, crawled_ts, self.cache),
+                    FRONTIER_DOMAIN_TIMEOUT)
+            except Exception as e:
+                self.counts["failed"] += 1
+                await asyncio.to_thread(self._failed, domain, attempts, e)
+                continue
+            await asyncio.to_thread(get_storage().execute, "frontier_crawled",
+                                    (int(time.time()), domain, self.owner))
+            self.counts["crawled"] += 1
+            handed = on_result(domain, urls)
+            if inspect.isawaitable(handed):
+                await handed
+
+    def _failed(self, domain: str, attempts: int, error: Exception):
+        storage = get_storage()
+        if attempts + 1 >= FRONTIER_MAX_ATTEMPTS:
+            # Give up until the next recrawl (the old job count is kept)
+            from modules.discovery.web_discovery import mark_crawled
+            log.debug(f"  Frontier: giving up on {domain}: {error!r}")
+            mark_crawled(domain, None)
+            storage.execute("frontier_done", (domain,))
+            return
+        retry_at = time.time() + FRONTIER_RETRY_MINUTES * 60 * 2 ** attempts
+        storage.execute("frontier_retry", (int(retry_at), repr(error)[:200], domain))
+
+    async def run(self, on_result):
+        self._refill_lock = asyncio.Lock()
+        politeness = HostPoliteness()
+        connector = aiohttp.TCPConnector(limit=self.workers * FRONTIER_HOST_CONCURRENCY,
+                                         limit_per_host=FRONTIER_HOST_CONCURRENCY, ssl=False)
+        started = time.perf_counter()
+        self.stats.loop_lag = LoopLag().start()
+        with parser_pool():
+            async with aiohttp.ClientSession(connector=connector,
+                                             trace_configs=[politeness.trace_config()]) as session:
+                try:
+                    await asyncio.gather(*(self._worker(i, session, on_result)
+                                           for i in range(self.workers)))
+                finally:
+                    self.stats.loop_lag.stop()
+                    # Hand back anything claimed but not started (e.g. on cancel)
+                    leftover = [entry[0] for d in self._deques for entry in d]
+                    if leftover:
+                        await asyncio.to_thread(self._release, leftover)
+
+        log.info(f"  🕸️  Frontier: {self.counts['crawled']} domains crawled, "
+                 f"{self.counts['failed']} failed, {self.counts['stolen']} stolen "
+                 f"in {time.perf_counter() - started:.0f}s — {self.stats.summary()}")
+
+    def _release(self, domains: list[str]):
+        storage = get_storage()
+        with storage.transaction():
+            for domain in domains:
+                storage.execute("frontier_release", (domain, self.owner))
+
+
+def crawl_frontier(stats: RequestStats = None, max_domains: int = PIPELINE_CRAWL_DOMAINS,
+                   **kwargs):
+    """
+    Seed the frontier and crawl it on a background event loop, yielding
+    (domain, job URLs) as each domain finishes.
+    """
+    recovered = recover_frontier()
+    seeded = seed_frontier()
+    log.info(f"🕸️  Frontier: {seeded} domains queued, {recovered} recovered")
+
+    results = queue.Queue(maxsize=FRONTIER_RESULT_QUEUE)
+    stopped = threading.Event()         # the caller closed the generator
+    crawler = FrontierCrawler(max_domains=max_domains, stats=stats, **kwargs)
+
+    async def hand_over(domain, urls):
+        # Wait for room without blocking the loop's other in-flight fetches
+        while not stopped.is_set():
+            try:
+                return results.put_nowait((domain, urls))
+            except queue.Full:
+                await asyncio.sleep(0.05)
+        raise RuntimeError("frontier results no longer consumed")
+
+    def run():
+        try:
+            asyncio.run(crawler.run(hand_over))
+        except Exception as e:
+            if not stopped.is_set():
+                log.warning(f"Frontier crawl failed: {e}")
+        finally:
+            while not stopped.is_set():
+                try:
+                    results.put(_DONE, timeout=0.5)
+                    break
+                except queue.Full:
+                    continue
+
+    threading.Thread(target=run, name="frontier", daemon=True).start()
+    try:
+        while (result := results.get()) is not _DONE:
+            yield result
+    finally:
+        stopped.set()
+
+
+if __name__ == "__main__":
+    init_storage()
+    print(f"🕸️  {seed_frontier()} domains added to the frontier")
+    for state, (count, top) in sorted(frontier_status().items()):
+        print(f"  {state:<8} {count:>6}  (top priority {top:.2f})")
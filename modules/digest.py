@@ -0,0 +1,114 @@
+# modules/digest.py
+"""
+Digest mode for Telegram alerts.
+Formats jobs as a few grouped messages (by source, country or company)
+instead of one message per job. The outbox dispatcher (modules/outbox.py)
+batches due alerts and flushes a digest once it holds DIGEST_MAX_JOBS jobs
+or its oldest job is DIGEST_MAX_SECONDS old; jobs whose rule score (job_score)
+reaches DIGEST_IMMEDIATE_SCORE skip the digest and alert at once.
+"""
+
+import sys, os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import DIGEST_GROUP_BY, TELEGRAM_MAX_MESSAGE
+from modules.filtering.rule_scoring import score_job
+
+GROUP_ICONS = {"source": "📡", "country": "🗺", "company": "🏢"}
+
+# Characters that open an entity in Telegram's legacy Markdown
+_MD_SPECIAL = str.maketrans({"_": " ", "*": None, "[": "(", "]": ")", "`": "'"})
+
+
+def _plain(text) -> str:
+    return str(text or "").translate(_MD_SPECIAL).strip()
+
+
+def job_score(job: dict) -> int:
+    """Rule score used to decide whether a job jumps the digest."""
+    if job.get("hr_score"):
+        return int(job["hr_score"])
+    score, _ = score_job(job.get("job_title", "") or "", job.get("jd_content", "") or "")
+    return score
+
+
+# ── Formatting ────────────────────────────────────────────────────────────────
+
+def _group_key(job: dict, group_by: str) -> str:
+    if group_by == "source":
+        return _plain(job.get("source", "unknown")).capitalize() or "Unknown"
+    return _plain(job.get(group_by)) or "Unknown"
+
+
+def _job_line(job: dict, group_by: str, max_len: int = 0) -> str:
+    """
+    One digest line. With max_len, the plain-text parts (details, then the
+    title) are shortened so the line fits; the [title](url) link itself is
+    never cut, and is dropped for a bare title if even that would not fit.
+    """
+    title = _plain(job.get("job_title")) or "Untitled"
+    url = job.get("job_url", "")
+    details = [_plain(job.get(k)) for k in ("company", "country") if k != group_by]
+    details = " · ".join(d for d in details if d)
+    visa = " ✈️" if job.get("visa_sponsorship") == "sponsored" else ""
+
+    def render(title: str, details: str, url: str) -> str:
+        line = (f"• [{title}]({url})" if url else f"• {title}") + visa
+        return f"{line} — {details}" if details else line
+
+    line = render(title, details, url)
+    if not max_len or len(line) <= max_len:
+        return line
+    base = len(render(title, "", url))
+    if details and base + len(" — ") + 2 <= max_len:
+        return render(title, _clip(details, max_len - base - len(" — ")), url)
+    if len(render("", "", url)) + 2 > max_len:
+        url = ""
+    return render(_clip(title, max_len - len(render("", "", url))), "", url)
+
+
+def _clip(text: str, length: int) -> str:
+    return text if len(text) <= length else text[:max(length - 1, 0)].rstrip() + "…"
+
+
+def digest_chunks(jobs: list[dict], group_by: str = DIGEST_GROUP_BY,
+                  max_chars: int = TELEGRAM_MAX_MESSAGE) -> list[tuple[str, list[dict]]]:
+    """
+    Render jobs as grouped digest messages, each at most max_chars long.
+    Messages split between lines; a group that spills over is continued
+    under a repeated header in the next message.
+    Returns [(text, jobs_in_that_message), ...].
+    """
+    groups = {}
+    for job in jobs:
+        groups.setdefault(_group_key(job, group_by), []).append(job)
+
+    icon = GROUP_ICONS.get(group_by, "📂")
+    header = f"📬 *{len(jobs)} new job{'s' if len(jobs) != 1 else ''}*\n"
+    chunks = []
+    current, members_in = header, []
+
+    def split(continuation: str = ""):
+        nonlocal current, members_in
+        chunks.append((current.rstrip(), members_in))
+        current, members_in = continuation, []
+
+    for name in sorted(groups, key=lambda g: (-len(groups[g]), g)):
+        members = groups[name]
+        group_header = f"\n{icon} *{name}* ({len(members)})\n"
+        continued = f"{icon} *{name}* (cont.)\n"
+        # Any line must fit in a message under whichever header it may follow
+        max_len = max_chars - max(len(group_header), len(continued)) - 1
+        if len(current) + len(group_header) > max_chars:
+            split()
+        current += group_header
+        for job in members:
+            line = _job_line(job, group_by, max_len) + "\n"
+            if len(current) + len(line) > max_chars:
+                split(continued)
+            current += line
+            members_in.append(job)
+
+    if members_in:
+        split()
+    return chunks
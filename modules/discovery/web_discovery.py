@@ -9,16 +9,15 @@ Caches discovered domains in SQLite.
 import re
 import time
 import hashlib
-import sqlite3
 import logging
 import random
 from urllib.parse import urlparse
-from datetime import datetime, timedelta
+from datetime import datetime
 
 import sys, os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
-from config import DB_PATH
+from modules.storage import get_storage
 
 log = logging.getLogger(__name__)
 
@@ -97,81 +96,29 @@ ATS_DOMAINS = {
 
 # ── SQLite Domain Cache ──────────────────────────────────────────────────────
 
-def init_domains_table():
-    """Create the discovered_domains table."""
-    conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
-    c.execute("""
-        CREATE TABLE IF NOT EXISTS discovered_domains (
-            domain TEXT PRIMARY KEY,
-            company_name TEXT DEFAULT '',
-            career_url TEXT DEFAULT '',
-            source_query TEXT DEFAULT '',
-            is_ats INTEGER DEFAULT 0,
-            last_crawled TEXT,
-            job_count INTEGER DEFAULT 0,
-            discovered_at TEXT DEFAULT CURRENT_TIMESTAMP
-        )
-    """)
-    conn.commit()
-    conn.close()
-
-
 def domain_exists(domain: str) -> bool:
     """Check if a domain is already in the cache."""
-    conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
-    c.execute("SELECT domain FROM discovered_domains WHERE domain = ?", (domain,))
-    result = c.fetchone()
-    conn.close()
-    return result is not None
+    return get_storage().fetchone("domain_exists", (domain,)) is not None
 
 
 def save_domain(domain: str, company_name: str = "", career_url: str = "",
                 source_query: str = "", is_ats: bool = False):
     """Save a discovered domain to the cache."""
-    conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
     try:
-        c.execute("""
-            INSERT OR IGNORE INTO discovered_domains
-            (domain, company_name, career_url, source_query, is_ats)
-            VALUES (?, ?, ?, ?, ?)
-        """, (domain, company_name, career_url, source_query, int(is_ats)))
-        conn.commit()
+        get_storage().execute("insert_domain", (
+            domain, company_name, career_url, source_query, int(is_ats),
+            int(time.time()),
+        ))
     except Exception as e:
         log.debug(f"Domain save error: {e}")
-    finally:
-        conn.close()
-
-
-def get_uncrawled_domains(limit: int = 50) -> list[str]:
-    """Get domains that haven't been crawled yet or were crawled >24h ago."""
-    conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
-    cutoff = (datetime.now() - timedelta(hours=24)).strftime("%Y-%m-%d %H:%M:%S")
-    c.execute("""
-        SELECT domain FROM discovered_domains
-        WHERE last_crawled IS NULL OR last_crawled < ?
-        ORDER BY discovered_at DESC
-        LIMIT ?
-    """, (cutoff, limit))
-    domains = [r[0] for r in c.fetchall()]
-    conn.close()
-    return domains
-
-
-def mark_crawled(domain: str, job_count: int = 0):
-    """Mark a domain as crawled."""
-    conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
-    c.execute("""
-        UPDATE discovered_domains
-        SET last_crawled = ?, job_count = ?
-        WHERE domain = ?
-    """, (datetime.now().strftime("%Y-%m-%d %H:%M:%S"), job_count, domain))
-    conn.commit()
-    conn.close()
+
+
+def mark_crawled(domain: str, job_count: int | None = 0):
+    """Mark a domain as crawled (job_count None keeps the previous count)."""
+    now = datetime.now()
+    get_storage().execute("mark_crawled", (
+        now.strftime("%Y-%m-%d %H:%M:%S"), int(now.timestamp()), job_count, domain,
+    ))
 
 
 # ── Query Generator ───────────────────────────────────────────────────────────
@@ -250,8 +197,6 @@ def discover_domains(batch_size: int = 15) -> list[str]:
     Discover new company career domains using DuckDuckGo search.
     Returns list of new domains discovered.
     """
-    init_domains_table()
-
     queries = generate_search_queries(batch_size)
     new_domains = []
 
@@ -301,7 +246,3 @@ def discover_domains(batch_size: int = 15) -> list[str]:
     log.info(f"  🌍 Discovered {len(new_domains)} new domains")
     return new_domains
 
-
-# ── Initialize on import ─────────────────────────────────────────────────────
-
-init_domains_table()
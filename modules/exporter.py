@@ -1,64 +1,112 @@
 # modules/exporter.py
-import sqlite3
+"""
+Excel export of stored jobs.
+Rows are streamed from a SQLite cursor straight into an openpyxl write-only
+workbook, so memory stays flat no matter how many jobs are exported.
+Column widths are sized from the data being exported (one MAX(LENGTH())
+pass in SQLite) because write-only sheets need them before the first row.
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+from datetime import datetime, timedelta
 from openpyxl import Workbook
+from openpyxl.utils import get_column_letter
 from config import DB_PATH
-from datetime import datetime
-
-
-def export_jobs_to_excel(filepath="jobs_export.xlsx"):
-    conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
-
-    c.execute("""
-        SELECT
-            job_title,
-            company,
-            country,
-            visa_sponsorship,
-            hr_score,
-            status,
-            resume_version,
-            skills_emphasized,
-            date_found,
-            date_applied,
-            job_url
-        FROM jobs
-        WHERE DATE(date_found) = DATE('now','localtime')
-        ORDER BY date_found DESC
-
-    """)
-
-    rows = c.fetchall()
-    conn.close()
-
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Jobs"
-
-    # Header row
-    headers = [
-        "Job Title", "Company", "Country", "Visa",
-        "HR Score", "Status", "Resume Version",
-        "Skills", "Date Found", "Date Applied", "URL"
+from modules.search import to_epoch
+from modules.storage import init_storage, EXPORT_COLUMNS as _COLUMNS
+
+HEADERS = {
+    "job_title": "Job Title",
+    "company": "Company",
+    "country": "Country",
+    "visa_sponsorship": "Visa",
+    "hr_score": "HR Score",
+    "status": "Status",
+    "resume_version": "Resume Version",
+    "skills_emphasized": "Skills",
+    "date_found": "Date Found",
+    "date_applied": "Date Applied",
+    "job_url": "URL",
+}
+
+# (header, column) in sheet order — the order of the storage export statements
+EXPORT_COLUMNS = [(HEADERS[col], col) for col in _COLUMNS]
+
+MAX_COLUMN_WIDTH = 50
+FETCH_SIZE = 1000
+
+
+def _today_range():
+    """Epoch bounds [start, end) of the current local day."""
+    start = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    end = start + timedelta(days=1)
+    return int(start.timestamp()), int(end.timestamp())
+
+
+def _export_range(since, until):
+    """[start, end) epoch bounds; a bare 'YYYY-MM-DD' until is inclusive."""
+    if since is None and until is None:
+        return _today_range()
+    start = to_epoch(since) if since is not None else 0
+    end = to_epoch(until, end_of_day=True) if until is not None else 2 ** 62
+    return start, end
+
+
+def _column_widths(storage, start_ts, end_ts):
+    """Width per column: longest value (or header) + 2, capped."""
+    row = storage.fetchone("export_widths", (start_ts, end_ts))
+    return [
+        min(max(len(header), longest or 0) + 2, MAX_COLUMN_WIDTH)
+        for (header, _), longest in zip(EXPORT_COLUMNS, row)
     ]
-    ws.append(headers)
-
-    # Add data
-    for row in rows:
-        ws.append(list(row))
-
-    # Auto width
-    for col in ws.columns:
-        max_length = 0
-        column = col[0].column_letter
-        for cell in col:
-            try:
-                if cell.value:
-                    max_length = max(max_length, len(str(cell.value)))
-            except:
-                pass
-        ws.column_dimensions[column].width = min(max_length + 2, 50)
+
+
+def _iter_rows(cursor):
+    while True:
+        rows = cursor.fetchmany(FETCH_SIZE)
+        if not rows:
+            return
+        yield from rows
+
+
+def export_jobs_to_excel(filepath="jobs_export.xlsx", since=None, until=None,
+                         db_path=DB_PATH):
+    """
+    Export jobs found in [since, until] to an .xlsx file.
+    since / until take a datetime, epoch seconds or 'YYYY-MM-DD[ HH:MM:SS]';
+    with neither, today's jobs are exported. Returns the number of rows.
+    """
+    start_ts, end_ts = _export_range(since, until)
+
+    storage = init_storage(db_path)
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Jobs")
+
+    # Write-only sheets emit column widths before the first row
+    for idx, width in enumerate(_column_widths(storage, start_ts, end_ts), 1):
+        ws.column_dimensions[get_column_letter(idx)].width = width
+
+    ws.append([header for header, _ in EXPORT_COLUMNS])
+
+    cursor = storage.execute("export_range", (start_ts, end_ts))
+    count = 0
+    for row in _iter_rows(cursor):
+        ws.append(row)
+        count += 1
 
     wb.save(filepath)
 
-    print(f"📊 Excel exported → {filepath}")
+    print(f"📊 Excel exported → {filepath} ({count} jobs)")
+    return count
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export stored jobs to Excel")
+    parser.add_argument("--since", help="first day, YYYY-MM-DD (default: today)")
+    parser.add_argument("--until", help="last day, YYYY-MM-DD (inclusive)")
+    parser.add_argument("--out", default="jobs_export.xlsx")
+    args = parser.parse_args()
+    export_jobs_to_excel(args.out, args.since, args.until)
@@ -7,8 +7,8 @@ Caches results in SQLite to avoid re-validation.
 
 import json
 import hashlib
-import sqlite3
 import re
+import time
 import logging
 import requests
 from bs4 import BeautifulSoup
@@ -16,7 +16,7 @@ from bs4 import BeautifulSoup
 import sys, os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
-from config import DB_PATH
+from modules.storage import get_storage
 
 log = logging.getLogger(__name__)
 
@@ -62,33 +62,9 @@ Job Description (first 2000 chars):
 
 # ── SQLite Cache ──────────────────────────────────────────────────────────────
 
-def init_ai_cache():
-    """Create the AI validation cache table if it doesn't exist."""
-    conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
-    c.execute("""
-        CREATE TABLE IF NOT EXISTS ai_validation_cache (
-            job_hash TEXT PRIMARY KEY,
-            decision TEXT NOT NULL,
-            confidence INTEGER DEFAULT 0,
-            reason TEXT DEFAULT '',
-            validated_at TEXT DEFAULT CURRENT_TIMESTAMP
-        )
-    """)
-    conn.commit()
-    conn.close()
-
-
 def get_cached_result(job_hash: str) -> dict | None:
     """Check cache for a previous validation result."""
-    conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
-    c.execute(
-        "SELECT decision, confidence, reason FROM ai_validation_cache WHERE job_hash = ?",
-        (job_hash,)
-    )
-    row = c.fetchone()
-    conn.close()
+    row = get_storage().fetchone("ai_cache_get", (job_hash,))
     if row:
         return {"decision": row[0], "confidence": row[1], "reason": row[2]}
     return None
@@ -96,19 +72,13 @@ def get_cached_result(job_hash: str) -> dict | None:
 
 def cache_result(job_hash: str, result: dict):
     """Save validation result to cache."""
-    conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
     try:
-        c.execute(
-            "INSERT OR REPLACE INTO ai_validation_cache (job_hash, decision, confidence, reason) VALUES (?, ?, ?, ?)",
-            (job_hash, result.get("decision", "REJECT"),
-             result.get("confidence", 0), result.get("reason", ""))
-        )
-        conn.commit()
+        get_storage().execute("ai_cache_put", (
+            job_hash, result.get("decision", "REJECT"),
+            result.get("confidence", 0), result.get("reason", ""), int(time.time()),
+        ))
     except Exception as e:
         log.warning(f"Cache write failed: {e}")
-    finally:
-        conn.close()
 
 
 # ── Helpers ───────────────────────────────────────────────────────────────────
@@ -251,7 +221,3 @@ def validate_with_ollama(title: str, description: str, job_hash: str = None) ->
     }
     return fallback
 
-
-# ── Initialize on import ─────────────────────────────────────────────────────
-
-init_ai_cache()
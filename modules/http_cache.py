@@ -0,0 +1,79 @@
+# modules/http_cache.py
+"""
+HTTP response cache for crawled pages (career listings and job pages).
+For each URL it keeps the validators of the last 200 response (ETag,
+Last-Modified) and a SHA-1 of the body. It also keeps what was extracted
+from the page: the job-link list of a career page, or the parsed job of a
+job page.
+
+A re-crawl revalidates with If-None-Match / If-Modified-Since. The page is
+unchanged if the server answers 304, or answers 200 with a body whose hash
+matches (for servers that send no validators). In that case extraction is
+skipped and the stored result is reused. Entries not revalidated for
+HTTP_CACHE_RETENTION_DAYS are expired by modules/retention.py.
+"""
+
+import json
+import time
+import hashlib
+import logging
+from collections import namedtuple
+
+import sys, os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.storage import get_storage
+
+log = logging.getLogger(__name__)
+
+CacheEntry = namedtuple("CacheEntry", "etag last_modified body_hash payload")
+
+
+def body_hash(body: bytes | str) -> str:
+    if isinstance(body, str):
+        body = body.encode("utf-8", errors="replace")
+    return hashlib.sha1(body).hexdigest()
+
+
+def lookup(url: str) -> CacheEntry | None:
+    """The cached entry for a URL, if any."""
+    try:
+        row = get_storage().fetchone("http_cache_get", (url,))
+    except Exception as e:
+        log.debug(f"HTTP cache read failed: {e}")
+        return None
+    return CacheEntry(*row) if row else None
+
+
+def conditional_headers(entry: CacheEntry | None) -> dict:
+    """If-None-Match / If-Modified-Since for revalidating a cached entry."""
+    headers = {}
+    if entry and entry.etag:
+        headers["If-None-Match"] = entry.etag
+    if entry and entry.last_modified:
+        headers["If-Modified-Since"] = entry.last_modified
+    return headers
+
+
+def cached_result(entry: CacheEntry):
+    """What was extracted from the page last time (links, a job dict, or None)."""
+    return json.loads(entry.payload) if entry and entry.payload else None
+
+
+def store(url: str, etag: str | None, last_modified: str | None, digest: str, result):
+    """Record a freshly fetched page and what was extracted from it."""
+    now = int(time.time())
+    try:
+        get_storage().execute("http_cache_put", (
+            url, etag, last_modified, digest, json.dumps(result), now, now,
+        ))
+    except Exception as e:
+        log.warning(f"HTTP cache write failed: {e}")
+
+
+def touch(url: str):
+    """The cached entry was revalidated as unchanged."""
+    try:
+        get_storage().execute("http_cache_touch", (int(time.time()), url))
+    except Exception as e:
+        log.debug(f"HTTP cache touch failed: {e}")
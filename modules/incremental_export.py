@@ -0,0 +1,204 @@
+# modules/incremental_export.py
+"""
+Incremental CSV / JSONL / Parquet exports of the jobs table.
+Each export target keeps a watermark (the last exported jobs.id) in the
+export_watermarks table. A run reads only rows past it, in id order,
+and writes them as fixed-size chunk files:
+
+    exports/<target>/jobs-<first_id>.csv.gz
+    exports/<target>/jobs-<first_id>.jsonl.gz
+    exports/<target>/jobs-<first_id>.parquet
+
+A chunk is written to a temp file and renamed into place, and the watermark
+is advanced after each chunk, so an interrupted run at most rewrites its
+last chunk under the same name. Consumers just pick up new files.
+
+Only new jobs are exported; later status changes to already-exported rows
+are not re-emitted.
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import csv
+import gzip
+import json
+import time
+import logging
+import argparse
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from config import DB_PATH, EXPORT_DIR, EXPORT_CHUNK_ROWS, EXPORT_COMPRESS
+from modules.storage import init_storage, EXPORT_CHUNK_COLUMNS
+
+log = logging.getLogger(__name__)
+
+# Parquet types of the exported columns (storage EXPORT_CHUNK_COLUMNS + jd_content),
+# fixed so every chunk shares one schema
+EXPORT_SCHEMA = pa.schema([
+    ("id", pa.int64()),
+    ("job_title", pa.string()),
+    ("company", pa.string()),
+    ("country", pa.string()),
+    ("job_url", pa.string()),
+    ("visa_sponsorship", pa.string()),
+    ("hr_score", pa.float64()),
+    ("status", pa.string()),
+    ("date_found", pa.string()),
+    ("found_ts", pa.int64()),
+    ("date_applied", pa.string()),
+    ("notes", pa.string()),
+    ("jd_content", pa.string()),
+])
+
+FORMATS = ("csv", "jsonl", "parquet")
+
+
+# ── Writers ───────────────────────────────────────────────────────────────────
+# Each writer takes (path, columns, rows) and writes one complete file.
+
+def _open_text(path: Path, compress: bool):
+    if compress:
+        return gzip.open(path, "wt", encoding="utf-8", newline="")
+    return open(path, "w", encoding="utf-8", newline="")
+
+
+def _write_csv(path: Path, columns: list[str], rows: list[tuple], compress: bool):
+    with _open_text(path, compress) as f:
+        writer = csv.writer(f)
+        writer.writerow(columns)
+        writer.writerows(rows)
+
+
+def _write_jsonl(path: Path, columns: list[str], rows: list[tuple], compress: bool):
+    with _open_text(path, compress) as f:
+        for row in rows:
+            f.write(json.dumps(dict(zip(columns, row)), ensure_ascii=False))
+            f.write("\n")
+
+
+def _write_parquet(path: Path, columns: list[str], rows: list[tuple], compress: bool):
+    schema = pa.schema([EXPORT_SCHEMA.field(c) for c in columns])
+    table = pa.table(
+        {c: pa.array([row[i] for row in rows], type=schema.field(c).type)
+         for i, c in enumerate(columns)},
+        schema=schema,
+    )
+    pq.write_table(table, path, compression="zstd" if compress else "none")
+
+
+WRITERS = {"csv": _write_csv, "jsonl": _write_jsonl, "parquet": _write_parquet}
+
+
+def _suffix(fmt: str, compress: bool) -> str:
+    if fmt == "parquet":
+        return ".parquet"
+    return f".{fmt}.gz" if compress else f".{fmt}"
+
+
+# ── Watermarks ────────────────────────────────────────────────────────────────
+
+def get_watermark(target: str, db_path: str = DB_PATH) -> dict | None:
+    """Export progress for a target, or None if it has never run."""
+    cur = init_storage(db_path).execute("watermark_get", (target,))
+    row = cur.fetchone()
+    return dict(zip([col[0] for col in cur.description], row)) if row else None
+
+
+def reset_watermark(target: str, db_path: str = DB_PATH):
+    """Forget a target's progress; its next run re-exports everything."""
+    init_storage(db_path).execute("watermark_reset", (target,))
+
+
+# ── Export ────────────────────────────────────────────────────────────────────
+
+def export_incremental(target: str, fmt: str = "csv",
+                       out_dir: str = EXPORT_DIR,
+                       chunk_rows: int = EXPORT_CHUNK_ROWS,
+                       compress: bool = EXPORT_COMPRESS,
+                       include_jd: bool = False,
+                       db_path: str = DB_PATH) -> dict:
+    """
+    Append jobs added since the target's last run to out_dir/<target>/.
+    Returns {"rows", "files", "last_id"} for this run.
+    """
+    if fmt not in WRITERS:
+        raise ValueError(f"Unknown export format {fmt!r} (expected one of {FORMATS})")
+
+    storage = init_storage(db_path)
+    columns = list(EXPORT_CHUNK_COLUMNS) + (["jd_content"] if include_jd else [])
+    select = "export_chunk_jd" if include_jd else "export_chunk"
+    write = WRITERS[fmt]
+    folder = Path(out_dir) / target
+    folder.mkdir(parents=True, exist_ok=True)
+
+    mark = storage.fetchone("watermark_get", (target,))
+    if mark and mark[1] != fmt:
+        raise ValueError(f"Target {target!r} exports {mark[1]}, not {fmt} "
+                         f"— use another target name or reset it")
+    last_id = mark[2] if mark else 0
+
+    id_idx = columns.index("id")
+    ts_idx = columns.index("found_ts")
+    stats = {"rows": 0, "files": 0, "last_id": last_id}
+
+    while True:
+        rows = storage.fetchall(select, (last_id, chunk_rows))
+        if not rows:
+            break
+
+        first_id = rows[0][id_idx]
+        path = folder / f"jobs-{first_id:012d}{_suffix(fmt, compress)}"
+        tmp = path.with_name(path.name + ".tmp")
+        write(tmp, columns, rows, compress)
+        os.replace(tmp, path)
+
+        last_id = rows[-1][id_idx]
+        storage.execute("watermark_advance", (
+            target, fmt, last_id, rows[-1][ts_idx], len(rows), int(time.time()),
+        ))
+
+        stats["rows"] += len(rows)
+        stats["files"] += 1
+        stats["last_id"] = last_id
+        if len(rows) < chunk_rows:
+            break
+
+    if stats["rows"]:
+        log.info(f"📤 Export {target}: {stats['rows']} rows in {stats['files']} "
+                 f"{fmt} file(s), watermark id {stats['last_id']}")
+    return stats
+
+
+def export_all(targets: dict, db_path: str = DB_PATH) -> dict:
+    """Run every {target: format} export; one failing target doesn't stop the rest."""
+    results = {}
+    for target, fmt in targets.items():
+        try:
+            results[target] = export_incremental(target, fmt, db_path=db_path)
+        except Exception as e:
+            log.warning(f"Export {target} failed: {e}")
+            results[target] = {"error": str(e)}
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Incremental job exports")
+    parser.add_argument("target", help="export name, e.g. 'dashboard'")
+    parser.add_argument("--format", choices=FORMATS, default="csv")
+    parser.add_argument("--out-dir", default=EXPORT_DIR)
+    parser.add_argument("--chunk-rows", type=int, default=EXPORT_CHUNK_ROWS)
+    parser.add_argument("--no-compress", action="store_true")
+    parser.add_argument("--include-jd", action="store_true", help="add jd_content")
+    parser.add_argument("--reset", action="store_true", help="re-export from the start")
+    args = parser.parse_args()
+
+    if args.reset:
+        reset_watermark(args.target)
+    result = export_incremental(args.target, args.format, args.out_dir,
+                                args.chunk_rows, not args.no_compress, args.include_jd)
+    print(f"📤 {args.target}: {result['rows']} new rows in {result['files']} file(s) "
+          f"(watermark id {result['last_id']})")
@@ -0,0 +1,413 @@
+# modules/migrations.py
+"""
+Versioned SQLite schema migrations.
+Every table in jobs.db (jobs, discovered_domains, ai_validation_cache,
+notification_outbox, export_watermarks, scan_leases, scan_checkpoints,
+crawl_frontier, http_cache, board_polls, ...) is created and evolved here. The applied version is
+kept in PRAGMA user_version, so each migration runs exactly once per
+database.
+"""
+
+import sqlite3
+import logging
+
+import sys, os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import DB_PATH
+
+log = logging.getLogger(__name__)
+
+# ── Migrations ────────────────────────────────────────────────────────────────
+# (version, description, sql). Append only — never edit a released migration.
+
+MIGRATIONS = [
+    (1, "base tables", """
+        CREATE TABLE IF NOT EXISTS jobs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            job_title TEXT,
+            company TEXT,
+            country TEXT,
+            job_url TEXT UNIQUE,
+            visa_sponsorship TEXT,
+            hr_score REAL,
+            status TEXT DEFAULT 'discovered',
+            resume_version TEXT,
+            skills_emphasized TEXT,
+            date_found TEXT,
+            date_applied TEXT,
+            jd_content TEXT,
+            notes TEXT
+        );
+
+        CREATE TABLE IF NOT EXISTS discovered_domains (
+            domain TEXT PRIMARY KEY,
+            company_name TEXT DEFAULT '',
+            career_url TEXT DEFAULT '',
+            source_query TEXT DEFAULT '',
+            is_ats INTEGER DEFAULT 0,
+            last_crawled TEXT,
+            job_count INTEGER DEFAULT 0,
+            discovered_at TEXT DEFAULT CURRENT_TIMESTAMP
+        );
+
+        CREATE TABLE IF NOT EXISTS ai_validation_cache (
+            job_hash TEXT PRIMARY KEY,
+            decision TEXT NOT NULL,
+            confidence INTEGER DEFAULT 0,
+            reason TEXT DEFAULT '',
+            validated_at TEXT DEFAULT CURRENT_TIMESTAMP
+        );
+    """),
+
+    # Epoch-second columns so time-range filters hit an index instead of
+    # wrapping the TEXT column in DATE(). date_found / last_crawled are local
+    # time; discovered_at / validated_at come from CURRENT_TIMESTAMP (UTC).
+    (2, "indexed timestamps + lookup indexes", """
+        ALTER TABLE jobs ADD COLUMN found_ts INTEGER;
+        UPDATE jobs
+           SET found_ts = CAST(strftime('%s', date_found, 'utc') AS INTEGER)
+         WHERE date_found IS NOT NULL AND date_found != '';
+        CREATE INDEX IF NOT EXISTS idx_jobs_found_ts ON jobs(found_ts);
+        CREATE INDEX IF NOT EXISTS idx_jobs_status_found_ts ON jobs(status, found_ts);
+        CREATE INDEX IF NOT EXISTS idx_jobs_company ON jobs(company);
+        CREATE INDEX IF NOT EXISTS idx_jobs_country ON jobs(country);
+
+        ALTER TABLE discovered_domains ADD COLUMN discovered_ts INTEGER;
+        ALTER TABLE discovered_domains ADD COLUMN crawled_ts INTEGER;
+        UPDATE discovered_domains
+           SET discovered_ts = CAST(strftime('%s', discovered_at) AS INTEGER),
+               crawled_ts = CAST(strftime('%s', last_crawled, 'utc') AS INTEGER);
+        CREATE INDEX IF NOT EXISTS idx_domains_discovered_ts ON discovered_domains(discovered_ts);
+        CREATE INDEX IF NOT EXISTS idx_domains_crawled_ts ON discovered_domains(crawled_ts);
+
+        ALTER TABLE ai_validation_cache ADD COLUMN validated_ts INTEGER;
+        UPDATE ai_validation_cache
+           SET validated_ts = CAST(strftime('%s', validated_at) AS INTEGER);
+        CREATE INDEX IF NOT EXISTS idx_ai_cache_validated_ts ON ai_validation_cache(validated_ts);
+    """),
+
+    # External-content FTS5 index over jobs. Triggers keep it in sync with
+    # every insert/update/delete; 'rebuild' indexes the rows already stored.
+    (3, "jobs full-text index", """
+        CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5(
+            job_title, company, country, jd_content,
+            content='jobs', content_rowid='id',
+            tokenize='porter unicode61'
+        );
+
+        CREATE TRIGGER IF NOT EXISTS jobs_fts_ai AFTER INSERT ON jobs BEGIN
+            INSERT INTO jobs_fts(rowid, job_title, company, country, jd_content)
+            VALUES (new.id, new.job_title, new.company, new.country, new.jd_content);
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS jobs_fts_ad AFTER DELETE ON jobs BEGIN
+            INSERT INTO jobs_fts(jobs_fts, rowid, job_title, company, country, jd_content)
+            VALUES ('delete', old.id, old.job_title, old.company, old.country, old.jd_content);
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS jobs_fts_au
+        AFTER UPDATE OF job_title, company, country, jd_content ON jobs BEGIN
+            INSERT INTO jobs_fts(jobs_fts, rowid, job_title, company, country, jd_content)
+            VALUES ('delete', old.id, old.job_title, old.company, old.country, old.jd_content);
+            INSERT INTO jobs_fts(rowid, job_title, company, country, jd_content)
+            VALUES (new.id, new.job_title, new.company, new.country, new.jd_content);
+        END;
+
+        INSERT INTO jobs_fts(jobs_fts) VALUES ('rebuild');
+    """),
+
+    # Durable Telegram alerts. Rows are written in the same transaction as
+    # the job and drained by modules/outbox.py.
+    (4, "notification outbox", """
+        CREATE TABLE IF NOT EXISTS notification_outbox (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            job_id INTEGER,
+            job_url TEXT UNIQUE,
+            payload TEXT NOT NULL,
+            score INTEGER DEFAULT 0,
+            status TEXT NOT NULL DEFAULT 'pending',
+            attempts INTEGER DEFAULT 0,
+            next_attempt_ts INTEGER NOT NULL,
+            created_ts INTEGER NOT NULL,
+            delivered_ts INTEGER,
+            message_id INTEGER,
+            last_error TEXT
+        );
+        CREATE INDEX IF NOT EXISTS idx_outbox_status_due
+            ON notification_outbox(status, next_attempt_ts);
+        CREATE INDEX IF NOT EXISTS idx_outbox_status_created
+            ON notification_outbox(status, created_ts);
+    """),
+
+    # Per-target progress of incremental exports (modules/incremental_export.py)
+    (5, "export watermarks", """
+        CREATE TABLE IF NOT EXISTS export_watermarks (
+            target TEXT PRIMARY KEY,
+            format TEXT NOT NULL,
+            last_id INTEGER NOT NULL DEFAULT 0,
+            last_found_ts INTEGER,
+            rows_exported INTEGER NOT NULL DEFAULT 0,
+            files INTEGER NOT NULL DEFAULT 0,
+            updated_ts INTEGER
+        );
+    """),
+
+    # Which scraper found each job, as its own column (it used to live only
+    # in notes as 'Source: x'). Drives per-board posting-rate estimates.
+    (6, "jobs source column", """
+        ALTER TABLE jobs ADD COLUMN source TEXT;
+        UPDATE jobs
+           SET source = lower(trim(substr(notes, 9)))
+         WHERE notes LIKE 'Source: %';
+        CREATE INDEX IF NOT EXISTS idx_jobs_source_found_ts
+            ON jobs(source, found_ts, company);
+    """),
+
+    # Leases for sharded scanning (modules/shards.py): one row per shard of
+    # a source, plus singleton roles (source = '') such as the dispatcher.
+    (7, "scan leases", """
+        CREATE TABLE IF NOT EXISTS scan_leases (
+            name TEXT PRIMARY KEY,
+            source TEXT NOT NULL DEFAULT '',
+            shard_index INTEGER NOT NULL DEFAULT 0,
+            shard_count INTEGER NOT NULL DEFAULT 1,
+            interval_s INTEGER NOT NULL DEFAULT 0,
+            owner TEXT,
+            expires_ts INTEGER,
+            heartbeat_ts INTEGER,
+            claimed_ts INTEGER,
+            completed_ts INTEGER NOT NULL DEFAULT 0,
+            runs INTEGER NOT NULL DEFAULT 0,
+            reclaims INTEGER NOT NULL DEFAULT 0
+        );
+        CREATE INDEX IF NOT EXISTS idx_leases_source_due
+            ON scan_leases(source, completed_ts);
+    """),
+
+    # Work units (a board, a JobSpy query, a crawled domain) finished by a
+    # scan that is still running — modules/checkpoints.py
+    (8, "scan checkpoints", """
+        CREATE TABLE IF NOT EXISTS scan_checkpoints (
+            scan TEXT NOT NULL,
+            stage TEXT NOT NULL,
+            source TEXT NOT NULL,
+            item TEXT NOT NULL,
+            jobs INTEGER NOT NULL DEFAULT 0,
+            done_ts INTEGER NOT NULL,
+            PRIMARY KEY (scan, stage, source, item)
+        );
+        CREATE INDEX IF NOT EXISTS idx_checkpoints_done_ts
+            ON scan_checkpoints(done_ts);
+    """),
+
+    # Domains queued for the career crawler, best first
+    # (modules/crawling/frontier.py)
+    (9, "crawl frontier", """
+        CREATE TABLE IF NOT EXISTS crawl_frontier (
+            domain TEXT PRIMARY KEY,
+            priority REAL NOT NULL DEFAULT 0,
+            state TEXT NOT NULL DEFAULT 'queued',
+            due_ts INTEGER NOT NULL DEFAULT 0,
+            added_ts INTEGER NOT NULL,
+            owner TEXT,
+            leased_ts INTEGER,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            last_error TEXT
+        );
+        CREATE INDEX IF NOT EXISTS idx_frontier_next
+            ON crawl_frontier(state, priority DESC);
+        CREATE INDEX IF NOT EXISTS idx_frontier_leased
+            ON crawl_frontier(state, leased_ts);
+    """),
+
+    # Validators, body hash and extracted result of crawled pages
+    # (modules/http_cache.py)
+    (10, "http cache", """
+        CREATE TABLE IF NOT EXISTS http_cache (
+            url TEXT PRIMARY KEY,
+            etag TEXT,
+            last_modified TEXT,
+            body_hash TEXT NOT NULL,
+            payload TEXT,
+            fetched_ts INTEGER NOT NULL,
+            validated_ts INTEGER NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_http_cache_validated_ts
+            ON http_cache(validated_ts);
+    """),
+
+    # Last poll of each ATS board, so adaptive cadence survives restarts
+    # (modules/cadence.py)
+    (11, "board polls", """
+        CREATE TABLE IF NOT EXISTS board_polls (
+            source TEXT NOT NULL,
+            board TEXT NOT NULL,
+            polled_ts INTEGER NOT NULL,
+            PRIMARY KEY (source, board)
+        );
+    """),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+# ── Runner ────────────────────────────────────────────────────────────────────
+
+def get_version(conn: sqlite3.Connection) -> int:
+    """Return the schema version recorded in the database."""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def apply_migrations(conn: sqlite3.Connection) -> int:
+    """
+    Apply every pending migration on an open connection.
+    Each migration runs in its own transaction together with the
+    user_version bump, so a failure leaves the previous version intact.
+    Returns the resulting schema version.
+    """
+    current = get_version(conn)
+
+    if current == 0:
+        # Only takes effect before the first table exists; lets retention
+        # reclaim space with incremental_vacuum instead of a full VACUUM.
+        conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+
+    for version, description, sql in MIGRATIONS:
+        if version <= current:
+            continue
+        log.info(f"🗄️  Migrating schema v{current} → v{version}: {description}")
+        try:
+            conn.executescript(
+                f"BEGIN;\n{sql}\nPRAGMA user_version = {int(version)};\nCOMMIT;"
+            )
+        except Exception:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        current = version
+
+    return current
+
+
+def migrate(db_path: str = DB_PATH) -> int:
+    """Open the database, bring it to the latest schema, and close it."""
+    conn = sqlite3.connect(db_path)
+    try:
+        return apply_migrations(conn)
+    finally:
+        conn.close()
+
+
+# ── Query Plan Checks ─────────────────────────────────────────────────────────
+# The hot read paths. Each must be answered from an index, never a bare
+# table scan — check_query_plans() verifies that against a migrated database.
+
+COMMON_QUERIES = {
+    "export_date_range": (
+        "SELECT job_title, company, date_found FROM jobs "
+        "WHERE found_ts >= ? AND found_ts < ? ORDER BY found_ts DESC",
+        (0, 1),
+    ),
+    "export_since_id": (
+        "SELECT id, job_title FROM jobs WHERE id > ? ORDER BY id LIMIT ?",
+        (0, 50000),
+    ),
+    "job_exists": (
+        "SELECT id FROM jobs WHERE job_url = ?",
+        ("",),
+    ),
+    "jobs_by_status": (
+        "SELECT id FROM jobs WHERE status = ? AND found_ts >= ?",
+        ("discovered", 0),
+    ),
+    "board_arrivals": (
+        "SELECT company, COUNT(*) FROM jobs "
+        "WHERE source = ? AND found_ts >= ? GROUP BY company",
+        ("greenhouse", 0),
+    ),
+    "jobs_by_company": (
+        "SELECT id FROM jobs WHERE company = ?",
+        ("",),
+    ),
+    "jobs_by_country": (
+        "SELECT id FROM jobs WHERE country = ?",
+        ("",),
+    ),
+    "ai_cache_lookup": (
+        "SELECT decision FROM ai_validation_cache WHERE job_hash = ?",
+        ("",),
+    ),
+    "outbox_due": (
+        "SELECT id FROM notification_outbox "
+        "WHERE status = 'pending' AND next_attempt_ts <= ? ORDER BY id LIMIT ?",
+        (0, 50),
+    ),
+    "outbox_expiry": (
+        "SELECT id FROM notification_outbox "
+        "WHERE status IN ('delivered', 'failed') AND created_ts < ?",
+        (0,),
+    ),
+    "lease_due": (
+        "SELECT name FROM scan_leases WHERE source = ? "
+        "AND completed_ts + interval_s <= ? AND (owner IS NULL OR expires_ts < ?)",
+        ("greenhouse", 0, 0),
+    ),
+    "frontier_next": (
+        "SELECT domain FROM crawl_frontier WHERE state = 'queued' AND due_ts <= ? "
+        "ORDER BY priority DESC LIMIT ?",
+        (0, 100),
+    ),
+    "frontier_recover": (
+        "SELECT domain FROM crawl_frontier WHERE state = 'active' AND leased_ts < ?",
+        (0,),
+    ),
+    "board_polls": (
+        "SELECT board, polled_ts FROM board_polls WHERE source = ?",
+        ("greenhouse",),
+    ),
+    "checkpoint_expiry": (
+        "SELECT scan FROM scan_checkpoints WHERE done_ts < ?",
+        (0,),
+    ),
+    "http_cache_expiry": (
+        "SELECT url FROM http_cache WHERE validated_ts < ?",
+        (0,),
+    ),
+    "ai_cache_expiry": (
+        "SELECT job_hash FROM ai_validation_cache WHERE validated_ts < ?",
+        (0,),
+    ),
+}
+
+
+def explain(conn: sqlite3.Connection, sql: str, params: tuple = ()) -> list[str]:
+    """Return the EXPLAIN QUERY PLAN detail lines for a statement."""
+    return [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params)]
+
+
+def check_query_plans(conn: sqlite3.Connection) -> dict[str, list[str]]:
+    """
+    Explain every COMMON_QUERIES entry.
+    Returns {name: plan_lines} for the queries that fall back to a full
+    table scan — an empty dict means every hot query is indexed.
+    """
+    bad = {}
+    for name, (sql, params) in COMMON_QUERIES.items():
+        plan = explain(conn, sql, params)
+        if any(line.startswith("SCAN ") and " USING " not in line for line in plan):
+            bad[name] = plan
+    return bad
+
+
+if __name__ == "__main__":
+    conn = sqlite3.connect(":memory:")
+    print(f"✅ Schema at v{apply_migrations(conn)}")
+    for name, (sql, params) in COMMON_QUERIES.items():
+        print(f"  {name}: {' | '.join(explain(conn, sql, params))}")
+    problems = check_query_plans(conn)
+    conn.close()
+    if problems:
+        print(f"❌ Full table scans: {', '.join(problems)}")
+        sys.exit(1)
+    print("✅ All common queries use an index")
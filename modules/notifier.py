@@ -1,26 +1,263 @@
 # modules/notifier.py
+"""
+Telegram notifier.
+A long-lived NotifierService runs one event loop on a background thread with
+one Bot (one HTTP connection pool). Messages go onto its queue and are sent
+through token buckets that match Telegram's global and per-chat limits, so
+callers never wait on Telegram.
+"""
 import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+import time
+import atexit
 import asyncio
+import logging
+import threading
+from concurrent.futures import Future
+
 from telegram import Bot
-from config import TELEGRAM_TOKEN, TELEGRAM_CHAT_ID
+from telegram.error import RetryAfter, BadRequest, Forbidden, InvalidToken, NetworkError
+from config import (
+    TELEGRAM_TOKEN,
+    TELEGRAM_CHAT_ID,
+    TELEGRAM_API_BASE,
+    TELEGRAM_GLOBAL_RATE,
+    TELEGRAM_CHAT_RATE,
+    TELEGRAM_GROUP_RATE,
+    NOTIFY_MAX_RETRIES,
+)
+
+log = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+# ── Rate Limiting ─────────────────────────────────────────────────────────────
+
+class TokenBucket:
+    """Classic token bucket: `rate` tokens/sec, bursts up to `capacity`."""
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def delay(self) -> float:
+        """Seconds until a token is available (0 if one is ready)."""
+        self._refill()
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    def take(self):
+        self._refill()
+        self.tokens -= 1
+
+    def pause(self, seconds: float):
+        """Drain the bucket so nothing is sent for `seconds` (429 retry_after)."""
+        self._refill()
+        self.tokens = min(self.tokens, 0) - seconds * self.rate
+
+
+def _chat_rate(chat_id) -> float:
+    # Group / channel ids are negative and have a much lower per-chat limit
+    return TELEGRAM_GROUP_RATE if str(chat_id).startswith("-") else TELEGRAM_CHAT_RATE
+
+
+def _retry_seconds(err: RetryAfter) -> float:
+    value = err.retry_after
+    return value.total_seconds() if hasattr(value, "total_seconds") else float(value)
+
+
+# ── Service ───────────────────────────────────────────────────────────────────
+
+class NotifierService:
+    """One event loop, one Bot, one queue — shared by the whole process."""
+
+    def __init__(self, token: str = TELEGRAM_TOKEN, chat_id=TELEGRAM_CHAT_ID,
+                 base_url: str = TELEGRAM_API_BASE,
+                 global_rate: float = TELEGRAM_GLOBAL_RATE,
+                 chat_rate: float = None):
+        self.token = token
+        self.chat_id = chat_id
+        self.base_url = base_url
+        self.chat_rate = chat_rate      # None → Telegram's per-chat/per-group limits
+        self.stats = {"queued": 0, "sent": 0, "failed": 0, "retried": 0, "throttled": 0}
+        self._bot = None
+        self._loop = None
+        self._queue = None
+        self._thread = None
+        self._ready = threading.Event()
+        self._global_bucket = TokenBucket(global_rate, global_rate)
+        self._chat_buckets = {}
+
+    # ── Lifecycle ─────────────────────────────────────────────────────────────
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return self
+        self._ready.clear()
+        self._thread = threading.Thread(target=self._run_loop, name="notifier", daemon=True)
+        self._thread.start()
+        self._ready.wait()
+        atexit.register(self.close)
+        return self
+
+    def _run_loop(self):
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        self._queue = asyncio.Queue()
+        self._ready.set()
+        try:
+            self._loop.run_until_complete(self._consume())
+        finally:
+            self._loop.close()
+
+    def flush(self, timeout: float = None) -> bool:
+        """Block until every queued message has been sent (or given up on)."""
+        if not self._thread or not self._thread.is_alive():
+            return True
+        done = asyncio.run_coroutine_threadsafe(self._queue.join(), self._loop)
+        try:
+            done.result(timeout)
+            return True
+        except Exception:
+            return False
+
+    def close(self, timeout: float = 60):
+        """Send what is queued, then shut the Bot and the loop down."""
+        if not self._thread or not self._thread.is_alive():
+            return
+        self._loop.call_soon_threadsafe(self._queue.put_nowait, (_STOP, None, None))
+        self._thread.join(timeout)
+
+    # ── Producer side ─────────────────────────────────────────────────────────
+
+    def submit(self, text: str, chat_id=None) -> Future:
+        """
+        Queue a message and return immediately.
+        The returned Future resolves to the Telegram message_id, or None
+        if the message could not be delivered.
+        """
+        if not self._thread or not self._thread.is_alive():
+            self.start()
+        future = Future()
+        item = (text, chat_id or self.chat_id, future)
+        self._loop.call_soon_threadsafe(self._queue.put_nowait, item)
+        self.stats["queued"] += 1
+        return future
+
+    def backlog(self) -> int:
+        return self._queue.qsize() if self._queue else 0
+
+    # ── Event loop side ───────────────────────────────────────────────────────
+
+    async def _consume(self):
+        try:
+            while True:
+                text, chat_id, future = await self._queue.get()
+                try:
+                    if text is _STOP:
+                        return
+                    message_id = await self._deliver(text, chat_id)
+                    if not future.done():
+                        future.set_result(message_id)
+                except Exception as e:
+                    if not future.done():
+                        future.set_exception(e)
+                finally:
+                    self._queue.task_done()
+        finally:
+            if self._bot is not None:
+                try:
+                    await self._bot.shutdown()
+                except Exception:
+                    pass
+
+    async def _wait_for_slot(self, chat_id):
+        bucket = self._chat_buckets.get(chat_id)
+        if bucket is None:
+            rate = self.chat_rate or _chat_rate(chat_id)
+            bucket = self._chat_buckets[chat_id] = TokenBucket(rate)
+        while True:
+            wait = max(self._global_bucket.delay(), bucket.delay())
+            if wait <= 0:
+                self._global_bucket.take()
+                bucket.take()
+                return bucket
+            self.stats["throttled"] += 1
+            await asyncio.sleep(wait)
+
+    async def _get_bot(self) -> Bot:
+        if self._bot is None:
+            bot = Bot(token=self.token, base_url=self.base_url)
+            await bot.initialize()
+            self._bot = bot
+        return self._bot
+
+    async def _deliver(self, text: str, chat_id):
+        """Send one message, honouring rate limits and 429s. Returns message_id."""
+        for attempt in range(NOTIFY_MAX_RETRIES + 1):
+            bucket = await self._wait_for_slot(chat_id)
+            try:
+                bot = await self._get_bot()
+                message = await bot.send_message(chat_id=chat_id, text=text,
+                                                 parse_mode="Markdown")
+                self.stats["sent"] += 1
+                return message.message_id
+            except RetryAfter as e:
+                # Telegram told us exactly how long to back off for this chat
+                bucket.pause(_retry_seconds(e))
+                self.stats["retried"] += 1
+            except (BadRequest, Forbidden, InvalidToken) as e:
+                print(f"❌ Telegram error: {e}")
+                break
+            except NetworkError as e:
+                self.stats["retried"] += 1
+                log.debug(f"Telegram network error (attempt {attempt + 1}): {e}")
+                await asyncio.sleep(2 ** attempt)
+            except Exception as e:
+                print(f"❌ Telegram error: {e}")
+                break
+
+        self.stats["failed"] += 1
+        return None
+
+
+# ── Module-level API ──────────────────────────────────────────────────────────
+
+_service = None
+_service_lock = threading.Lock()
+
+
+def get_notifier() -> NotifierService:
+    """The process-wide notifier, started on first use."""
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = NotifierService().start()
+        return _service
+
+
+def close_notifier():
+    """Flush and stop the process-wide notifier (no-op if never started)."""
+    if _service is not None:
+        _service.close()
 
-async def _send(text):
-    """Internal async send."""
-    try:
-        bot = Bot(token=TELEGRAM_TOKEN)
-        await bot.send_message(chat_id=TELEGRAM_CHAT_ID, text=text, parse_mode='Markdown')
-    except Exception as e:
-        print(f"❌ Telegram error: {e}")
 
 def send_message(text):
-    """Send a plain message to Telegram."""
-    asyncio.run(_send(text))
+    """Queue a plain message to Telegram. Returns a Future for the message_id."""
+    return get_notifier().submit(text)
 
-def notify_job_found(job):
-    """Send detailed job alert to Telegram."""
+
+def format_job_alert(job):
+    """Render the Telegram alert for a single job."""
     company  = job.get('company', 'Unknown')
     title    = job.get('job_title', 'Unknown')
     location = job.get('location', job.get('country', ''))
@@ -41,7 +278,7 @@ def notify_job_found(job):
     # Date display
     date_line = f"📅 *Posted:* {posted}" if posted else "📅 *Posted:* Not available"
 
-    message = f"""
+    return f"""
 🚀 *New Job Found!*
 
 🏢 *Company:* {company}
@@ -53,8 +290,13 @@ def notify_job_found(job):
 📡 *Source:* {source}
 🔗 [Apply Here]({url})
 """
-    send_message(message)
+
+
+def notify_job_found(job):
+    """Queue a detailed job alert to Telegram."""
+    return send_message(format_job_alert(job))
 
 if __name__ == "__main__":
     send_message("🧪 Notifier module working!")
-    print("✅ Notifier tested!")
\ No newline at end of file
+    close_notifier()
+    print("✅ Notifier tested!")
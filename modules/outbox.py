@@ -0,0 +1,223 @@
+# modules/outbox.py
+"""
+Durable notification outbox.
+Alerts are written to notification_outbox in the same transaction that saves
+the job (tracker.save_jobs(..., alerts=True)), so a saved job always has a
+pending alert. OutboxDispatcher drains due rows on a background thread,
+sends them through the notifier, and marks each row delivered with its
+Telegram message_id. Failures back off exponentially; rows still pending at
+shutdown are picked up again on the next start.
+
+Delivery guarantee: a row is claimed ('sending') before it is sent and marked
+'delivered' as soon as Telegram returns the message_id. Telegram has no
+idempotency key, so a crash between Telegram's ack and that UPDATE re-sends
+that one alert on restart; nothing is ever lost or sent twice otherwise.
+If formatting or submitting a message fails, its rows are retried with
+backoff like a failed send, and if dispatch itself raises, every row it
+claimed but never marked goes back to 'pending' on the next pass — a
+claim is never left 'sending' until the next process start.
+"""
+
+import json
+import time
+import logging
+import threading
+
+import sys, os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import (
+    DIGEST_MODE,
+    DIGEST_GROUP_BY,
+    DIGEST_MAX_JOBS,
+    DIGEST_MAX_SECONDS,
+    DIGEST_IMMEDIATE_SCORE,
+    OUTBOX_POLL_SECONDS,
+    OUTBOX_BATCH_SIZE,
+    OUTBOX_MAX_ATTEMPTS,
+    OUTBOX_BACKOFF_SECONDS,
+    OUTBOX_MAX_BACKOFF_SECONDS,
+)
+from modules.storage import get_storage
+from modules.notifier import get_notifier, format_job_alert
+from modules.digest import digest_chunks, job_score
+
+log = logging.getLogger(__name__)
+
+# Job fields the alert / digest formatters read
+PAYLOAD_FIELDS = (
+    "job_title", "company", "location", "country", "job_url",
+    "source", "date_posted", "visa_sponsorship",
+)
+
+
+# ── Enqueue (called inside the save transaction) ──────────────────────────────
+
+def enqueue_alert(job: dict, job_id: int, now: float = None):
+    """Add a pending alert for a just-inserted job. Caller owns the transaction."""
+    now = int(now or time.time())
+    payload = {k: job.get(k) for k in PAYLOAD_FIELDS if job.get(k) is not None}
+    get_storage().execute("outbox_enqueue", (
+        job_id, job.get("job_url"), json.dumps(payload), job_score(job), now, now,
+    ))
+
+
+def pending_count() -> int:
+    return get_storage().fetchone("outbox_pending_count")[0]
+
+
+# ── Dispatcher ────────────────────────────────────────────────────────────────
+
+class OutboxDispatcher:
+    """Background thread that delivers outbox rows through the notifier."""
+
+    def __init__(self, poll_seconds: float = OUTBOX_POLL_SECONDS,
+                 batch_size: int = OUTBOX_BATCH_SIZE,
+                 digest: bool = DIGEST_MODE):
+        self.poll_seconds = poll_seconds
+        self.batch_size = batch_size
+        self.digest = digest
+        self.stats = {"delivered": 0, "retried": 0, "failed": 0, "messages": 0}
+        self._claimed = {}          # row id → row, claimed and not yet marked
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return self
+        # Rows left 'sending' by a crash were never confirmed — send them again
+        recovered = get_storage().execute("outbox_recover").rowcount
+        if recovered:
+            log.info(f"📮 Outbox: resuming {recovered} unconfirmed alert(s)")
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="outbox", daemon=True)
+        self._thread.start()
+        return self
+
+    def nudge(self):
+        """Check for due rows now instead of at the next poll."""
+        self._wake.set()
+
+    def close(self, timeout: float = 30):
+        """Deliver what is due (digests are flushed early), then stop."""
+        if not self._thread or not self._thread.is_alive():
+            return
+        self._stop.set()
+        self._wake.set()
+        self._thread.join(timeout)
+
+    # ── Claiming ──────────────────────────────────────────────────────────────
+
+    def _claim(self, force_digest: bool = False) -> tuple[list, list]:
+        """
+        Atomically move due rows to 'sending'.
+        Returns (single_rows, digest_rows) as (id, payload, attempts) tuples.
+        """
+        storage = get_storage()
+        now = int(time.time())
+        with storage.transaction():
+            due = storage.fetchall("outbox_due", (now, self.batch_size))
+            if not due:
+                return [], []
+
+            if not self.digest:
+                single, batched = due, []
+            else:
+                cutoff = DIGEST_IMMEDIATE_SCORE
+                single = [r for r in due if cutoff is not None and r[3] >= cutoff]
+                batched = [r for r in due if r not in single]
+                oldest = min((r[4] for r in batched), default=now)
+                ready = (len(batched) >= DIGEST_MAX_JOBS
+                         or now - oldest >= DIGEST_MAX_SECONDS
+                         or force_digest)
+                if not ready:
+                    batched = []
+
+            claimed = ([], [])
+            for target, rows in zip(claimed, (single, batched)):
+                for row in rows:
+                    if storage.execute("outbox_claim", (row[0],)).rowcount:
+                        target.append((row[0], json.loads(row[1]), row[2]))
+        for row in claimed[0] + claimed[1]:
+            self._claimed[row[0]] = row
+        return claimed
+
+    # ── Delivery ──────────────────────────────────────────────────────────────
+
+    def _mark(self, rows: list, message_id, error: str = ""):
+        storage = get_storage()
+        now = int(time.time())
+        with storage.transaction():
+            for row_id, _, attempts in rows:
+                if message_id is not None:
+                    storage.execute("outbox_delivered", (message_id, now, row_id))
+                    self.stats["delivered"] += 1
+                    continue
+                tries = attempts + 1
+                if tries >= OUTBOX_MAX_ATTEMPTS:
+                    status = "failed"
+                    self.stats["failed"] += 1
+                else:
+                    status = "pending"
+                    self.stats["retried"] += 1
+                backoff = min(OUTBOX_BACKOFF_SECONDS * 2 ** attempts, OUTBOX_MAX_BACKOFF_SECONDS)
+                storage.execute("outbox_retry", (status, now + int(backoff), error[:500], row_id))
+        for row in rows:
+            self._claimed.pop(row[0], None)
+
+    def _release(self, error: str):
+        """Put rows claimed but never marked (dispatch raised) back to 'pending' with backoff."""
+        rows = list(self._claimed.values())
+        log.warning(f"📮 Outbox: returning {len(rows)} claimed alert(s) for retry: {error}")
+        self._mark(rows, None, error)
+
+    def _deliver(self, single: list, batched: list):
+        notifier = get_notifier()
+        messages = [(lambda row=row: format_job_alert(row[1]), [row]) for row in single]
+        if batched:
+            by_payload = {id(row[1]): row for row in batched}
+            try:
+                chunks = digest_chunks([row[1] for row in batched], DIGEST_GROUP_BY)
+            except Exception as e:
+                self._mark(batched, None, f"digest failed: {e}")
+                chunks = []
+            for text, jobs in chunks:
+                messages.append((lambda text=text: text, [by_payload[id(job)] for job in jobs]))
+
+        sends = []
+        for text, rows in messages:
+            try:
+                sends.append((notifier.submit(text()), rows))
+            except Exception as e:
+                self._mark(rows, None, f"submit failed: {e}")
+
+        # Mark each message as soon as Telegram answers for it
+        for future, rows in sends:
+            try:
+                message_id, error = future.result(), "send failed"
+            except Exception as e:
+                message_id, error = None, str(e)
+            try:
+                self._mark(rows, message_id, error)
+            except Exception as e:      # rows stay claimed; _run releases them
+                log.warning(f"Outbox mark failed: {e}")
+            self.stats["messages"] += 1
+
+    def _run(self):
+        while True:
+            stopping = self._stop.is_set()
+            try:
+                if self._claimed:
+                    self._release("dispatch interrupted")
+                single, batched = self._claim(force_digest=stopping)
+                if single or batched:
+                    self._deliver(single, batched)
+                    continue
+            except Exception as e:
+                log.warning(f"Outbox dispatch error: {e}")
+
+            if stopping:
+                return
+            self._wake.wait(self.poll_seconds)
+            self._wake.clear()
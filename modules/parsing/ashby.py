@@ -75,12 +75,13 @@ def make_job(title, company, country, url, description, source="ashby"):
     }
 
 
-def scrape_ashby() -> list[dict]:
-    """Scrape all Ashby companies for job postings."""
-    log.info(f"🔷 Scraping Ashby ({len(ASHBY_COMPANIES)} companies)...")
+def scrape_ashby(companies: list[str] = None) -> list[dict]:
+    """Scrape Ashby companies (all of them by default) for job postings."""
+    companies = ASHBY_COMPANIES if companies is None else companies
+    log.info(f"🔷 Scraping Ashby ({len(companies)} companies)...")
     jobs = []
 
-    for company in ASHBY_COMPANIES:
+    for company in companies:
         try:
             payload = {
                 "operationName": "ApiJobBoardWithTeams",
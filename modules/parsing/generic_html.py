@@ -6,19 +6,32 @@ Uses BeautifulSoup heuristics — no ATS-specific logic.
 """
 
 import re
+import time
+import asyncio
 import logging
+import threading
+from collections import Counter, namedtuple
+
 import requests
-from bs4 import BeautifulSoup
+import aiohttp
+from bs4 import BeautifulSoup, Tag
 from urllib.parse import urlparse
 
 log = logging.getLogger(__name__)
 
+Fetched = namedtuple("Fetched", "status headers body charset")
+
 HEADERS = {
     "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36",
     "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
     "Accept-Language": "en-US,en;q=0.5",
 }
 
+# Async batch fetching (parse_job_pages / fetch_full_jds)
+FETCH_CONCURRENCY = 20
+FETCH_PER_HOST = 4
+MAX_PAGE_BYTES = 2 * 1024 * 1024   # a job page bigger than this isn't one
+
 # CSS selectors to find JD content — ordered by specificity
 JD_SELECTORS = [
     ".job-description",
@@ -63,6 +76,9 @@ LOCATION_SELECTORS = [
     ".job-meta .location",
 ]
 
+# Selectors for the company name (after og:site_name)
+COMPANY_SELECTORS = [".company-name", ".employer", '[data-qa="company"]']
+
 # Patterns for detecting "Apply" links (job posting indicators)
 APPLY_PATTERNS = [
     re.compile(r"apply\s*(now|here|today)?", re.IGNORECASE),
@@ -70,6 +86,14 @@ APPLY_PATTERNS = [
 ]
 
 
+def make_soup(html: str) -> BeautifulSoup:
+    """Parse HTML and drop the noisy elements (scripts, navigation, footers...)."""
+    soup = BeautifulSoup(html, "html.parser")
+    for tag in soup(["script", "style", "nav", "header", "footer", "aside", "noscript"]):
+        tag.decompose()
+    return soup
+
+
 def fetch_page(url: str, timeout: int = 12) -> BeautifulSoup | None:
     """Fetch and parse a webpage."""
     if not url or url == "nan":
@@ -78,107 +102,225 @@ def fetch_page(url: str, timeout: int = 12) -> BeautifulSoup | None:
         r = requests.get(url, headers=HEADERS, timeout=timeout)
         if r.status_code != 200:
             return None
-        soup = BeautifulSoup(r.text, "html.parser")
-        # Remove noisy elements
-        for tag in soup(["script", "style", "nav", "header", "footer", "aside", "noscript"]):
-            tag.decompose()
-        return soup
+        return make_soup(r.text)
     except Exception as e:
         log.debug(f"Fetch failed {url[:60]}: {e}")
         return None
 
 
-def extract_title(soup: BeautifulSoup) -> str:
-    """Extract job title from page using heuristics."""
-    for selector in TITLE_SELECTORS:
-        el = soup.select_one(selector)
-        if el:
-            text = el.get_text(strip=True)
-            if 5 < len(text) < 200:
-                return text
+# ── Single-pass extraction ──────────────────────────────────────────────────
+# The selectors above are matched in one walk over the document, recording
+# the first element each one selects (what soup.select_one would return),
+# along with the other candidates the field heuristics fall back on.
 
-    # Fallback: look for aria-label with job-related content
-    for el in soup.find_all(attrs={"aria-label": True}):
-        label = el.get("aria-label", "")
-        if any(k in label.lower() for k in ["job", "position", "role", "title"]):
-            return label[:200]
+Selector = namedtuple("Selector", "tag cls id attr value ancestor")
 
-    # Fallback: page <title>
-    title_tag = soup.find("title")
-    if title_tag:
-        text = title_tag.get_text(strip=True)
-        # Try to extract role from "Role - Company" patterns
-        parts = re.split(r"\s*[|–—-]\s*", text)
-        if parts:
-            return parts[0].strip()[:200]
+SIMPLE_SELECTOR = re.compile(
+    r'^(?P<tag>[a-z][a-z0-9]*)?(?:\.(?P<cls>[\w-]+))?(?:#(?P<id>[\w-]+))?'
+    r'(?:\[(?P<attr>[\w-]+)="(?P<value>[^"]*)"\])?$'
+)
+LOCATION_MARK = re.compile(r"📍|location:", re.IGNORECASE)
+TITLE_LABEL_WORDS = ["job", "position", "role", "title"]
 
-    return ""
 
+def compile_selector(selector: str) -> Selector:
+    """'tag.class#id[attr="value"]', optionally after one ancestor selector."""
+    *ancestors, subject = selector.split()
+    m = SIMPLE_SELECTOR.match(subject)
+    if not m or not any(m.groups()) or len(ancestors) > 1:
+        raise ValueError(f"Unsupported selector: {selector!r}")
+    ancestor = compile_selector(ancestors[0]) if ancestors else None
+    return Selector(*m.group("tag", "cls", "id", "attr", "value"), ancestor)
 
-def extract_company(soup: BeautifulSoup, url: str) -> str:
-    """Extract company name from page or URL."""
-    # Try meta/OG tags
-    for tag in soup.find_all("meta", attrs={"property": "og:site_name"}):
-        return tag.get("content", "")[:100]
 
-    # Try common selectors
-    for selector in [".company-name", ".employer", '[data-qa="company"]']:
-        el = soup.select_one(selector)
-        if el:
-            return el.get_text(strip=True)[:100]
+def _index_key(sel: Selector) -> tuple:
+    if sel.id:
+        return ("id", sel.id)
+    if sel.cls:
+        return ("class", sel.cls)
+    if sel.attr:
+        return ("attr", sel.attr, sel.value)
+    return ("tag", sel.tag)
 
-    # Fallback: domain name
-    parsed = urlparse(url)
-    domain = parsed.netloc.replace("www.", "").split(".")[0]
-    return domain.replace("-", " ").title()
 
+def _classes(value) -> list:
+    return value.split() if isinstance(value, str) else value or []
 
-def extract_location(soup: BeautifulSoup) -> str:
-    """Extract job location from page."""
-    for selector in LOCATION_SELECTORS:
-        el = soup.select_one(selector)
-        if el:
+
+def _matches(sel: Selector, el: Tag) -> bool:
+    if sel.tag and el.name != sel.tag:
+        return False
+    if sel.cls and sel.cls not in _classes(el.get("class")):
+        return False
+    if sel.id and el.get("id") != sel.id:
+        return False
+    if sel.attr:
+        value = el.get(sel.attr)
+        if (" ".join(value) if isinstance(value, list) else value) != sel.value:
+            return False
+    if sel.ancestor:
+        return any(_matches(sel.ancestor, parent) for parent in el.parents)
+    return True
+
+
+SELECTORS = {}                          # selector text → Selector
+SELECTOR_INDEX = {}                     # cheapest distinguishing key → [(text, Selector)]
+for _text in dict.fromkeys(TITLE_SELECTORS + COMPANY_SELECTORS + LOCATION_SELECTORS + JD_SELECTORS):
+    SELECTORS[_text] = compile_selector(_text)
+    SELECTOR_INDEX.setdefault(_index_key(SELECTORS[_text]), []).append((_text, SELECTORS[_text]))
+
+
+class PageScan:
+    """
+    Everything the field extractors need, from one walk over the document:
+    the first element each selector matches, the first job-ish aria-label,
+    <title>, <body>, og:site_name, the apply-button candidates and the
+    strings carrying a location marker. The field methods then give exactly
+    what the per-field searches (select_one / find / find_all) would.
+    """
+
+    def __init__(self, soup: BeautifulSoup):
+        self.first = {}
+        self.aria = self.title_tag = self.body = self.site_name = None
+        self.buttons = []
+        self.location_marks = []
+        for node in soup.descendants:
+            if isinstance(node, Tag):
+                self._tag(node)
+            elif LOCATION_MARK.search(node):
+                self.location_marks.append(node)
+
+    def _tag(self, el: Tag):
+        name, attrs = el.name, el.attrs
+        keys = [("tag", name)]
+        for attr, value in attrs.items():
+            if attr == "class":
+                keys.extend(("class", c) for c in _classes(value))
+            elif attr == "id":
+                keys.append(("id", value))
+            elif isinstance(value, str):
+                keys.append(("attr", attr, value))
+            else:
+                keys.append(("attr", attr, " ".join(value)))
+        for key in keys:
+            for text, sel in SELECTOR_INDEX.get(key, ()):
+                if text not in self.first and _matches(sel, el):
+                    self.first[text] = el
+
+        if name in ("a", "button"):
+            self.buttons.append(el)
+        elif name == "title" and self.title_tag is None:
+            self.title_tag = el
+        elif name == "body" and self.body is None:
+            self.body = el
+        elif name == "meta" and self.site_name is None and attrs.get("property") == "og:site_name":
+            self.site_name = el
+        if self.aria is None and "aria-label" in attrs:
+            label = attrs["aria-label"]
+            if any(k in label.lower() for k in TITLE_LABEL_WORDS):
+                self.aria = el
+
+    def title(self) -> str:
+        for selector in TITLE_SELECTORS:
+            el = self.first.get(selector)
+            if el:
+                text = el.get_text(strip=True)
+                if 5 < len(text) < 200:
+                    return text
+
+        # Fallback: aria-label with job-related content
+        if self.aria is not None:
+            return self.aria.get("aria-label", "")[:200]
+
+        # Fallback: page <title>
+        if self.title_tag:
+            text = self.title_tag.get_text(strip=True)
+            # Try to extract role from "Role - Company" patterns
+            parts = re.split(r"\s*[|–—-]\s*", text)
+            if parts:
+                return parts[0].strip()[:200]
+
+        return ""
+
+    def company(self, url: str) -> str:
+        if self.site_name is not None:
+            return self.site_name.get("content", "")[:100]
+
+        for selector in COMPANY_SELECTORS:
+            el = self.first.get(selector)
+            if el:
+                return el.get_text(strip=True)[:100]
+
+        # Fallback: domain name
+        parsed = urlparse(url)
+        domain = parsed.netloc.replace("www.", "").split(".")[0]
+        return domain.replace("-", " ").title()
+
+    def location(self) -> str:
+        for selector in LOCATION_SELECTORS:
+            el = self.first.get(selector)
+            if el:
+                text = el.get_text(strip=True)
+                if 2 < len(text) < 150:
+                    return text
+
+        # Look for location icon patterns (📍 or similar)
+        for mark in self.location_marks:
+            parent = mark.parent
+            if parent:
+                text = parent.get_text(strip=True)
+                loc = re.sub(r"^(📍|location:)\s*", "", text, flags=re.IGNORECASE)
+                if 2 < len(loc) < 150:
+                    return loc
+
+        return "Unknown"
+
+    def description(self) -> str:
+        for selector in JD_SELECTORS:
+            el = self.first.get(selector)
+            if el:
+                text = el.get_text(separator=" ", strip=True)
+                if len(text) > 200:
+                    return text[:6000]
+
+        # Fallback: full body text
+        if self.body:
+            return self.body.get_text(separator=" ", strip=True)[:6000]
+
+        return ""
+
+    def has_apply(self) -> bool:
+        for el in self.buttons:
             text = el.get_text(strip=True)
-            if 2 < len(text) < 150:
-                return text
+            for pattern in APPLY_PATTERNS:
+                if pattern.search(text):
+                    return True
+        return False
 
-    # Look for location icon patterns (📍 or similar)
-    for el in soup.find_all(string=re.compile(r"📍|location:", re.IGNORECASE)):
-        parent = el.parent
-        if parent:
-            text = parent.get_text(strip=True)
-            loc = re.sub(r"^(📍|location:)\s*", "", text, flags=re.IGNORECASE)
-            if 2 < len(loc) < 150:
-                return loc
 
-    return "Unknown"
+def extract_title(soup: BeautifulSoup) -> str:
+    """Extract job title from page using heuristics."""
+    return PageScan(soup).title()
 
 
-def extract_description(soup: BeautifulSoup) -> str:
-    """Extract job description from page."""
-    for selector in JD_SELECTORS:
-        el = soup.select_one(selector)
-        if el:
-            text = el.get_text(separator=" ", strip=True)
-            if len(text) > 200:
-                return text[:6000]
+def extract_company(soup: BeautifulSoup, url: str) -> str:
+    """Extract company name from page or URL."""
+    return PageScan(soup).company(url)
+
+
+def extract_location(soup: BeautifulSoup) -> str:
+    """Extract job location from page."""
+    return PageScan(soup).location()
 
-    # Fallback: full body text
-    body = soup.find("body")
-    if body:
-        return body.get_text(separator=" ", strip=True)[:6000]
 
-    return ""
+def extract_description(soup: BeautifulSoup) -> str:
+    """Extract job description from page."""
+    return PageScan(soup).description()
 
 
 def has_apply_button(soup: BeautifulSoup) -> bool:
     """Check if the page has an apply button — indicating it's a job posting."""
-    for el in soup.find_all(["a", "button"]):
-        text = el.get_text(strip=True)
-        for pattern in APPLY_PATTERNS:
-            if pattern.search(text):
-                return True
-    return False
+    return PageScan(soup).has_apply()
 
 
 def parse_job_page(url: str) -> dict | None:
@@ -189,17 +331,256 @@ def parse_job_page(url: str) -> dict | None:
     soup = fetch_page(url)
     if not soup:
         return None
+    return parse_soup(soup, url)
+
+
+class FetchStats:
+    """
+    Per-URL latency and outcome of async page fetches: 'ok', 'unchanged'
+    (a cache hit), 'http_<status>', 'timeout', 'too_large' or 'error'.
+    Safe to share between threads.
+    """
+
+    def __init__(self):
+        self.by_url = {}            # url → (seconds, outcome)
+        self.outcomes = Counter()
+        self._lock = threading.Lock()
+
+    def record(self, url: str, seconds: float, outcome: str):
+        with self._lock:
+            self.by_url[url] = (seconds, outcome)
+            self.outcomes[outcome] += 1
+
+    def reclassify(self, url: str, outcome: str):
+        with self._lock:
+            seconds, previous = self.by_url[url]
+            self.outcomes[previous] -= 1
+            self.by_url[url] = (seconds, outcome)
+            self.outcomes[outcome] += 1
+
+    def failures(self) -> Counter:
+        return Counter({k: v for k, v in self.outcomes.items()
+                        if v and k not in ("ok", "unchanged")})
+
+    def latency_ms(self) -> dict:
+        with self._lock:
+            times = sorted(seconds * 1000 for seconds, _ in self.by_url.values())
+        if not times:
+            return {"p50": 0.0, "p95": 0.0, "max": 0.0}
+        return {"p50": times[len(times) // 2], "p95": times[int(len(times) * 0.95)],
+                "max": times[-1]}
+
+    def summary(self) -> str:
+        ms = self.latency_ms()
+        failed = self.failures()
+        reasons = ", ".join(f"{k} {v}" for k, v in failed.most_common())
+        return (f"{len(self.by_url)} pages, {sum(failed.values())} failed"
+                f"{f' ({reasons})' if reasons else ''}; latency p50 {ms['p50']:.0f} ms, "
+                f"p95 {ms['p95']:.0f} ms, max {ms['max']:.0f} ms")
+
+
+async def fetch_async(session: aiohttp.ClientSession, url: str, headers: dict = None,
+                      stats: FetchStats = None, timeout: int = 12,
+                      max_bytes: int = MAX_PAGE_BYTES) -> Fetched | None:
+    """
+    GET a page (body None for a 304), or None on failure. Bodies over
+    max_bytes are abandoned mid-download.
+    """
+    started = time.perf_counter()
+    outcome, result = "error", None
+    try:
+        async with session.get(url, headers={**HEADERS, **(headers or {})},
+                               allow_redirects=True, ssl=False,
+                               timeout=aiohttp.ClientTimeout(total=timeout)) as r:
+            if r.status == 304:
+                outcome, result = "ok", Fetched(304, r.headers, None, None)
+            elif r.status != 200:
+                outcome = f"http_{r.status}"
+            elif (r.content_length or 0) > max_bytes:
+                outcome = "too_large"
+            else:
+                body = bytearray()
+                async for chunk in r.content.iter_chunked(64 * 1024):
+                    body += chunk
+                    if len(body) > max_bytes:
+                        outcome = "too_large"
+                        break
+                else:
+                    outcome, result = "ok", Fetched(200, r.headers, bytes(body), r.charset)
+    except asyncio.TimeoutError:
+        outcome = "timeout"
+    except Exception as e:
+        log.debug(f"Fetch failed {url[:60]}: {e}")
+    if stats is not None:
+        stats.record(url, time.perf_counter() - started, outcome)
+    return result
+
+
+def _text(page: Fetched) -> str:
+    try:
+        return page.body.decode(page.charset or "utf-8", errors="replace")
+    except LookupError:
+        return page.body.decode("utf-8", errors="replace")
+
+
+async def _offload(executor, fn, *args):
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(executor, fn, *args)
+    except RuntimeError:        # executor broken or shut down
+        return await loop.run_in_executor(None, fn, *args)
+
+
+async def parse_job_page_async(session: aiohttp.ClientSession, url: str, cache=None,
+                               on_unchanged=None, executor=None, stats: FetchStats = None,
+                               timeout: int = 12) -> dict | None:
+    """
+    parse_job_page on an aiohttp session (one URL of parse_job_pages). The
+    page is parsed in `executor` (default: the loop's thread pool) and the
+    cache is read and written in threads, never on the loop itself.
+    """
+    if not url or url == "nan":
+        return None
+    entry = await asyncio.to_thread(cache.lookup, url) if cache is not None else None
+    page = await fetch_async(session, url, cache.conditional_headers(entry) if cache else None,
+                             stats, timeout)
+    if page is None or (page.status == 304 and not entry):
+        return None
+
+    if cache is not None:
+        digest = entry.body_hash if page.status == 304 else cache.body_hash(page.body)
+        if entry and digest == entry.body_hash:
+            await asyncio.to_thread(cache.touch, url)
+            if stats is not None:
+                stats.reclassify(url, "unchanged")
+            if on_unchanged:
+                on_unchanged()
+            return cache.cached_result(entry)
+
+    job = await _offload(executor, parse_html, _text(page), url)
+    if cache is not None:
+        await asyncio.to_thread(cache.store, url, page.headers.get("ETag"),
+                                page.headers.get("Last-Modified"), digest, job)
+    return job
+
+
+async def _batch(urls: list[str], one, session: aiohttp.ClientSession = None,
+                 concurrency: int = FETCH_CONCURRENCY) -> dict:
+    """{url: one(session, url)} for distinct URLs, at most `concurrency` at a time."""
+    urls = list(dict.fromkeys(urls))
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def bounded(url):
+        async with semaphore:
+            return url, await one(session, url)
+
+    if session is not None:
+        return dict(await asyncio.gather(*(bounded(url) for url in urls)))
+    async with _pooled_session(concurrency) as session:
+        return dict(await asyncio.gather(*(bounded(url) for url in urls)))
+
+
+def _pooled_session(concurrency: int = FETCH_CONCURRENCY) -> aiohttp.ClientSession:
+    """A session capped at `concurrency` connections, FETCH_PER_HOST per host (call on a loop)."""
+    connector = aiohttp.TCPConnector(limit=concurrency, limit_per_host=FETCH_PER_HOST,
+                                     ssl=False, ttl_dns_cache=300)
+    return aiohttp.ClientSession(connector=connector)
+
+
+async def parse_job_pages(urls: list[str], session: aiohttp.ClientSession = None,
+                          stats: FetchStats = None, cache=None, on_unchanged=None,
+                          executor=None, concurrency: int = FETCH_CONCURRENCY) -> dict:
+    """
+    Batch parse_job_page: {url: job or None}. Every URL goes through one
+    pooled session (`session`, or one opened for the batch), at most
+    `concurrency` at once and FETCH_PER_HOST per host.
+    """
+    async def one(session, url):
+        return await parse_job_page_async(session, url, cache, on_unchanged, executor, stats)
+    return await _batch(urls, one, session, concurrency)
+
+
+async def fetch_full_jds(urls: list[str], session: aiohttp.ClientSession = None,
+                         stats: FetchStats = None, executor=None,
+                         concurrency: int = FETCH_CONCURRENCY) -> dict:
+    """Batch fetch_full_jd: {url: JD text, '' on failure}."""
+    async def one(session, url):
+        if not url or url == "nan":
+            return ""
+        page = await fetch_async(session, url, stats=stats)
+        if page is None or page.body is None:
+            return ""
+        return await _offload(executor, description_of, _text(page))
+    return await _batch(urls, one, session, concurrency)
+
+
+class PageFetcher:
+    """
+    A private event loop and pooled session kept open across batches, for a
+    synchronous thread that fetches page after page (a pipeline parse
+    worker): connections, DNS and the loop's thread pool are reused instead
+    of rebuilt per batch. Use as a context manager, from one thread.
+    """
+
+    def __init__(self, concurrency: int = FETCH_CONCURRENCY):
+        self.concurrency = concurrency
+        self._loop = None
+        self._session = None
+
+    def __enter__(self):
+        self._loop = asyncio.new_event_loop()
+        return self
+
+    def __exit__(self, *exc):
+        loop, self._loop = self._loop, None
+        try:
+            if self._session is not None:
+                loop.run_until_complete(self._session.close())
+            loop.run_until_complete(loop.shutdown_default_executor())
+        finally:
+            self._session = None
+            loop.close()
+
+    async def _open(self) -> aiohttp.ClientSession:
+        return _pooled_session(self.concurrency)
+
+    def _run(self, batch, urls: list[str], **kwargs) -> dict:
+        if self._session is None or self._session.closed:
+            self._session = self._loop.run_until_complete(self._open())
+        return self._loop.run_until_complete(
+            batch(urls, self._session, concurrency=self.concurrency, **kwargs))
+
+    def parse_job_pages(self, urls: list[str], **kwargs) -> dict:
+        """parse_job_pages on this fetcher's session."""
+        return self._run(parse_job_pages, urls, **kwargs)
+
+    def fetch_full_jds(self, urls: list[str], **kwargs) -> dict:
+        """fetch_full_jds on this fetcher's session."""
+        return self._run(fetch_full_jds, urls, **kwargs)
+
+
+def parse_html(html: str, url: str) -> dict | None:
+    """parse_soup on raw HTML (picklable, for process pools)."""
+    return parse_soup(make_soup(html), url)
+
+
+def description_of(html: str) -> str:
+    return extract_description(make_soup(html))
+
 
-    title = extract_title(soup)
+def parse_soup(soup: BeautifulSoup, url: str) -> dict | None:
+    """Structured job data from a parsed page, or None if it isn't one."""
+    page = PageScan(soup)
+    title = page.title()
     if not title:
         return None
 
-    description = extract_description(soup)
+    description = page.description()
     if len(description) < 100:
         return None
 
-    company = extract_company(soup, url)
-    location = extract_location(soup)
+    company = page.company(url)
+    location = page.location()
 
     return {
         "job_title": title,
@@ -209,7 +590,7 @@ def parse_job_page(url: str) -> dict | None:
         "jd_content": description,
         "source": "web_discovery",
         "visa_sponsorship": "unknown",
-        "has_apply": has_apply_button(soup),
+        "has_apply": page.has_apply(),
     }
 
 
@@ -66,12 +66,13 @@ def make_job(title, company, country, url, description, source="greenhouse"):
     }
 
 
-def scrape_greenhouse() -> list[dict]:
-    """Scrape all Greenhouse companies for job postings."""
-    log.info(f"🌿 Scraping Greenhouse ({len(GREENHOUSE_COMPANIES)} companies)...")
+def scrape_greenhouse(companies: list[str] = None) -> list[dict]:
+    """Scrape Greenhouse companies (all of them by default) for job postings."""
+    companies = GREENHOUSE_COMPANIES if companies is None else companies
+    log.info(f"🌿 Scraping Greenhouse ({len(companies)} companies)...")
     jobs = []
 
-    for company in GREENHOUSE_COMPANIES:
+    for company in companies:
         try:
             r = requests.get(
                 f"https://boards-api.greenhouse.io/v1/boards/{company}/jobs?content=true",
@@ -67,12 +67,13 @@ def make_job(title, company, country, url, description, source="lever"):
     }
 
 
-def scrape_lever() -> list[dict]:
-    """Scrape all Lever companies for job postings."""
-    log.info(f"⚙️  Scraping Lever ({len(LEVER_COMPANIES)} companies)...")
+def scrape_lever(companies: list[str] = None) -> list[dict]:
+    """Scrape Lever companies (all of them by default) for job postings."""
+    companies = LEVER_COMPANIES if companies is None else companies
+    log.info(f"⚙️  Scraping Lever ({len(companies)} companies)...")
     jobs = []
 
-    for company in LEVER_COMPANIES:
+    for company in companies:
         try:
             r = requests.get(
                 f"https://api.lever.co/v0/postings/{company}?mode=json",
@@ -65,12 +65,13 @@ def make_job(title, company, country, url, description, source="workable"):
     }
 
 
-def scrape_workable() -> list[dict]:
-    """Scrape all Workable companies for job postings."""
-    log.info(f"🔧 Scraping Workable ({len(WORKABLE_COMPANIES)} companies)...")
+def scrape_workable(companies: list[str] = None) -> list[dict]:
+    """Scrape Workable companies (all of them by default) for job postings."""
+    companies = WORKABLE_COMPANIES if companies is None else companies
+    log.info(f"🔧 Scraping Workable ({len(companies)} companies)...")
     jobs = []
 
-    for company in WORKABLE_COMPANIES:
+    for company in companies:
         try:
             r = requests.post(
                 f"https://apply.workable.com/api/v3/accounts/{company}/jobs",
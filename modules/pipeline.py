@@ -0,0 +1,571 @@
+# modules/pipeline.py
+"""
+Staged scan pipeline.
+A small DAG executor — every stage has its own worker threads, a bounded
+input queue (so a slow stage pushes back on the ones feeding it) and timing
+metrics — plus the job-discovery graph built on it:
+
+    discover → crawl → parse ──────┐
+    ATS adapters / scraper sources ┴→ filter → ai_validate → store → notify
+
+Sources run once and finish; a stage finishes when every stage feeding it
+has finished and its queue is drained, so Pipeline.run() returns when the
+whole scan is done.
+"""
+
+import time
+import queue
+import logging
+import threading
+from functools import partial
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+
+import sys, os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import (
+    PIPELINE_STAGES,
+    PIPELINE_DISCOVERY_QUERIES,
+    PIPELINE_CRAWL_DOMAINS,
+    PIPELINE_AI_VALIDATE,
+    HTTP_CACHE,
+)
+
+log = logging.getLogger(__name__)
+
+_DONE = object()
+
+
+# ── Executor ──────────────────────────────────────────────────────────────────
+
+class Stage:
+    """
+    One node of the graph. fn(item) — or fn(list_of_items) when batch_size > 1 —
+    returns an iterable of outputs (or None), which go to every downstream stage.
+    context(), if given, returns a context manager each worker thread holds
+    open for its lifetime (per-thread resources such as an event loop).
+    """
+
+    def __init__(self, pipeline, name: str, fn, workers: int = 1,
+                 queue_size: int = 100, batch_size: int = 1, batch_wait: float = 0.5,
+                 context=None):
+        self.pipeline = pipeline
+        self.name = name
+        self.fn = fn
+        self.workers = workers
+        self.context = context
+        self.batch_size = batch_size
+        self.batch_wait = batch_wait
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.downstream = []
+        self._open_inputs = 0
+        self._running = workers
+        self._healthy = workers     # workers whose context opened
+        self._lock = threading.Lock()
+        self.metrics = {"in": 0, "out": 0, "errors": 0, "calls": 0,
+                        "busy_seconds": 0.0, "max_call_seconds": 0.0,
+                        "blocked_seconds": 0.0, "max_queue": 0,
+                        "started": None, "finished": None}
+
+    # ── Wiring ────────────────────────────────────────────────────────────────
+
+    def _add_input(self):
+        self._open_inputs += 1
+
+    def _close_input(self):
+        with self._lock:
+            self._open_inputs -= 1
+            last = self._open_inputs == 0
+        if last:
+            for _ in range(self.workers):
+                self.queue.put(_DONE)
+
+    def put(self, item):
+        """Queue an item; blocks while this stage is full (backpressure)."""
+        self.queue.put(item)
+        with self._lock:
+            self.metrics["in"] += 1
+            self.metrics["max_queue"] = max(self.metrics["max_queue"], self.queue.qsize())
+
+    def _emit(self, outputs):
+        if not outputs:
+            return
+        for item in outputs:
+            self._record("out", 1)
+            for stage in self.downstream:
+                started = time.perf_counter()
+                stage.put(item)
+                self._record("blocked_seconds", time.perf_counter() - started)
+
+    def _record(self, key: str, value):
+        with self._lock:
+            self.metrics[key] += value
+
+    # ── Workers ───────────────────────────────────────────────────────────────
+
+    def _call(self, arg):
+        """fn(arg) as a list of outputs, or None if it raised."""
+        started = time.perf_counter()
+        try:
+            outputs = self.fn(arg)
+            # Materialise generators here so their time counts as busy time
+            return list(outputs) if outputs is not None else []
+        except Exception as e:
+            self._record("errors", 1)
+            log.warning(f"Pipeline stage {self.name} failed: {e}")
+            return None
+        finally:
+            self._record_call(time.perf_counter() - started)
+
+    def _record_call(self, elapsed: float):
+        with self._lock:
+            self.metrics["calls"] += 1
+            self.metrics["busy_seconds"] += elapsed
+            self.metrics["max_call_seconds"] = max(self.metrics["max_call_seconds"], elapsed)
+
+    def _handle(self, arg, inputs: list):
+        outputs = self._call(arg)
+        if outputs is None:
+            return      # failed: its inputs never reach on_exit (a checkpointed unit stays open)
+        self._emit(outputs)
+
+        on_exit = self.pipeline.on_exit
+        if on_exit:
+            # Inputs not passed downstream (by identity) have left the graph
+            passed = {id(item) for item in outputs} if self.downstream else set()
+            for item in inputs:
+                if id(item) not in passed:
+                    on_exit(item)
+
+    def _next_batch(self) -> tuple[list, bool]:
+        """Up to batch_size items (waiting at most batch_wait for stragglers)."""
+        item = self.queue.get()
+        if item is _DONE:
+            return [], True
+        batch = [item]
+        deadline = time.monotonic() + self.batch_wait
+        while len(batch) < self.batch_size:
+            try:
+                item = self.queue.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                break
+            if item is _DONE:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _work(self):
+        drained = False
+        try:
+            with self.context() if self.context else nullcontext():
+                self._drain()
+                drained = True
+        except Exception as e:
+            self._record("errors", 1)
+            log.warning(f"Pipeline stage {self.name} worker failed: {e}")
+        if not drained:
+            self._abandon()
+        self._worker_finished()
+
+    def _abandon(self):
+        """
+        A worker whose context failed stops; the last one to do so discards
+        the stage's input, so upstream stages never block on a queue nobody
+        reads and the pipeline ends (with errors) instead of hanging.
+        """
+        with self._lock:
+            self._healthy -= 1
+            last = self._healthy == 0
+        if not last:
+            return
+        dropped = 0
+        while self.queue.get() is not _DONE:
+            dropped += 1
+        if dropped:
+            self._record("errors", dropped)
+            log.warning(f"Pipeline stage {self.name}: no worker left — {dropped} item(s) dropped")
+
+    def _drain(self):
+        while True:
+            if self.batch_size > 1:
+                batch, done = self._next_batch()
+                if batch:
+                    self._handle(batch, batch)
+            else:
+                item = self.queue.get()
+                done = item is _DONE
+                if not done:
+                    self._handle(item, [item])
+            if done:
+                break
+
+    def _worker_finished(self):
+        with self._lock:
+            self._running -= 1
+            last = self._running == 0
+            if last:
+                self.metrics["finished"] = time.perf_counter()
+        if last:
+            for stage in self.downstream:
+                stage._close_input()
+
+    def _start(self):
+        self.metrics["started"] = time.perf_counter()
+        for i in range(self.workers):
+            threading.Thread(target=self._work, name=f"{self.name}-{i}", daemon=True).start()
+
+
+class Source(Stage):
+    """
+    A stage with no inputs: fn() is called once and its outputs are emitted
+    as they are produced, so a generator feeds the graph while it runs.
+    """
+
+    def __init__(self, pipeline, name: str, fn):
+        super().__init__(pipeline, name, fn, workers=1, queue_size=1)
+
+    def _work(self):
+        started = time.perf_counter()
+        try:
+            for item in self.fn(None) or ():
+                self._emit([item])
+        except Exception as e:
+            self._record("errors", 1)
+            log.warning(f"Pipeline source {self.name} failed: {e}")
+        finally:
+            # Busy time excludes waiting on full downstream queues
+            self._record_call(time.perf_counter() - started - self.metrics["blocked_seconds"])
+        self._worker_finished()
+
+
+class Pipeline:
+    """
+    A DAG of stages run to completion once per scan. on_exit(item), if given,
+    is called for every item that leaves the graph — dropped by a stage or
+    consumed by a sink — but not for items lost to a stage error.
+    """
+
+    def __init__(self, name: str = "scan", on_exit=None):
+        self.name = name
+        self.on_exit = on_exit
+        self.stages = []
+        self.counters = Counter()
+        self._lock = threading.Lock()
+
+    def source(self, name: str, fn) -> Source:
+        source = Source(self, name, lambda _: fn())
+        self.stages.append(source)
+        return source
+
+    def stage(self, name: str, fn, after: list, workers: int = 1, queue_size: int = 100,
+              batch_size: int = 1, batch_wait: float = 0.5, context=None) -> Stage:
+        stage = Stage(self, name, fn, workers, queue_size, batch_size, batch_wait, context)
+        for upstream in after:
+            upstream.downstream.append(stage)
+            stage._add_input()
+        self.stages.append(stage)
+        return stage
+
+    def count(self, key: str, n: int = 1):
+        """Bump a named counter (e.g. why an item was dropped)."""
+        with self._lock:
+            self.counters[key] += n
+
+    def run(self, timeout: float = None) -> dict:
+        """Start every stage, wait for the graph to drain, return metrics."""
+        started = time.perf_counter()
+        for stage in reversed(self.stages):
+            # Stages with no inputs at all (e.g. nothing wired in) finish at once
+            if not isinstance(stage, Source) and stage._open_inputs == 0:
+                stage._open_inputs = 1
+                stage._start()
+                stage._close_input()
+            else:
+                stage._start()
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for stage in self.stages:
+            while stage.metrics["finished"] is None:
+                if deadline is not None and time.monotonic() > deadline:
+                    log.warning(f"Pipeline {self.name}: timed out waiting for {stage.name}")
+                    return self.metrics(time.perf_counter() - started)
+                time.sleep(0.05)
+        return self.metrics(time.perf_counter() - started)
+
+    def metrics(self, elapsed: float = None) -> dict:
+        stages = {}
+        for stage in self.stages:
+            m = dict(stage.metrics)
+            end = m["finished"] or time.perf_counter()
+            m["wall_seconds"] = end - m["started"] if m["started"] else 0.0
+            m["avg_call_ms"] = m["busy_seconds"] * 1000 / m["calls"] if m["calls"] else 0.0
+            m["workers"] = stage.workers
+            del m["started"], m["finished"]
+            stages[stage.name] = m
+        return {"seconds": elapsed, "stages": stages, "counters": dict(self.counters)}
+
+
+def print_report(metrics: dict):
+    """One line per stage: throughput, time spent working vs waiting, queue depth."""
+    print(f"\n⏱  Pipeline finished in {metrics['seconds']:.1f}s")
+    print(f"  {'stage':<14}{'wk':>3}{'in':>7}{'out':>7}{'err':>5}"
+          f"{'busy s':>9}{'avg ms':>9}{'max ms':>9}{'blocked s':>11}{'max q':>7}")
+    for name, m in metrics["stages"].items():
+        print(f"  {name:<14}{m['workers']:>3}{m['in']:>7}{m['out']:>7}{m['errors']:>5}"
+              f"{m['busy_seconds']:>9.1f}{m['avg_call_ms']:>9.1f}"
+              f"{m['max_call_seconds'] * 1000:>9.0f}{m['blocked_seconds']:>11.1f}"
+              f"{m['max_queue']:>7}")
+    if metrics["counters"]:
+        print("  " + " · ".join(f"{k}: {v}" for k, v in sorted(metrics["counters"].items())))
+
+
+# ── Job Discovery Graph ───────────────────────────────────────────────────────
+
+def _stage_options(name: str) -> dict:
+    workers, queue_size = PIPELINE_STAGES.get(name, (1, 100))
+    return {"workers": workers, "queue_size": queue_size}
+
+
+def board_platform(source: str) -> str:
+    """'ats:greenhouse' and 'greenhouse' both poll Greenhouse boards."""
+    return source[4:] if source.startswith("ats:") else source
+
+
+def board_registry() -> dict:
+    """
+    Every company board polled, by the source that polls it: the scraper's
+    cadence-managed boards (modules/scraper.BOARDS) first, then the four
+    ATS adapters' lists without those. Each (platform, slug) appears once.
+    """
+    from modules.scraper import BOARDS
+    from modules.parsing.greenhouse import GREENHOUSE_COMPANIES
+    from modules.parsing.lever import LEVER_COMPANIES
+    from modules.parsing.ashby import ASHBY_COMPANIES
+    from modules.parsing.workable import WORKABLE_COMPANIES
+
+    registry, taken = {}, set()
+    for source, slugs in (*BOARDS.items(),
+                          ("ats:greenhouse", GREENHOUSE_COMPANIES),
+                          ("ats:lever", LEVER_COMPANIES),
+                          ("ats:ashby", ASHBY_COMPANIES),
+                          ("ats:workable", WORKABLE_COMPANIES)):
+        registry[source] = []
+        for slug in slugs:
+            key = (board_platform(source), slug.lower())
+            if key not in taken:
+                taken.add(key)
+                registry[source].append(slug)
+    return registry
+
+
+def ats_boards() -> dict:
+    """The boards the four ATS adapters sweep (those the scraper doesn't already poll)."""
+    return {source: slugs for source, slugs in board_registry().items()
+            if source.startswith("ats:")}
+
+
+def ats_sources() -> dict:
+    """The four ATS adapters as pipeline sources: fn(slugs) → jobs."""
+    from modules.parsing.greenhouse import scrape_greenhouse
+    from modules.parsing.lever import scrape_lever
+    from modules.parsing.ashby import scrape_ashby
+    from modules.parsing.workable import scrape_workable
+    return {
+        "ats:greenhouse": scrape_greenhouse,
+        "ats:lever": scrape_lever,
+        "ats:ashby": scrape_ashby,
+        "ats:workable": scrape_workable,
+    }
+
+
+def build_scan_pipeline(writer, dispatcher, keyword_filter, sources: dict,
+                        discover: bool = True, ai_validate: bool = PIPELINE_AI_VALIDATE,
+                        checkpoint=None, name: str = "scan") -> Pipeline:
+    """
+    Assemble the scan graph.
+    writer         — JobWriter; the store stage submits to it (alerts go to the outbox)
+    dispatcher     — OutboxDispatcher; the notify stage wakes it as jobs are stored
+    keyword_filter — job → bool, the config keyword rules (main.is_valid_job)
+    sources        — {name: fn() → iterable of jobs} fed straight into filter
+    discover       — include discover → crawl → parse for new company domains
+    checkpoint     — ScanCheckpoint; crawled domains become units, and every
+                     item leaving the graph is reported to it
+    """
+    from modules.tracker import job_exists
+    from modules.filtering.visa_filter import check_visa
+    from modules.filtering.rule_scoring import passes_rule_filter
+    from modules.filtering.experience_parser import passes_experience_filter
+
+    pipe = Pipeline(name, on_exit=checkpoint.close if checkpoint else None)
+    feeds = [pipe.source(source_name, fn) for source_name, fn in sources.items()]
+
+    def is_known(url: str) -> bool:
+        return not url or writer.is_pending(url) or job_exists(url)
+
+    # ── discover → crawl → parse ──────────────────────────────────────────────
+    if discover:
+        from modules.discovery.web_discovery import discover_domains, mark_crawled
+        from modules.crawling.career_crawler import RequestStats
+        from modules.crawling.frontier import crawl_frontier, frontier_done
+        from modules.parsing.generic_html import PageFetcher, FetchStats
+        from modules import http_cache
+        cache = http_cache if HTTP_CACHE else None
+
+        adapters = ats_sources()
+        # Boards the scraper and adapters already sweep, plus those seen this run
+        boards_seen = {(board_platform(source), slug.lower())
+                       for source, slugs in board_registry().items() for slug in slugs}
+
+        def board_jobs(boards) -> list[dict]:
+            """Jobs of hosted ATS boards a domain links to, from the JSON adapters."""
+            jobs = []
+            for platform, slug in sorted(boards):
+                if (platform, slug.lower()) in boards_seen:
+                    continue
+                boards_seen.add((platform, slug.lower()))
+                found = adapters[f"ats:{platform}"]([slug])
+                pipe.count("ats_boards")
+                pipe.count("ats_jobs", len(found))
+                jobs.extend(found)
+            return jobs
+
+        def settle(domain, job_count):
+            mark_crawled(domain, job_count)
+            frontier_done(domain)
+
+        def crawl():
+            if checkpoint is None or not checkpoint.is_done("discover", "web", "queries"):
+                pipe.count("discovered", len(discover_domains(PIPELINE_DISCOVERY_QUERIES)))
+                if checkpoint:
+                    checkpoint.open("discover", "web", "queries", 0)
+
+            requests = RequestStats()
+            try:
+                for domain, urls in crawl_frontier(requests, PIPELINE_CRAWL_DOMAINS, cache=cache):
+                    links = [{"job_url": url} for url in urls if not is_known(url)]
+                    pipe.count("job_links", len(urls))
+                    pipe.count("known_links", len(urls) - len(links))
+                    listed = max(len(urls), requests.listed[domain])
+                    pipe.count("sitemap_unchanged", listed - len(urls))
+                    ats_jobs = board_jobs(requests.boards.pop(domain, ()))
+                    links += ats_jobs
+                    listed += len(ats_jobs)
+                    if not listed and requests.unchanged[domain]:
+                        listed = None       # job sitemaps untouched: keep the old count
+
+                    # The domain only counts as crawled once its jobs are saved
+                    done = partial(settle, domain, listed)
+                    unit = None
+                    if checkpoint is None:
+                        done()
+                    else:
+                        unit = checkpoint.open("crawl", "web", domain, len(links), on_settle=done)
+                    for link in links:
+                        link["_unit"] = unit
+                        yield link
+            finally:
+                pipe.count("crawl_requests", requests.total())
+                pipe.count("career_pages_unchanged", sum(requests.pages_unchanged.values()))
+
+        fetchers = threading.local()
+
+        @contextmanager
+        def parse_worker():
+            # One event loop and pooled session per parse thread, reused by every batch
+            with PageFetcher() as fetchers.current:
+                yield
+
+        def parse(links):
+            """A batch of job links, fetched concurrently on the worker's session."""
+            urls = [link["job_url"] for link in links if "job_title" not in link]
+            fetches = FetchStats()
+            jobs = {}
+            if urls:
+                jobs = fetchers.current.parse_job_pages(
+                    urls, stats=fetches, cache=cache,
+                    on_unchanged=lambda: pipe.count("job_pages_unchanged"))
+                log.info(f"  📄 Job pages: {fetches.summary()}")
+            for outcome, n in fetches.failures().items():
+                pipe.count(f"job_fetch_{outcome}", n)
+
+            parsed = []
+            for link in links:
+                if "job_title" in link:
+                    parsed.append(link)     # from an ATS adapter, already structured
+                elif (job := jobs.get(link["job_url"])) is not None:
+                    link.update(job)        # same dict, so it keeps its checkpoint unit
+                    parsed.append(link)
+                elif fetches.by_url.get(link["job_url"], (0, "ok"))[1] in ("ok", "unchanged"):
+                    pipe.count("unparseable")   # fetched, but not a job page
+            return parsed
+
+        crawled = pipe.source("crawl", crawl)
+        feeds.append(pipe.stage("parse", parse, after=[crawled], batch_size=50,
+                                context=parse_worker, **_stage_options("parse")))
+
+    # ── filter → ai_validate → store → notify ─────────────────────────────────
+    def filter_job(job):
+        title = job.get("job_title", "") or ""
+        description = job.get("jd_content", "") or ""
+        country = job.get("country", "") or ""
+
+        if is_known(job.get("job_url", "")):
+            pipe.count("duplicate")
+            return None
+        if not keyword_filter(job):
+            pipe.count("filtered")
+            return None
+
+        passed, _, _ = passes_experience_filter(title, description)
+        if not passed:
+            pipe.count("filtered")
+            return None
+
+        is_remote = "remote" in (country + " " + job.get("location", "")).lower()
+        passed, visa_score, _ = check_visa(title, description, country, is_remote)
+        if not passed:
+            pipe.count("filtered")
+            return None
+
+        passed, score, _ = passes_rule_filter(title, description)
+        if not passed:
+            pipe.count("filtered")
+            return None
+
+        # 99 = India (no visa needed), 50 = remote internship auto-pass
+        job["visa_sponsorship"] = {99: "not_required", 50: "unknown"}.get(visa_score, "sponsored")
+        job["hr_score"] = score
+        job["status"] = "discovered"
+        job["notes"] = f"Source: {job.get('source', 'unknown')}"
+        return [job]
+
+    def validate(job):
+        if not ai_validate:
+            return [job]
+        from modules.filtering.ollama_validator import validate_with_ollama
+        verdict = validate_with_ollama(job.get("job_title", ""), job.get("jd_content", ""))
+        if verdict.get("decision") == "REJECT":
+            pipe.count("ai_rejected")
+            return None
+        return [job]
+
+    def store(job):
+        # 'new' / 'duplicate' / 'lost' are counted once the writer has committed
+        # the job, since INSERT OR IGNORE can still drop it as a duplicate
+        if not writer.submit(job, on_saved=pipe.count):
+            pipe.count("duplicate")
+            return None
+        return [job]
+
+    def notify(jobs):
+        # Alerts were queued in the outbox with the job; wake the dispatcher
+        dispatcher.nudge()
+        return None
+
+    filtered = pipe.stage("filter", filter_job, after=feeds, **_stage_options("filter"))
+    validated = pipe.stage("ai_validate", validate, after=[filtered], **_stage_options("ai_validate"))
+    stored = pipe.stage("store", store, after=[validated], **_stage_options("store"))
+    pipe.stage("notify", notify, after=[stored], batch_size=50, batch_wait=1.0,
+               **_stage_options("notify"))
+    return pipe
@@ -0,0 +1,255 @@
+# modules/retention.py
+"""
+Retention + archival for jobs.db.
+Jobs older than RETENTION_DAYS are written to date-partitioned Parquet
+(archive/jobs/date=YYYY-MM-DD/jobs.parquet, one file per day) and then
+deleted from SQLite. Stale AI-cache entries, cached pages, dead domains and
+old sent alerts are expired, and freed pages are returned to the OS with an
+incremental VACUUM.
+
+The archive is read back with pandas (read_archive) — historical analytics
+never touch the live database.
+"""
+
+import time
+import sqlite3
+import logging
+from pathlib import Path
+from datetime import datetime
+
+import pandas as pd
+
+import sys, os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import (
+    DB_PATH,
+    ARCHIVE_DIR,
+    RETENTION_DAYS,
+    AI_CACHE_RETENTION_DAYS,
+    DOMAIN_RETENTION_DAYS,
+    OUTBOX_RETENTION_DAYS,
+    HTTP_CACHE_RETENTION_DAYS,
+)
+from modules.storage import init_storage
+
+log = logging.getLogger(__name__)
+
+ARCHIVE_BATCH = 5000        # rows moved per transaction
+ARCHIVE_FILE = "jobs.parquet"
+VACUUM_STEP_PAGES = 1000    # pages released per incremental_vacuum call
+VACUUM_RETRIES = 5          # attempts while another connection holds the database
+VACUUM_RETRY_SECONDS = 2.0  # first retry delay (doubles per attempt)
+
+
+def _cutoff(days: int) -> int:
+    return int(time.time()) - int(days) * 86400
+
+
+def _partition_date(ts) -> str:
+    return datetime.fromtimestamp(int(ts)).strftime("%Y-%m-%d")
+
+
+# ── Jobs → Parquet ────────────────────────────────────────────────────────────
+
+def _merge_partition(folder: Path, rows: pd.DataFrame):
+    """
+    Fold rows into the day's single archive file, deduplicated by id. The
+    merged file replaces the old one atomically; older part-*.parquet files
+    in the folder are merged in and removed.
+    """
+    folder.mkdir(parents=True, exist_ok=True)
+    existing = sorted(folder.glob("*.parquet"))
+    merged = pd.concat([pd.read_parquet(path) for path in existing] + [rows],
+                       ignore_index=True)
+    merged = merged.drop_duplicates("id", keep="last").sort_values("id")
+    tmp = folder / f".{ARCHIVE_FILE}.tmp"
+    merged.to_parquet(tmp, index=False)
+    os.replace(tmp, folder / ARCHIVE_FILE)
+    for path in existing:
+        if path.name != ARCHIVE_FILE:
+            path.unlink()
+
+
+def archive_old_jobs(max_age_days: int = RETENTION_DAYS,
+                     archive_dir: str = ARCHIVE_DIR,
+                     db_path: str = DB_PATH) -> int:
+    """
+    Move jobs found more than max_age_days ago into the Parquet archive.
+    Each day is one file, merged by id, and is written before the rows are
+    deleted — a crash between the two just merges the same rows again on
+    the next run. Jobs with no found_ts (date_found missing or unparseable
+    before the migration) are stamped with the current time first, so they
+    age out max_age_days from now. Returns the number of rows archived.
+    """
+    cutoff = _cutoff(max_age_days)
+    root = Path(archive_dir) / "jobs"
+    moved = 0
+
+    storage = init_storage(db_path)
+    undated = storage.execute("archive_stamp_undated", (int(time.time()),)).rowcount
+    if undated:
+        log.info(f"📦 {undated} jobs had no found_ts — archived {max_age_days} days from now")
+
+    while True:
+        cur = storage.execute("archive_batch", (cutoff, ARCHIVE_BATCH))
+        df = pd.DataFrame.from_records(cur.fetchall(),
+                                       columns=[col[0] for col in cur.description])
+        if df.empty:
+            break
+
+        df["date"] = df["found_ts"].map(_partition_date)
+        for day, part in df.groupby("date"):
+            _merge_partition(root / f"date={day}", part.drop(columns=["date"]))
+
+        ids = [(int(i),) for i in df["id"]]
+        with storage.transaction():
+            storage.executemany("archive_delete", ids)
+        moved += len(ids)
+
+    if moved:
+        # Merge the FTS segments left fragmented by the bulk delete
+        storage.execute("fts_optimize")
+        log.info(f"📦 Archived {moved} jobs older than {max_age_days} days → {root}")
+    return moved
+
+
+# ── Cache / Domain Expiry ─────────────────────────────────────────────────────
+
+def expire_ai_cache(max_age_days: int = AI_CACHE_RETENTION_DAYS,
+                    db_path: str = DB_PATH) -> int:
+    """Drop AI validation results older than max_age_days."""
+    return init_storage(db_path).execute("ai_cache_expire", (_cutoff(max_age_days),)).rowcount
+
+
+def expire_http_cache(max_age_days: int = HTTP_CACHE_RETENTION_DAYS,
+                      db_path: str = DB_PATH) -> int:
+    """Drop cached pages not revalidated in max_age_days."""
+    return init_storage(db_path).execute("http_cache_expire", (_cutoff(max_age_days),)).rowcount
+
+
+def expire_domains(max_age_days: int = DOMAIN_RETENTION_DAYS,
+                   db_path: str = DB_PATH) -> int:
+    """Drop old domains that were crawled but never yielded a job link."""
+    return init_storage(db_path).execute("domains_expire", (_cutoff(max_age_days),)).rowcount
+
+
+def expire_outbox(max_age_days: int = OUTBOX_RETENTION_DAYS,
+                  db_path: str = DB_PATH) -> int:
+    """Drop delivered / permanently failed alerts older than max_age_days."""
+    return init_storage(db_path).execute("outbox_expire", (_cutoff(max_age_days),)).rowcount
+
+
+# ── Incremental VACUUM ────────────────────────────────────────────────────────
+
+def incremental_vacuum(db_path: str = DB_PATH, max_pages: int = None) -> int:
+    """
+    Return free pages to the filesystem in small steps.
+    Databases created before auto_vacuum was enabled get a one-time full
+    VACUUM to switch them to INCREMENTAL mode. That needs the database to
+    itself, so while another connection (the background writer) holds it
+    the VACUUM is retried with backoff, then left for the next run.
+    Returns pages released.
+
+    Runs on a private connection rather than the storage one: VACUUM fails
+    while any statement on its connection is still open, and the pragmas
+    are maintenance commands, not named statements.
+    """
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    try:
+        if conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+            log.info("🧹 Switching database to incremental auto-vacuum (one-time VACUUM)")
+            conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            for attempt in range(VACUUM_RETRIES):
+                try:
+                    conn.execute("VACUUM")
+                    break
+                except sqlite3.OperationalError as e:
+                    if "locked" not in str(e) and "busy" not in str(e):
+                        raise
+                    if attempt == VACUUM_RETRIES - 1:
+                        log.warning(f"🧹 VACUUM skipped, database busy: {e} — retried next run")
+                        break
+                    time.sleep(VACUUM_RETRY_SECONDS * 2 ** attempt)
+            return 0
+
+        released = 0
+        while True:
+            free = conn.execute("PRAGMA freelist_count").fetchone()[0]
+            if free == 0 or (max_pages is not None and released >= max_pages):
+                break
+            step = min(free, VACUUM_STEP_PAGES)
+            if max_pages is not None:
+                step = min(step, max_pages - released)
+            # executescript steps the pragma to completion; a plain execute()
+            # only frees a single page per call.
+            conn.executescript(f"PRAGMA incremental_vacuum({int(step)});")
+            freed = free - conn.execute("PRAGMA freelist_count").fetchone()[0]
+            if freed <= 0:
+                break
+            released += freed
+        return released
+    finally:
+        conn.close()
+
+
+# ── Archive Reader ────────────────────────────────────────────────────────────
+
+def read_archive(since: str = None, until: str = None, columns: list[str] = None,
+                 archive_dir: str = ARCHIVE_DIR) -> pd.DataFrame:
+    """
+    Load archived jobs into a DataFrame.
+    since / until are inclusive 'YYYY-MM-DD' bounds; only the matching
+    date partitions are opened. A 'date' column is added from the partition.
+    Rows are deduplicated by id (a partition can still hold part files
+    written before one-file-per-day archiving).
+    """
+    root = Path(archive_dir) / "jobs"
+    frames = []
+    read = None if columns is None else list(dict.fromkeys([*columns, "id"]))
+
+    for folder in sorted(root.glob("date=*")):
+        day = folder.name.split("=", 1)[1]
+        if since and day < since:
+            continue
+        if until and day > until:
+            continue
+        for path in sorted(folder.glob("*.parquet")):
+            df = pd.read_parquet(path, columns=read)
+            df["date"] = day
+            frames.append(df)
+
+    if not frames:
+        return pd.DataFrame(columns=(columns or []) + ["date"])
+    df = pd.concat(frames, ignore_index=True).drop_duplicates("id", keep="last")
+    if columns is not None and "id" not in columns:
+        df = df.drop(columns=["id"])
+    return df.reset_index(drop=True)
+
+
+# ── Entry Point ───────────────────────────────────────────────────────────────
+
+def run_retention(db_path: str = DB_PATH) -> dict:
+    """Archive old jobs, expire caches, then reclaim space. Safe to run daily."""
+    init_storage(db_path)
+
+    stats = {
+        "jobs_archived": archive_old_jobs(db_path=db_path),
+        "ai_cache_expired": expire_ai_cache(db_path=db_path),
+        "http_cache_expired": expire_http_cache(db_path=db_path),
+        "domains_expired": expire_domains(db_path=db_path),
+        "outbox_expired": expire_outbox(db_path=db_path),
+    }
+    stats["pages_released"] = incremental_vacuum(db_path)
+
+    print(f"🧹 Retention: {stats['jobs_archived']} jobs archived, "
+          f"{stats['ai_cache_expired']} AI cache entries + "
+          f"{stats['http_cache_expired']} cached pages + "
+          f"{stats['domains_expired']} domains + "
+          f"{stats['outbox_expired']} sent alerts expired, "
+          f"{stats['pages_released']} pages released")
+    return stats
+
+
+if __name__ == "__main__":
+    run_retention()
@@ -53,55 +53,64 @@ def extract_country(location_str):
     return "International"
 
 
+def board_company(slug):
+    """Company name stored for an ATS board slug ('scale-ai' → 'Scale Ai')."""
+    return slug.replace("-", " ").title()
+
+
 # ==========================================================
 # SOURCE 1: JOBSPY (LinkedIn / Indeed / Glassdoor)
 # ==========================================================
-def search_jobspy():
-    """Scrape LinkedIn, Indeed, Glassdoor using jobspy library."""
+def jobspy_queries():
+    """Every (location, search term) pair JobSpy runs."""
+    return [(location, term) for location in SEARCH_LOCATIONS for term in SEARCH_TERMS]
+
+
+def search_jobspy(queries=None):
+    """Scrape LinkedIn, Indeed, Glassdoor using jobspy library (all queries by default)."""
     jobs = []
 
-    for location in SEARCH_LOCATIONS:
-        for term in SEARCH_TERMS:
-            try:
-                df = scrape_jobs(
-                    site_name=["linkedin", "indeed", "glassdoor"],
-                    search_term=term,
-                    location=location,
-                    results_wanted=15,
-                    hours_old=72,
-                    linkedin_fetch_description=True,
-                )
-
-                if df.empty:
+    for location, term in (jobspy_queries() if queries is None else queries):
+        try:
+            df = scrape_jobs(
+                site_name=["linkedin", "indeed", "glassdoor"],
+                search_term=term,
+                location=location,
+                results_wanted=15,
+                hours_old=72,
+                linkedin_fetch_description=True,
+            )
+
+            if df.empty:
+                continue
+
+            count = 0
+            for _, row in df.iterrows():
+                url = str(row.get("job_url", ""))
+                if not url or url == "nan":
                     continue
+                date_posted = str(row.get("date_posted", ""))
+                if date_posted == "nan" or date_posted == "NaT":
+                    date_posted = ""
+                jobs.append({
+                    "job_title":    str(row.get("title", "")),
+                    "company":      str(row.get("company", "")),
+                    "location":     str(row.get("location", "")),
+                    "country":      location,
+                    "job_url":      url,
+                    "jd_content":   str(row.get("description", "")),
+                    "source":       str(row.get("site", "jobspy")),
+                    "date_posted":  date_posted,
+                })
+                count += 1
+
+            if count:
+                print(f"  ✅ {location} | '{term}': {count} jobs")
+
+        except Exception as e:
+            print(f"  ⚠️ {location} | '{term}': {e}")
 
-                count = 0
-                for _, row in df.iterrows():
-                    url = str(row.get("job_url", ""))
-                    if not url or url == "nan":
-                        continue
-                    date_posted = str(row.get("date_posted", ""))
-                    if date_posted == "nan" or date_posted == "NaT":
-                        date_posted = ""
-                    jobs.append({
-                        "job_title":    str(row.get("title", "")),
-                        "company":      str(row.get("company", "")),
-                        "location":     str(row.get("location", "")),
-                        "country":      location,
-                        "job_url":      url,
-                        "jd_content":   str(row.get("description", "")),
-                        "source":       str(row.get("site", "jobspy")),
-                        "date_posted":  date_posted,
-                    })
-                    count += 1
-
-                if count:
-                    print(f"  ✅ {location} | '{term}': {count} jobs")
-
-            except Exception as e:
-                print(f"  ⚠️ {location} | '{term}': {e}")
-
-            time.sleep(2)
+        time.sleep(2)
 
     return jobs
 
@@ -109,11 +118,11 @@ def search_jobspy():
 # ==========================================================
 # SOURCE 2: GREENHOUSE STARTUP BOARDS
 # ==========================================================
-def search_greenhouse():
-    """Scrape Greenhouse JSON API for each company board."""
+def search_greenhouse(companies=None):
+    """Scrape Greenhouse JSON API for each company board (default: all)."""
     jobs = []
 
-    for company in GREENHOUSE_COMPANIES:
+    for company in (GREENHOUSE_COMPANIES if companies is None else companies):
         try:
             url = f"https://boards-api.greenhouse.io/v1/boards/{company}/jobs?content=true"
             resp = requests.get(url, timeout=10)
@@ -150,7 +159,7 @@ def search_greenhouse():
 
                 jobs.append({
                     "job_title":    title,
-                    "company":      company.replace("-", " ").title(),
+                    "company":      board_company(company),
                     "location":     location,
                     "country":      extract_country(location),
                     "job_url":      job_url,
@@ -174,11 +183,11 @@ def search_greenhouse():
 # ==========================================================
 # SOURCE 3: LEVER STARTUP BOARDS
 # ==========================================================
-def search_lever():
-    """Scrape Lever JSON API for each company board."""
+def search_lever(companies=None):
+    """Scrape Lever JSON API for each company board (default: all)."""
     jobs = []
 
-    for company in LEVER_COMPANIES:
+    for company in (LEVER_COMPANIES if companies is None else companies):
         try:
             url = f"https://api.lever.co/v0/postings/{company}?mode=json"
             resp = requests.get(url, timeout=10)
@@ -209,7 +218,7 @@ def search_lever():
 
                 jobs.append({
                     "job_title":    title,
-                    "company":      company.replace("-", " ").title(),
+                    "company":      board_company(company),
                     "location":     location,
                     "country":      extract_country(location),
                     "job_url":      job_url,
@@ -231,31 +240,46 @@ def search_lever():
 
 
 # ==========================================================
-# MAIN AGGREGATOR
+# SOURCE REGISTRY
 # ==========================================================
-def search_jobs():
-    """Aggregate all sources, deduplicate by URL."""
-    print("\n🔎 Aggressive scraping started...\n")
+# name → (banner, search function). main.py schedules each one on its own
+# interval (SOURCE_INTERVALS); search_jobs() runs them all in order.
+# Sources listed in BOARDS poll many company boards, and can be asked to
+# poll only some of them (modules/cadence.py picks which). JobSpy likewise
+# takes a subset of jobspy_queries() — sharded mode splits both.
+SOURCES = {
+    "jobspy":     ("📡 JobSpy (LinkedIn / Indeed / Glassdoor)", search_jobspy),
+    "greenhouse": ("🌱 Greenhouse startup boards", search_greenhouse),
+    "lever":      ("🔧 Lever startup boards", search_lever),
+}
 
-    all_jobs = []
+BOARDS = {
+    "greenhouse": GREENHOUSE_COMPANIES,
+    "lever":      LEVER_COMPANIES,
+}
 
-    print("📡 Source 1: JobSpy (LinkedIn / Indeed / Glassdoor)")
-    try:
-        all_jobs.extend(search_jobspy())
-    except Exception as e:
-        print(f"  ❌ JobSpy failed: {e}")
 
-    print("\n🌱 Source 2: Greenhouse startup boards")
+def search_source(name, boards=None):
+    """Run one source (optionally only some of its boards). Errors are reported, not raised."""
+    banner, search = SOURCES[name]
+    print(f"\n{banner}")
     try:
-        all_jobs.extend(search_greenhouse())
+        return search(boards) if boards is not None else search()
     except Exception as e:
-        print(f"  ❌ Greenhouse failed: {e}")
+        print(f"  ❌ {name} failed: {e}")
+        return []
 
-    print("\n🔧 Source 3: Lever startup boards")
-    try:
-        all_jobs.extend(search_lever())
-    except Exception as e:
-        print(f"  ❌ Lever failed: {e}")
+
+# ==========================================================
+# MAIN AGGREGATOR
+# ==========================================================
+def search_jobs():
+    """Aggregate all sources, deduplicate by URL."""
+    print("\n🔎 Aggressive scraping started...")
+
+    all_jobs = []
+    for name in SOURCES:
+        all_jobs.extend(search_source(name))
 
     # Deduplicate by URL
     seen = set()
@@ -0,0 +1,126 @@
+# modules/search.py
+"""
+Full-text search over stored jobs.
+Queries the jobs_fts FTS5 index (see migration 3) with bm25 ranking,
+highlighted snippets, and optional date / status filters, through the
+storage layer's "search_jobs" statement (weights in SEARCH_BM25_WEIGHTS).
+
+CLI:
+    python modules/search.py "python intern" --since 2026-01-01 --status discovered
+"""
+
+import re
+import argparse
+from datetime import datetime, timedelta
+
+import sys, os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import DB_PATH
+from modules.storage import init_storage
+
+DEFAULT_LIMIT = 20
+
+TOKEN_RE = re.compile(r"\w+\*?", re.UNICODE)
+
+
+# ── Helpers ───────────────────────────────────────────────────────────────────
+
+def to_fts_query(text: str) -> str:
+    """
+    Turn free text into a safe FTS5 query.
+    Every word is quoted (so punctuation can't break the MATCH syntax) and
+    the words are AND-ed. A trailing * keeps prefix search: "devel*".
+    """
+    terms = []
+    for token in TOKEN_RE.findall(text or ""):
+        if token.endswith("*"):
+            terms.append(f'"{token[:-1]}"*')
+        else:
+            terms.append(f'"{token}"')
+    return " ".join(terms)
+
+
+def to_epoch(value, end_of_day: bool = False) -> int | None:
+    """Accept a datetime, epoch int, or 'YYYY-MM-DD[ HH:MM:SS]' string."""
+    if value is None or value == "":
+        return None
+    if isinstance(value, (int, float)):
+        return int(value)
+    if isinstance(value, str):
+        fmt = "%Y-%m-%d %H:%M:%S" if " " in value else "%Y-%m-%d"
+        parsed = datetime.strptime(value, fmt)
+        if end_of_day and fmt == "%Y-%m-%d":
+            parsed += timedelta(days=1)
+        value = parsed
+    return int(value.timestamp())
+
+
+# ── Query API ─────────────────────────────────────────────────────────────────
+
+def search_stored_jobs(query: str, since=None, until=None, status: str = None,
+                       limit: int = DEFAULT_LIMIT, raw: bool = False,
+                       db_path: str = DB_PATH) -> list[dict]:
+    """
+    Search stored jobs by relevance.
+
+    query  — free text (or a raw FTS5 expression when raw=True)
+    since  — only jobs found at or after this date/time
+    until  — only jobs found before this date/time (a bare date is inclusive)
+    status — exact jobs.status match, e.g. 'discovered'
+
+    Returns dicts ordered best-first, each with 'rank' (bm25, lower is
+    better) and 'snippet' (JD excerpt with [matches] highlighted).
+    """
+    match = query if raw else to_fts_query(query)
+    if not match:
+        return []
+
+    since_ts = to_epoch(since)
+    until_ts = to_epoch(until, end_of_day=True)
+    status = status or None
+    cur = init_storage(db_path).execute("search_jobs", (
+        match, since_ts, since_ts, until_ts, until_ts, status, status, int(limit),
+    ))
+    columns = [col[0] for col in cur.description]
+    return [dict(zip(columns, row)) for row in cur.fetchall()]
+
+
+def rebuild_index(db_path: str = DB_PATH):
+    """Re-index every stored job (only needed after manual bulk edits)."""
+    init_storage(db_path).execute("fts_rebuild")
+
+
+# ── CLI ───────────────────────────────────────────────────────────────────────
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Search stored jobs.")
+    parser.add_argument("query", help="search text, e.g. 'python intern'")
+    parser.add_argument("--since", help="YYYY-MM-DD — found on/after this day")
+    parser.add_argument("--until", help="YYYY-MM-DD — found on/before this day")
+    parser.add_argument("--status", help="filter on jobs.status")
+    parser.add_argument("--limit", type=int, default=DEFAULT_LIMIT)
+    parser.add_argument("--raw", action="store_true",
+                        help="pass the query to FTS5 unmodified (OR, NEAR, column:term)")
+    parser.add_argument("--db", default=DB_PATH)
+    args = parser.parse_args(argv)
+
+    started = datetime.now()
+    results = search_stored_jobs(
+        args.query, since=args.since, until=args.until, status=args.status,
+        limit=args.limit, raw=args.raw, db_path=args.db,
+    )
+    elapsed_ms = (datetime.now() - started).total_seconds() * 1000
+
+    for r in results:
+        print(f"\n💼 {r['job_title']} — {r['company']} ({r['country']})")
+        print(f"   📅 {r['date_found']}  🏷 {r['status']}  ⭐ {-r['rank']:.2f}")
+        print(f"   🔗 {r['job_url']}")
+        if r["snippet"]:
+            print(f"   📝 {r['snippet']}")
+
+    print(f"\n🔎 {len(results)} result(s) in {elapsed_ms:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
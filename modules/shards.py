@@ -0,0 +1,272 @@
+# modules/shards.py
+"""
+Sharded scanning across worker processes and machines.
+Each source's work — JobSpy (location, term) queries, ATS company boards —
+is split into SHARD_COUNTS[source] shards by a stable hash (Greenhouse and
+Lever as one deduped board list each, scraper and adapter boards together), and every shard
+is a lease row in scan_leases. Workers sharing one jobs.db claim a due shard,
+heartbeat while scanning it and mark it complete; it is due again interval_s
+after it last completed.
+
+A worker that dies stops heartbeating. Once its lease expires
+(SHARD_LEASE_SECONDS) another worker reclaims the shard and scans it again.
+Leases keep two workers from fetching the same shard at once; duplicate jobs
+and alerts are ruled out anyway by the unique job_url in jobs and
+notification_outbox.
+
+Singleton roles (the outbox dispatcher and maintenance jobs) use the same
+table with an empty source: only the worker holding the lease runs them.
+Lease expiry compares wall clocks, so machines must keep them in sync
+(NTP) to well within SHARD_LEASE_SECONDS.
+"""
+
+import time
+import uuid
+import zlib
+import socket
+import logging
+import threading
+
+import sys, os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import (
+    SHARD_COUNTS,
+    SHARD_LEASE_SECONDS,
+    SHARD_HEARTBEAT_SECONDS,
+    SHARD_POLL_SECONDS,
+    SOURCE_INTERVALS,
+    PIPELINE_INTERVAL_MINUTES,
+)
+from modules.storage import init_storage, get_storage
+from modules.scraper import jobspy_queries, SOURCES, BOARDS
+from modules.checkpoints import item_key
+
+log = logging.getLogger(__name__)
+
+
+def worker_id() -> str:
+    """Unique owner name for this process, e.g. 'scan-host-2:4711:9f2c1a'."""
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+
+
+# ── Splitting Work ────────────────────────────────────────────────────────────
+
+def work_items(source: str) -> list:
+    """Everything one full scan of a source covers (queries or board slugs)."""
+    if source == "jobspy":
+        return jobspy_queries()
+    if source in BOARDS:
+        return list(BOARDS[source])
+    from modules.pipeline import ats_boards
+    return list(ats_boards().get(source, []))
+
+
+def fetch_items(source: str, items: list) -> list:
+    """Jobs for some of a source's queries / boards."""
+    if source in SOURCES:
+        return SOURCES[source][1](items)
+    from modules.pipeline import ats_sources
+    return ats_sources()[source](items)
+
+
+def shard_of(item, count: int) -> int:
+    """Stable shard number for an item — the same on every machine and run."""
+    return zlib.crc32(item_key(item).encode("utf-8")) % count
+
+
+def shard_work(source: str) -> list:
+    """
+    Everything the shards of a source cover. A scraper board source
+    ('greenhouse') is sharded as its platform's whole deduped board list:
+    its own boards plus the matching adapter's ('ats:greenhouse').
+    """
+    if source in BOARDS:
+        from modules.pipeline import board_registry
+        registry = board_registry()
+        return registry[source] + registry.get(f"ats:{source}", [])
+    return work_items(source)
+
+
+def fetch_shard(source: str, items: list) -> list:
+    """fetch_items for a shard, each board going to the source that owns it."""
+    if source not in BOARDS:
+        return fetch_items(source, items)
+    from modules.pipeline import board_registry
+    own = set(board_registry()[source])
+    jobs = []
+    for owner, boards in ((source, [i for i in items if i in own]),
+                          (f"ats:{source}", [i for i in items if i not in own])):
+        if boards:
+            jobs.extend(fetch_items(owner, boards))
+    return jobs
+
+
+def shard_items(source: str, index: int, count: int) -> list:
+    return [item for item in shard_work(source) if shard_of(item, count) == index]
+
+
+def shard_name(source: str, index: int, count: int) -> str:
+    return f"{source}:{index}/{count}"
+
+
+def source_interval(source: str) -> int:
+    """Seconds between scans of each shard of a source."""
+    return int(SOURCE_INTERVALS.get(source, PIPELINE_INTERVAL_MINUTES) * 60)
+
+
+def define_shards(counts: dict = SHARD_COUNTS, now: float = None):
+    """
+    Create the lease rows for every configured shard (idempotent).
+    Changing a source's shard count drops its old rows once they are idle.
+    """
+    storage = get_storage()
+    now = int(now or time.time())
+    with storage.transaction():
+        for source, count in counts.items():
+            storage.execute("lease_prune", (source, count, now))
+            for index in range(count):
+                storage.execute("lease_define", (shard_name(source, index, count), source,
+                                                 index, count, source_interval(source)))
+
+
+def define_role(name: str):
+    get_storage().execute("lease_define", (name, "", 0, 1, 0))
+
+
+# ── Leases ────────────────────────────────────────────────────────────────────
+
+class Lease:
+    """
+    One claimed scan_leases row. While held, a heartbeat thread renews it
+    every heartbeat_seconds; if a renewal finds the row taken over (our lease
+    expired and someone reclaimed it), `lost` is set.
+    """
+
+    def __init__(self, name: str, owner: str,
+                 ttl: float = SHARD_LEASE_SECONDS,
+                 heartbeat_seconds: float = SHARD_HEARTBEAT_SECONDS):
+        self.name = name
+        self.owner = owner
+        self.ttl = ttl
+        self.heartbeat_seconds = heartbeat_seconds
+        self.lost = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def acquire(self, now: float = None) -> bool:
+        now = int(now or time.time())
+        claimed = get_storage().execute("lease_claim", (
+            self.owner, now + int(self.ttl), now, now, self.name, now,
+        )).rowcount
+        if claimed:
+            self.lost.clear()
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._beat, daemon=True,
+                                            name=f"lease-{self.name}")
+            self._thread.start()
+        return bool(claimed)
+
+    def _beat(self):
+        while not self._stop.wait(self.heartbeat_seconds):
+            now = int(time.time())
+            try:
+                renewed = get_storage().execute(
+                    "lease_renew", (now + int(self.ttl), now, self.name, self.owner)
+                ).rowcount
+            except Exception as e:
+                log.warning(f"Lease {self.name}: heartbeat failed: {e}")
+                continue
+            if not renewed:
+                log.warning(f"Lease {self.name}: lost to another worker")
+                self.lost.set()
+                return
+
+    def release(self, completed: bool = False):
+        """Stop heartbeating and free the row (recording a completed run if asked)."""
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+        if completed:
+            get_storage().execute("lease_complete", (int(time.time()), self.name, self.owner))
+        else:
+            get_storage().execute("lease_release", (self.name, self.owner))
+
+
+# ── Worker ────────────────────────────────────────────────────────────────────
+
+class ShardWorker:
+    """
+    Claims due shards one at a time and scans them with
+    scan(source, items, label). Several run side by side, in any number of
+    processes on any number of machines.
+    """
+
+    def __init__(self, scan, counts: dict = SHARD_COUNTS, owner: str = None,
+                 poll_seconds: float = SHARD_POLL_SECONDS):
+        self.scan = scan
+        self.counts = counts
+        self.owner = owner or worker_id()
+        self.poll_seconds = poll_seconds
+        self.stats = {"scanned": 0, "reclaimed": 0, "lost": 0, "errors": 0}
+
+    def claim_next(self, now: float = None) -> tuple | None:
+        """(lease, source, index, count) for the most overdue free shard, or None."""
+        storage = get_storage()
+        now = int(now or time.time())
+        due = []
+        for source in self.counts:
+            due.extend(storage.fetchall("lease_due", (source, now, now)))
+
+        for name, source, index, count, previous, _ in sorted(due, key=lambda r: r[5]):
+            lease = Lease(name, self.owner)
+            if lease.acquire(now):
+                if previous:
+                    self.stats["reclaimed"] += 1
+                    log.info(f"🔁 {name}: reclaimed from {previous} (lease expired)")
+                return lease, source, index, count
+        return None
+
+    def run_once(self) -> bool:
+        """Scan one due shard. Returns False when nothing was due."""
+        claimed = self.claim_next()
+        if not claimed:
+            return False
+        lease, source, index, count = claimed
+        try:
+            self.scan(source, shard_items(source, index, count), lease.name)
+        except Exception as e:
+            # Count it as a run anyway so a broken shard waits its interval
+            # instead of being retried on every poll
+            self.stats["errors"] += 1
+            log.warning(f"Shard {lease.name} failed: {e}")
+        if lease.lost.is_set():
+            self.stats["lost"] += 1
+        else:
+            self.stats["scanned"] += 1
+        lease.release(completed=not lease.lost.is_set())
+        return True
+
+    def run(self, stop: threading.Event):
+        define_shards(self.counts)
+        while not stop.is_set():
+            if not self.run_once():
+                stop.wait(self.poll_seconds)
+
+
+def lease_status() -> list[dict]:
+    keys = ("name", "owner", "expires_ts", "heartbeat_ts", "completed_ts", "runs", "reclaims")
+    return [dict(zip(keys, row)) for row in get_storage().fetchall("lease_status")]
+
+
+if __name__ == "__main__":
+    init_storage()
+    now = time.time()
+    for row in lease_status():
+        owner = row["owner"] or "—"
+        if row["owner"] and row["expires_ts"] < now:
+            owner += " (expired)"
+        last = (time.strftime("%m-%d %H:%M", time.localtime(row["completed_ts"]))
+                if row["completed_ts"] else "never")
+        print(f"  {row['name']:<22} last {last:<12} runs {row['runs']:>4} "
+              f"reclaims {row['reclaims']:>3}  {owner}")
@@ -0,0 +1,475 @@
+# modules/storage.py
+"""
+Single storage layer for jobs.db.
+Owns the SQLite connections (one per thread), the named SQL statements for
+every table, schema setup (via migrations) and transactions, and keeps
+per-statement timing stats.
+
+Nothing touches the database at import time — call init_storage() once at
+startup (tracker.init_db() does this) before using any of the table modules.
+"""
+
+import time
+import sqlite3
+import logging
+import threading
+from datetime import datetime
+from contextlib import contextmanager
+
+import sys, os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import DB_PATH
+from modules.migrations import migrate
+
+log = logging.getLogger(__name__)
+
+# ── Statements ────────────────────────────────────────────────────────────────
+# Every query the app runs, by name. sqlite3 keeps a prepared-statement cache
+# per connection keyed on the SQL text, so each of these is compiled once per
+# thread and reused afterwards.
+
+_INSERT_JOB = """
+    INSERT {conflict}INTO jobs (
+        job_title, company, country, job_url,
+        visa_sponsorship, hr_score, status,
+        resume_version, skills_emphasized,
+        date_found, found_ts, jd_content, notes, source
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# Excel export columns, in sheet order (modules/exporter.py adds the headers)
+EXPORT_COLUMNS = (
+    "job_title", "company", "country", "visa_sponsorship", "hr_score", "status",
+    "resume_version", "skills_emphasized", "date_found", "date_applied", "job_url",
+)
+
+# Incremental export columns (modules/incremental_export.py); jd_content is opt-in
+EXPORT_CHUNK_COLUMNS = (
+    "id", "job_title", "company", "country", "job_url", "visa_sponsorship",
+    "hr_score", "status", "date_found", "found_ts", "date_applied", "notes",
+)
+_EXPORT_CHUNK = "SELECT {columns} FROM jobs WHERE id > ? ORDER BY id LIMIT ?"
+
+# Full-text search: bm25 weights for job_title, company, country, jd_content,
+# and the JD snippet length in tokens
+SEARCH_BM25_WEIGHTS = (10.0, 5.0, 2.0, 1.0)
+SEARCH_SNIPPET_TOKENS = 16
+
+STATEMENTS = {
+    # jobs
+    "job_exists": "SELECT 1 FROM jobs WHERE job_url = ?",
+    "insert_job": _INSERT_JOB.format(conflict=""),
+    "insert_job_or_ignore": _INSERT_JOB.format(conflict="OR IGNORE "),
+    "board_arrivals": """
+        SELECT company, COUNT(*) FROM jobs
+        WHERE source = ? AND found_ts >= ?
+        GROUP BY company
+    """,
+    "search_jobs": f"""
+        SELECT j.id, j.job_title, j.company, j.country, j.status,
+               j.date_found, j.job_url,
+               bm25(jobs_fts, {", ".join(map(str, SEARCH_BM25_WEIGHTS))}) AS rank,
+               snippet(jobs_fts, 3, '[', ']', '…', {SEARCH_SNIPPET_TOKENS}) AS snippet
+        FROM jobs_fts
+        JOIN jobs j ON j.id = jobs_fts.rowid
+        WHERE jobs_fts MATCH ?
+          AND (? IS NULL OR j.found_ts >= ?)
+          AND (? IS NULL OR j.found_ts < ?)
+          AND (? IS NULL OR j.status = ?)
+        ORDER BY rank
+        LIMIT ?
+    """,
+    "fts_rebuild": "INSERT INTO jobs_fts(jobs_fts) VALUES ('rebuild')",
+    "fts_optimize": "INSERT INTO jobs_fts(jobs_fts) VALUES ('optimize')",
+    "export_widths": f"""
+        SELECT {", ".join(f"MAX(LENGTH({c}))" for c in EXPORT_COLUMNS)}
+        FROM jobs WHERE found_ts >= ? AND found_ts < ?
+    """,
+    "export_range": f"""
+        SELECT {", ".join(EXPORT_COLUMNS)} FROM jobs
+        WHERE found_ts >= ? AND found_ts < ?
+        ORDER BY found_ts DESC
+    """,
+    "export_chunk": _EXPORT_CHUNK.format(columns=", ".join(EXPORT_CHUNK_COLUMNS)),
+    "export_chunk_jd": _EXPORT_CHUNK.format(
+        columns=", ".join(EXPORT_CHUNK_COLUMNS + ("jd_content",))),
+    "archive_stamp_undated": "UPDATE jobs SET found_ts = ? WHERE found_ts IS NULL",
+    "archive_batch": "SELECT * FROM jobs WHERE found_ts < ? ORDER BY id LIMIT ?",
+    "archive_delete": "DELETE FROM jobs WHERE id = ?",
+
+    # export_watermarks
+    "watermark_get": """
+        SELECT target, format, last_id, last_found_ts, rows_exported, files, updated_ts
+        FROM export_watermarks WHERE target = ?
+    """,
+    "watermark_advance": """
+        INSERT INTO export_watermarks
+            (target, format, last_id, last_found_ts, rows_exported, files, updated_ts)
+        VALUES (?, ?, ?, ?, ?, 1, ?)
+        ON CONFLICT(target) DO UPDATE SET
+            last_id = excluded.last_id,
+            last_found_ts = excluded.last_found_ts,
+            rows_exported = rows_exported + excluded.rows_exported,
+            files = files + 1,
+            updated_ts = excluded.updated_ts
+    """,
+    "watermark_reset": "DELETE FROM export_watermarks WHERE target = ?",
+
+    # discovered_domains
+    "domain_exists": "SELECT 1 FROM discovered_domains WHERE domain = ?",
+    "insert_domain": """
+        INSERT OR IGNORE INTO discovered_domains
+        (domain, company_name, career_url, source_query, is_ats, discovered_ts)
+        VALUES (?, ?, ?, ?, ?, ?)
+    """,
+    "mark_crawled": """
+        UPDATE discovered_domains
+        SET last_crawled = ?, crawled_ts = ?, job_count = COALESCE(?, job_count)
+        WHERE domain = ?
+    """,
+    "domains_expire": """
+        DELETE FROM discovered_domains
+        WHERE discovered_ts < ? AND crawled_ts IS NOT NULL AND job_count = 0
+    """,
+
+    # ai_validation_cache
+    "ai_cache_get": """
+        SELECT decision, confidence, reason FROM ai_validation_cache
+        WHERE job_hash = ?
+    """,
+    "ai_cache_put": """
+        INSERT OR REPLACE INTO ai_validation_cache
+        (job_hash, decision, confidence, reason, validated_ts)
+        VALUES (?, ?, ?, ?, ?)
+    """,
+    "ai_cache_expire": "DELETE FROM ai_validation_cache WHERE validated_ts < ?",
+
+    # notification_outbox
+    "outbox_enqueue": """
+        INSERT OR IGNORE INTO notification_outbox
+        (job_id, job_url, payload, score, status, next_attempt_ts, created_ts)
+        VALUES (?, ?, ?, ?, 'pending', ?, ?)
+    """,
+    "outbox_due": """
+        SELECT id, payload, attempts, score, created_ts FROM notification_outbox
+        WHERE status = 'pending' AND next_attempt_ts <= ?
+        ORDER BY id
+        LIMIT ?
+    """,
+    "outbox_claim": """
+        UPDATE notification_outbox SET status = 'sending'
+        WHERE id = ? AND status = 'pending'
+    """,
+    "outbox_delivered": """
+        UPDATE notification_outbox
+        SET status = 'delivered', message_id = ?, delivered_ts = ?, last_error = NULL
+        WHERE id = ?
+    """,
+    "outbox_retry": """
+        UPDATE notification_outbox
+        SET status = ?, attempts = attempts + 1, next_attempt_ts = ?, last_error = ?
+        WHERE id = ?
+    """,
+    "outbox_recover": """
+        UPDATE notification_outbox SET status = 'pending' WHERE status = 'sending'
+    """,
+    "outbox_pending_count": """
+        SELECT COUNT(*) FROM notification_outbox WHERE status IN ('pending', 'sending')
+    """,
+    "outbox_expire": """
+        DELETE FROM notification_outbox
+        WHERE status IN ('delivered', 'failed') AND created_ts < ?
+    """,
+
+    # scan_leases
+    "lease_define": """
+        INSERT INTO scan_leases (name, source, shard_index, shard_count, interval_s)
+        VALUES (?, ?, ?, ?, ?)
+        ON CONFLICT(name) DO UPDATE SET interval_s = excluded.interval_s
+    """,
+    "lease_prune": """
+        DELETE FROM scan_leases
+        WHERE source = ? AND shard_count != ? AND (owner IS NULL OR expires_ts < ?)
+    """,
+    "lease_due": """
+        SELECT name, source, shard_index, shard_count, owner,
+               completed_ts + interval_s AS due_ts
+        FROM scan_leases
+        WHERE source = ?
+          AND completed_ts + interval_s <= ?
+          AND (owner IS NULL OR expires_ts < ?)
+        ORDER BY completed_ts + interval_s
+    """,
+    "lease_claim": """
+        UPDATE scan_leases
+        SET owner = ?, expires_ts = ?, heartbeat_ts = ?, claimed_ts = ?,
+            reclaims = reclaims + (owner IS NOT NULL)
+        WHERE name = ? AND (owner IS NULL OR expires_ts < ?)
+    """,
+    "lease_renew": """
+        UPDATE scan_leases SET expires_ts = ?, heartbeat_ts = ?
+        WHERE name = ? AND owner = ?
+    """,
+    "lease_release": """
+        UPDATE scan_leases SET owner = NULL, expires_ts = NULL
+        WHERE name = ? AND owner = ?
+    """,
+    "lease_complete": """
+        UPDATE scan_leases
+        SET owner = NULL, expires_ts = NULL, completed_ts = ?, runs = runs + 1
+        WHERE name = ? AND owner = ?
+    """,
+    "checkpoint_load": """
+        SELECT stage, source, item FROM scan_checkpoints WHERE scan = ?
+    """,
+    "checkpoint_put": """
+        INSERT OR REPLACE INTO scan_checkpoints (scan, stage, source, item, jobs, done_ts)
+        VALUES (?, ?, ?, ?, ?, ?)
+    """,
+    "checkpoint_clear": "DELETE FROM scan_checkpoints WHERE scan = ?",
+    "checkpoint_expire": "DELETE FROM scan_checkpoints WHERE done_ts < ?",
+
+    # http_cache
+    "http_cache_get": """
+        SELECT etag, last_modified, body_hash, payload FROM http_cache WHERE url = ?
+    """,
+    "http_cache_put": """
+        INSERT OR REPLACE INTO http_cache
+        (url, etag, last_modified, body_hash, payload, fetched_ts, validated_ts)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+    """,
+    "http_cache_touch": "UPDATE http_cache SET validated_ts = ? WHERE url = ?",
+    "http_cache_expire": "DELETE FROM http_cache WHERE validated_ts < ?",
+
+    # crawl_frontier
+    "frontier_candidates": """
+        SELECT domain, job_count, discovered_ts, crawled_ts FROM discovered_domains d
+        WHERE (crawled_ts IS NULL OR crawled_ts < ?)
+          AND NOT EXISTS (SELECT 1 FROM crawl_frontier f WHERE f.domain = d.domain)
+    """,
+    "frontier_add": """
+        INSERT OR IGNORE INTO crawl_frontier (domain, priority, state, due_ts, added_ts)
+        VALUES (?, ?, 'queued', ?, ?)
+    """,
+    "frontier_next": """
+        SELECT f.domain, f.attempts, d.crawled_ts
+        FROM crawl_frontier f LEFT JOIN discovered_domains d ON d.domain = f.domain
+        WHERE f.state = 'queued' AND f.due_ts <= ?
+        ORDER BY f.priority DESC
+        LIMIT ?
+    """,
+    "frontier_claim": """
+        UPDATE crawl_frontier SET state = 'active', owner = ?, leased_ts = ?
+        WHERE domain = ? AND state = 'queued'
+    """,
+    "frontier_crawled": """
+        UPDATE crawl_frontier SET state = 'crawled', leased_ts = ?
+        WHERE domain = ? AND owner = ?
+    """,
+    "frontier_retry": """
+        UPDATE crawl_frontier
+        SET state = 'queued', owner = NULL, attempts = attempts + 1, due_ts = ?, last_error = ?
+        WHERE domain = ?
+    """,
+    "frontier_release": """
+        UPDATE crawl_frontier SET state = 'queued', owner = NULL
+        WHERE domain = ? AND owner = ? AND state = 'active'
+    """,
+    "frontier_recover": """
+        UPDATE crawl_frontier SET state = 'queued', owner = NULL
+        WHERE state = 'active' AND leased_ts < ?
+    """,
+    "frontier_stale_crawled": """
+        SELECT domain, owner, leased_ts FROM crawl_frontier
+        WHERE state = 'crawled' AND leased_ts < ?
+    """,
+    "frontier_done": "DELETE FROM crawl_frontier WHERE domain = ?",
+    "frontier_status": """
+        SELECT state, COUNT(*), MAX(priority) FROM crawl_frontier GROUP BY state
+    """,
+
+    # board_polls
+    "board_polls_load": "SELECT board, polled_ts FROM board_polls WHERE source = ?",
+    "board_poll_put": """
+        INSERT INTO board_polls (source, board, polled_ts) VALUES (?, ?, ?)
+        ON CONFLICT(source, board) DO UPDATE
+        SET polled_ts = MAX(polled_ts, excluded.polled_ts)
+    """,
+
+    "lease_status": """
+        SELECT name, owner, expires_ts, heartbeat_ts, completed_ts, runs, reclaims
+        FROM scan_leases ORDER BY source, shard_index, name
+    """,
+}
+
+CACHED_STATEMENTS = 256
+BUSY_TIMEOUT_MS = 5000
+
+
+def job_row(job_data: dict, now: datetime = None) -> tuple:
+    """Parameters for insert_job / insert_job_or_ignore."""
+    now = now or datetime.now()
+    return (
+        job_data.get("job_title"),
+        job_data.get("company"),
+        job_data.get("country"),
+        job_data.get("job_url"),
+        job_data.get("visa_sponsorship", "unknown"),
+        job_data.get("hr_score", 0),
+        job_data.get("status", "discovered"),
+        job_data.get("resume_version", ""),
+        job_data.get("skills_emphasized", ""),
+        now.strftime("%Y-%m-%d %H:%M:%S"),
+        int(now.timestamp()),
+        job_data.get("jd_content", ""),
+        job_data.get("notes", ""),
+        job_data.get("source"),
+    )
+
+
+# ── Storage ───────────────────────────────────────────────────────────────────
+
+class Storage:
+    """Thread-aware access to jobs.db through named statements."""
+
+    def __init__(self, db_path: str = DB_PATH):
+        self.db_path = db_path
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections = []
+        self._stats = {}
+
+    # ── Connections ───────────────────────────────────────────────────────────
+
+    def connection(self) -> sqlite3.Connection:
+        """The calling thread's connection (opened on first use)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # Autocommit; transaction() issues BEGIN/COMMIT explicitly
+            conn = sqlite3.connect(self.db_path, isolation_level=None,
+                                   cached_statements=CACHED_STATEMENTS,
+                                   check_same_thread=False)
+            conn.execute(f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}")
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = NORMAL")
+            self._local.conn = conn
+            self._local.depth = 0
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    def close(self):
+        """Close every connection opened through this storage."""
+        with self._lock:
+            for conn in self._connections:
+                try:
+                    conn.close()
+                except Exception:
+                    pass
+            self._connections.clear()
+        self._local = threading.local()
+
+    # ── Transactions ──────────────────────────────────────────────────────────
+
+    @contextmanager
+    def transaction(self):
+        """
+        BEGIN IMMEDIATE … COMMIT on this thread's connection.
+        Nested use joins the outer transaction.
+        """
+        conn = self.connection()
+        if self._local.depth:
+            self._local.depth += 1
+            try:
+                yield conn
+            finally:
+                self._local.depth -= 1
+            return
+
+        conn.execute("BEGIN IMMEDIATE")
+        self._local.depth = 1
+        try:
+            yield conn
+            conn.execute("COMMIT")
+        except BaseException:
+            # Also reached when COMMIT itself fails (e.g. SQLITE_BUSY), which
+            # would otherwise leave the connection inside the transaction
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        finally:
+            self._local.depth = 0
+
+    # ── Statements ────────────────────────────────────────────────────────────
+
+    def _timed(self, name: str, run):
+        started = time.perf_counter()
+        try:
+            return run()
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                s = self._stats.setdefault(name, [0, 0.0, 0.0])
+                s[0] += 1
+                s[1] += elapsed
+                s[2] = max(s[2], elapsed)
+
+    def execute(self, name: str, params=()) -> sqlite3.Cursor:
+        sql = STATEMENTS[name]
+        return self._timed(name, lambda: self.connection().execute(sql, params))
+
+    def executemany(self, name: str, seq) -> sqlite3.Cursor:
+        sql = STATEMENTS[name]
+        return self._timed(name, lambda: self.connection().executemany(sql, seq))
+
+    def fetchone(self, name: str, params=()):
+        return self._timed(name, lambda: self.connection().execute(
+            STATEMENTS[name], params).fetchone())
+
+    def fetchall(self, name: str, params=()) -> list:
+        return self._timed(name, lambda: self.connection().execute(
+            STATEMENTS[name], params).fetchall())
+
+    # ── Stats ─────────────────────────────────────────────────────────────────
+
+    def timings(self) -> list[dict]:
+        """Per-statement call count and latency, slowest total first."""
+        with self._lock:
+            rows = [
+                {"statement": name, "calls": calls,
+                 "total_ms": total * 1000, "avg_ms": total * 1000 / calls,
+                 "max_ms": worst * 1000}
+                for name, (calls, total, worst) in self._stats.items()
+            ]
+        return sorted(rows, key=lambda r: r["total_ms"], reverse=True)
+
+    def reset_timings(self):
+        with self._lock:
+            self._stats.clear()
+
+
+# ── Module-level handle ───────────────────────────────────────────────────────
+
+_storage = None
+_init_lock = threading.Lock()
+
+
+def init_storage(db_path: str = DB_PATH) -> Storage:
+    """Migrate the schema and install the process-wide Storage."""
+    global _storage
+    with _init_lock:
+        if _storage is not None and _storage.db_path == db_path:
+            return _storage
+        migrate(db_path)
+        if _storage is not None:
+            _storage.close()
+        _storage = Storage(db_path)
+        return _storage
+
+
+def get_storage() -> Storage:
+    """The Storage installed by init_storage()."""
+    if _storage is None:
+        raise RuntimeError("Storage not initialized — call init_storage() first")
+    return _storage
@@ -6,71 +6,50 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 import sqlite3
 from datetime import datetime
 from config import DB_PATH
+from modules.storage import init_storage, get_storage, job_row
 
 def init_db():
-    conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
-    c.execute('''
-        CREATE TABLE IF NOT EXISTS jobs (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            job_title TEXT,
-            company TEXT,
-            country TEXT,
-            job_url TEXT UNIQUE,
-            visa_sponsorship TEXT,
-            hr_score REAL,
-            status TEXT DEFAULT 'discovered',
-            resume_version TEXT,
-            skills_emphasized TEXT,
-            date_found TEXT,
-            date_applied TEXT,
-            jd_content TEXT,
-            notes TEXT
-        )
-    ''')
-    conn.commit()
-    conn.close()
+    init_storage(DB_PATH)
     print("✅ Database initialized!")
 
 def job_exists(job_url):
-    conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
-    c.execute("SELECT id FROM jobs WHERE job_url = ?", (job_url,))
-    result = c.fetchone()
-    conn.close()
-    return result is not None
+    return get_storage().fetchone("job_exists", (job_url,)) is not None
 
-def save_job(job_data):
-    conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
+def save_job(job_data, alert=False):
+    """Insert one job; with alert=True its outbox alert is queued in the same transaction."""
+    storage = get_storage()
     try:
-        c.execute('''
-            INSERT INTO jobs (
-                job_title, company, country, job_url,
-                visa_sponsorship, hr_score, status,
-                resume_version, skills_emphasized,
-                date_found, jd_content, notes
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            job_data.get('job_title'),
-            job_data.get('company'),
-            job_data.get('country'),
-            job_data.get('job_url'),
-            job_data.get('visa_sponsorship', 'unknown'),
-            job_data.get('hr_score', 0),
-            job_data.get('status', 'discovered'),
-            job_data.get('resume_version', ''),
-            job_data.get('skills_emphasized', ''),
-            datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-            job_data.get('jd_content', ''),
-            job_data.get('notes', '')
-        ))
-        conn.commit()
-        return c.lastrowid
+        with storage.transaction():
+            job_id = storage.execute("insert_job", job_row(job_data)).lastrowid
+            if alert:
+                from modules.outbox import enqueue_alert
+                enqueue_alert(job_data, job_id)
+        return job_id
     except sqlite3.IntegrityError:
         return None
-    finally:
-        conn.close()
+
+def insert_jobs(jobs, alerts=False):
+    """
+    Insert a batch in one transaction. Returns, for each job, True if it was
+    inserted and False if it was a duplicate (skipped). With alerts=True every
+    newly inserted job also gets an outbox alert, committed atomically with
+    the job itself.
+    """
+    from modules.outbox import enqueue_alert
+    storage = get_storage()
+    now = datetime.now()
+    inserted = []
+    with storage.transaction():
+        for job in jobs:
+            cur = storage.execute("insert_job_or_ignore", job_row(job, now))
+            if cur.rowcount and alerts:
+                enqueue_alert(job, cur.lastrowid, now.timestamp())
+            inserted.append(bool(cur.rowcount))
+    return inserted
+
+def save_jobs(jobs, alerts=False):
+    """Insert a batch in one transaction (see insert_jobs); returns rows inserted."""
+    return sum(insert_jobs(jobs, alerts))
 
 if __name__ == "__main__":
-    init_db()
\ No newline at end of file
+    init_db()
@@ -0,0 +1,213 @@
+# modules/writer.py
+"""
+Background storage writer.
+One thread owns the SQLite write connection and drains a bounded queue,
+committing jobs in micro-batches (by size or by age). The scan loop only
+enqueues, so DB latency is off the critical path and every write in the
+process goes through a single serialized writer.
+
+A batch that fails to commit is retried with backoff, then written row by
+row so one bad job can't take its neighbours with it. Jobs that still fail
+are dropped; their checkpoint units (job["_unit"]) are kept in
+failed_units until the scan checkpoint collects them with take_failed(),
+so it never records them as done.
+"""
+
+import time
+import queue
+import atexit
+import logging
+import threading
+
+import sys, os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import (
+    WRITER_QUEUE_SIZE,
+    WRITER_BATCH_SIZE,
+    WRITER_FLUSH_SECONDS,
+    WRITER_RETRIES,
+    WRITER_RETRY_SECONDS,
+)
+from modules.tracker import insert_jobs
+
+log = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class _FlushRequest:
+    """Queue marker: commit everything before it, then wake the caller."""
+
+    def __init__(self):
+        self.done = threading.Event()
+
+
+def _report(on_saved, outcome: str):
+    if on_saved is None:
+        return
+    try:
+        on_saved(outcome)
+    except Exception as e:
+        log.debug(f"Writer on_saved callback failed: {e}")
+
+
+class JobWriter:
+    """
+    Single background writer for the jobs table.
+    Writes go through the writer thread's own storage connection, so
+    init_storage() must have run before start(). With alerts=True each new
+    job is committed together with its notification outbox row.
+    """
+
+    def __init__(self, max_queue: int = WRITER_QUEUE_SIZE,
+                 batch_size: int = WRITER_BATCH_SIZE,
+                 flush_interval: float = WRITER_FLUSH_SECONDS,
+                 alerts: bool = False):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.alerts = alerts
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._pending = set()
+        self._lock = threading.Lock()
+        self._thread = None
+        self.failed_units = set()   # checkpoint units with a job that was never written
+        self.stats = {"submitted": 0, "written": 0, "batches": 0,
+                      "duplicates": 0, "errors": 0, "lost": 0, "commit_seconds": 0.0}
+
+    # ── Producer side ─────────────────────────────────────────────────────────
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return self
+        self._thread = threading.Thread(target=self._run, name="job-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+        return self
+
+    def submit(self, job: dict, on_saved=None) -> bool:
+        """
+        Queue a job for saving. Blocks only when the queue is full.
+        Returns False if the same URL is already waiting to be written.
+        on_saved(outcome), if given, is called on the writer thread once the
+        job's fate is known: 'new', 'duplicate' (already in the table) or
+        'lost' (could not be written).
+        """
+        url = job.get("job_url", "")
+        with self._lock:
+            if url in self._pending:
+                return False
+            self._pending.add(url)
+            # Counted under the lock: submit() runs on many threads; every
+            # other counter is only touched by the writer thread
+            self.stats["submitted"] += 1
+        self._queue.put((job, on_saved))
+        return True
+
+    def is_pending(self, job_url: str) -> bool:
+        """True if the URL is queued but not yet committed."""
+        with self._lock:
+            return job_url in self._pending
+
+    def take_failed(self, units) -> set:
+        """
+        Of the given checkpoint units, return (and forget) those with a job
+        the writer failed to save. Call after flush() so their jobs are done.
+        """
+        with self._lock:
+            failed = self.failed_units.intersection(units)
+            self.failed_units -= failed
+        return failed
+
+    def flush(self, timeout: float = None) -> bool:
+        """Block until everything submitted so far is committed."""
+        if not self._thread or not self._thread.is_alive():
+            return self._queue.empty()
+        request = _FlushRequest()
+        self._queue.put(request)
+        return request.done.wait(timeout)
+
+    def close(self, timeout: float = 30):
+        """Commit whatever is left and stop the thread."""
+        if not self._thread or not self._thread.is_alive():
+            return
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        log.info(f"💾 Writer stopped: {self.stats['written']} jobs in "
+                 f"{self.stats['batches']} batches")
+
+    # ── Writer thread ─────────────────────────────────────────────────────────
+
+    def _save(self, entries: list[tuple]):
+        inserted = insert_jobs([job for job, _ in entries], alerts=self.alerts)
+        self.stats["written"] += sum(inserted)
+        self.stats["duplicates"] += len(inserted) - sum(inserted)
+        for (_, on_saved), new in zip(entries, inserted):
+            _report(on_saved, "new" if new else "duplicate")
+
+    def _commit(self, batch: list[tuple]):
+        if not batch:
+            return
+        started = time.perf_counter()
+        try:
+            for attempt in range(WRITER_RETRIES + 1):
+                try:
+                    self._save(batch)
+                    break
+                except Exception as e:
+                    self.stats["errors"] += 1
+                    log.warning(f"Writer batch of {len(batch)} failed: {e}")
+                    if attempt < WRITER_RETRIES:
+                        time.sleep(WRITER_RETRY_SECONDS * 2 ** attempt)
+            else:
+                self._save_rows(batch)
+            self.stats["batches"] += 1
+        finally:
+            self.stats["commit_seconds"] += time.perf_counter() - started
+            with self._lock:
+                for job, _ in batch:
+                    self._pending.discard(job.get("job_url", ""))
+            batch.clear()
+
+    def _save_rows(self, batch: list[tuple]):
+        """Last resort for a batch that keeps failing: one transaction per job."""
+        for job, on_saved in batch:
+            try:
+                self._save([(job, on_saved)])
+            except Exception as e:
+                self.stats["lost"] += 1
+                if job.get("_unit") is not None:
+                    with self._lock:
+                        self.failed_units.add(job["_unit"])
+                log.error(f"Writer dropped {job.get('job_url', '')[:80]}: {e}")
+                _report(on_saved, "lost")
+
+    def _run(self):
+        batch = []
+        deadline = None
+
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                self._commit(batch)
+                deadline = None
+                continue
+
+            if item is _STOP:
+                self._commit(batch)
+                return
+
+            if isinstance(item, _FlushRequest):
+                self._commit(batch)
+                deadline = None
+                item.done.set()
+                continue
+
+            batch.append(item)
+            if deadline is None:
+                deadline = time.monotonic() + self.flush_interval
+            if len(batch) >= self.batch_size:
+                self._commit(batch)
+                deadline = None
@@ -0,0 +1,77 @@
+# tests/test_migrations.py
+import sqlite3
+import time
+
+import sys, os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.migrations import (
+    LATEST_VERSION, apply_migrations, check_query_plans, get_version,
+)
+
+# jobs as tracker.init_db() created it before migrations existed (user_version 0)
+BASELINE_JOBS = """
+    CREATE TABLE jobs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        job_title TEXT,
+        company TEXT,
+        country TEXT,
+        job_url TEXT UNIQUE,
+        visa_sponsorship TEXT,
+        hr_score REAL,
+        status TEXT DEFAULT 'discovered',
+        resume_version TEXT,
+        skills_emphasized TEXT,
+        date_found TEXT,
+        date_applied TEXT,
+        jd_content TEXT,
+        notes TEXT
+    )
+"""
+
+
+def test_common_queries_use_an_index():
+    conn = sqlite3.connect(":memory:")
+    assert apply_migrations(conn) == LATEST_VERSION
+    assert check_query_plans(conn) == {}
+
+
+def test_migrations_are_idempotent():
+    conn = sqlite3.connect(":memory:")
+    apply_migrations(conn)
+    assert apply_migrations(conn) == LATEST_VERSION
+
+
+def test_baseline_jobs_table_migrates_with_its_rows():
+    conn = sqlite3.connect(":memory:")
+    conn.execute(BASELINE_JOBS)
+    conn.executemany(
+        "INSERT INTO jobs (job_title, company, country, job_url, date_found, jd_content, notes) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+        [
+            ("Backend Engineer", "Acme", "Germany", "https://acme.com/jobs/1",
+             "2024-03-01 09:30:00", "Python and PostgreSQL", "Source: greenhouse"),
+            ("Data Engineer", "Globex", "India", "https://globex.com/jobs/2",
+             "", "Spark pipelines", "Source: Lever "),
+            ("ML Engineer", "Initech", "Remote", "https://initech.com/jobs/3",
+             None, "", ""),
+        ],
+    )
+    conn.commit()
+    assert get_version(conn) == 0
+
+    assert apply_migrations(conn) == LATEST_VERSION
+    rows = conn.execute("SELECT job_url, found_ts, source FROM jobs ORDER BY id").fetchall()
+    assert len(rows) == 3
+
+    # date_found is local time; found_ts is the same instant in epoch seconds
+    expected = int(time.mktime(time.strptime("2024-03-01 09:30:00", "%Y-%m-%d %H:%M:%S")))
+    assert rows[0] == ("https://acme.com/jobs/1", expected, "greenhouse")
+    assert rows[1] == ("https://globex.com/jobs/2", None, "lever")
+    assert rows[2] == ("https://initech.com/jobs/3", None, None)
+
+    # Existing rows are in the full-text index, and new ones keep working
+    hits = conn.execute("SELECT rowid FROM jobs_fts WHERE jobs_fts MATCH 'pipelines'").fetchall()
+    assert hits == [(2,)]
+    conn.execute("INSERT INTO jobs (job_title, job_url) VALUES ('QA', 'https://acme.com/jobs/4')")
+    assert check_query_plans(conn) == {}